@@ -0,0 +1,1218 @@
+"""기사 스크래퍼: 페치 → 인코딩 감지 → 파싱 → 추출 → 캐시
+
+FastAPI 앱(main.py), 작업 큐 워커(jobs.py), 탐색기/내보내기 CLI 가 함께 쓴다.
+추출 프로세스 풀 워커가 spawn 으로 이 모듈을 다시 import 하므로 import 할 때 스크래퍼 생성,
+Redis 연결 같은 부수 효과가 없어야 한다 (그런 코드는 main.py 에 둔다).
+"""
+import requests
+from requests.adapters import HTTPAdapter
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from newspaper import Article
+from readability import Document
+import trafilatura
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import time
+import logging
+import asyncio
+from urllib.parse import urlparse, urlsplit, urlunsplit
+import re
+import chardet
+import random
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from contextlib import asynccontextmanager
+import redis
+import redis.asyncio
+import httpx
+from datetime import timedelta
+import hashlib
+import codecs
+import html as html_lib
+import copy
+import os
+from collections import Counter
+from fetcher import AsyncFetcher, BadStatus
+from browser_pool import BrowserPool
+from scheduler import HostScheduler
+from singleflight import SingleFlight, RedisSingleFlight
+from extract_pool import ExtractionPool
+from strategy import StrategyTable, DEFAULT_ORDER
+from cache import ArticleCache, CachedFailure, LocalLRU
+from dedup import Deduplicator
+from deadline import Deadline, DeadlineExceeded, jittered_backoff
+from render_classifier import RenderClassifier, page_features
+from rules import RulesRegistry
+from limiter import AdaptiveLimit, AsyncLimiter, MemoryProbe, container_memory_limit
+from cluster import ForwardedError
+from metrics import (
+    Spans, RESPONSE_BYTES, CACHE_RESULTS, RENDERS, RENDER_DECISIONS, EXTRACT_WAITING, EXTRACT_ACTIVE,
+    EXECUTOR_QUEUE, HEDGED_REQUESTS, DEADLINE_EXCEEDED, CLUSTER_FORWARDS,
+)
+
+# <meta charset="..."> 와 <meta http-equiv="Content-Type" content="...; charset=..."> 모두 매칭
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-]+)', re.IGNORECASE)
+
+# 시간 예산 초과 시 파싱 없이 제목만 읽는 용도
+OG_TITLE_RE = re.compile(r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\']([^"\']+)', re.IGNORECASE)
+TITLE_TAG_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+
+# ArticleScraper(redis_client=...) 기본값: 환경 변수의 Redis 에 연결
+REDIS_FROM_ENV = 'env'
+
+# 동시 처리 한도를 줄일 신호로 보는 실패 (404 같은 개별 기사 실패는 제외)
+OVERLOAD_ERRORS = (DeadlineExceeded, asyncio.TimeoutError, httpx.TimeoutException, requests.Timeout)
+# 정적 한도에 반영하는 지연에서 빼는 단계 (렌더링, 호스트 슬롯/재시도 간격 대기)
+UNLIMITED_STAGES = ('extract_js', 'host_wait', 'backoff')
+
+# 언론사 규칙이 없거나 빗나갔을 때 쓰는 일반 제목 선택자 (메타 태그 → HTML 구조 순)
+TITLE_META_SELECTORS = [
+    ('meta[property="og:title"]', 'content'),
+    ('meta[name="title"]', 'content'),
+    ('meta[property="twitter:title"]', 'content'),
+    ('title', None),  # <title> 태그 직접 추출
+]
+TITLE_HTML_SELECTORS = [
+    'h1', 'h2',
+    'h1.title', 'h1.article-title', 'h1.headline',
+    '.article-header h1', '#article_title',
+]
+
+# 제목 정제용
+HTML_TAG_RE = re.compile('<.*?>')
+CONTROL_CHARS_RE = re.compile(r'[\n\t\r]')
+MULTI_SPACE_RE = re.compile(r'\s{2,}')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s-]')
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# EUC-KR 계열은 상위 호환인 cp949로 디코딩
+ENCODING_ALIASES = {'euc_kr': 'cp949', 'ks_c_5601-1987': 'cp949', 'ksc5601': 'cp949', 'uhc': 'cp949'}
+
+
+def normalize_encoding(name):
+    """유효한 코덱 이름으로 정규화 (알 수 없으면 None)"""
+    if not name:
+        return None
+    name = name.strip().lower()
+    if name in ENCODING_ALIASES:
+        return ENCODING_ALIASES[name]
+    try:
+        codec = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return ENCODING_ALIASES.get(codec, codec)
+
+# class_=['article', 'content', 'story'] 와 동일한 조건을 한 번에 평가
+ARTICLE_BLOCKS_XPATH = etree.XPath(
+    "//*[self::p or self::article or self::div]"
+    "[contains(concat(' ', normalize-space(@class), ' '), ' article ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' content ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' story ')]"
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector):
+    return CSSSelector(selector)
+
+
+class ParsedDocument:
+    """lxml로 한 번만 파싱한 문서 (제목/저자/JS 감지/페이월/trafilatura 공용)"""
+
+    def __init__(self, html):
+        self.html = html
+        self.tree = self._parse(html)
+        self._text = None
+        self._features = None
+        self.newspaper = None  # newspaper3k 파싱 결과 (제목/본문 폴백 공용)
+
+    @staticmethod
+    def _parse(html):
+        try:
+            return lxml.html.document_fromstring(html)
+        except etree.ParserError:
+            # 빈 문서도 BeautifulSoup처럼 빈 트리로 처리
+            return lxml.html.document_fromstring('<html><body></body></html>')
+        except ValueError:
+            # <?xml encoding=...?> 선언이 있는 문자열은 lxml이 거부하므로 바이트로 파싱
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=parser)
+
+    def select(self, selector):
+        return _compile_selector(selector)(self.tree)
+
+    def select_one(self, selector):
+        elements = self.select(selector)
+        return elements[0] if elements else None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.tree.text_content()
+        return self._text
+
+    @property
+    def features(self):
+        """렌더링 판단용 특징 (트리 1회 순회)"""
+        if self._features is None:
+            self._features = page_features(self.tree)
+        return self._features
+
+
+class ArticleScraper:
+    def __init__(self, headless=True, use_proxy=False, max_workers=30, cache_enabled=True, http2=False,
+                 browser_pool_size=2, browser_max_pages=50, shared_inflight=False,
+                 extraction_processes=0, local_cache_entries=10000, local_cache_bytes=64 * 1024 * 1024,
+                 local_cache_ttl=60, store_duplicate_content=True, render_decision='classifier',
+                 article_budget=30.0, max_concurrency=None, max_browsers=None, memory_limit=None,
+                 redis_client=REDIS_FROM_ENV):
+        self.USER_AGENTS = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/120.0.6099.119 Mobile/15E148 Safari/604.1',
+            'Mozilla/5.0 (iPad; CPU OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 OPR/106.0.0.0',
+            'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.144 Mobile Safari/537.36',
+            'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.144 Mobile Safari/537.36'
+        ]
+        self.headers = {
+            'User-Agent': random.choice(self.USER_AGENTS)
+        }
+        self.headless = headless
+        self.use_proxy = use_proxy
+        self.setup_logging()
+        
+        # 도메인별 커스텀 설정
+        self.custom_encodings = {
+            'kmib.co.kr': 'cp949',
+            'seoul.co.kr': 'euc-kr',
+            'donga.com': 'cp949',
+            'hankyung.com': 'utf-8'
+        }
+        
+        self.learned_encodings = {}  # 도메인 -> 확인된 인코딩 (custom_encodings 위에 학습)
+        self.encoding_sample_size = 64 * 1024  # 통계 분석에 쓰는 최대 바이트 수
+        
+        # 도메인별 요청 정책 (동시 요청 수, 초당 요청 수)
+        self.host_policies = {
+            'chosun.com': {'concurrency': 4, 'rate': 2.0},
+            'joongang.co.kr': {'concurrency': 4, 'rate': 2.0},
+            'donga.com': {'concurrency': 4, 'rate': 2.0},
+            'yna.co.kr': {'concurrency': 6, 'rate': 4.0},
+            'newsis.com': {'concurrency': 4, 'rate': 2.0},
+        }
+        self.default_host_policy = {'concurrency': 6, 'rate': 5.0}
+        
+        self.fast_extract_domains = {
+            'mk.co.kr': self._extract_with_trafilatura,
+            'chosun.com': self._extract_with_trafilatura,
+            'hankyung.com': self._extract_with_trafilatura,
+        }
+        self.min_content_words = 50  # 이보다 짧으면 다음 추출 경로 시도
+        # 언론사별 제목/저자/작성일/본문 규칙 (EXTRACTION_RULES 파일이 바뀌면 다시 읽음)
+        self.rules = RulesRegistry()
+
+        # 네트워크 설정 (connect, read 타임아웃 / 본문 크기 제한)
+        self.connect_timeout = 5
+        self.read_timeout = 20
+        self.max_body_size = 10 * 1024 * 1024
+
+        # 기사 한 건의 시간 예산: 페치는 앞 fetch_share 구간 안에서, 렌더링은 추출 몫을 남기고
+        self.article_budget = article_budget
+        self.fetch_share = 0.6
+        self.render_timeout = 30
+        self.min_render_budget = 3.0   # 남은 시간이 이보다 적으면 렌더링하지 않음
+        self.extract_reserve = 1.0     # 렌더링 후 추출에 남겨 둘 시간
+        self.extract_grace = 1.0       # 추출이 예산을 넘겨도 이만큼은 기다린 뒤 부분 결과 반환
+
+        # 동기 경로용 keep-alive 세션
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if self.use_proxy:
+            self.session.proxies = {'http': self.get_proxy(), 'https': self.get_proxy()}
+
+        # 비동기 경로용 호스트별 커넥션 풀
+        self.fetcher = AsyncFetcher(
+            headers=self.headers,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            max_body_size=self.max_body_size,
+            http2=http2,
+            proxy=self.get_proxy() if self.use_proxy else None,
+        )
+
+        # JS 렌더링용 브라우저 풀 (요청마다 Chrome을 새로 띄우지 않음)
+        self.browser_pool = BrowserPool(
+            self.setup_selenium,
+            size=browser_pool_size,
+            max_pages=browser_max_pages,
+        )
+
+        self.scheduler = HostScheduler(self.host_policies, self.default_host_policy)
+
+        # 동시 처리 한도: max_workers / browser_pool_size 에서 시작해 지연·오류율·메모리(RSS)를 보고
+        # 정적 경로(페치+추출)와 브라우저 경로를 따로 조절. memory_limit 기본값은 컨테이너 한도의 90%
+        max_concurrency = max_concurrency or max_workers * 4
+        if memory_limit is None and container_memory_limit():
+            memory_limit = int(container_memory_limit() * 0.9)
+        memory = MemoryProbe()
+        self.static_limit = AsyncLimiter(
+            'static', max_workers, min_limit=min(4, max_workers), max_limit=max_concurrency,
+            memory=memory, memory_limit=memory_limit,
+        )
+        self.browser_limit = AdaptiveLimit(
+            'browser', browser_pool_size, min_limit=1, max_limit=max_browsers or browser_pool_size * 4,
+            window=5, memory=memory, memory_limit=memory_limit, on_change=self.browser_pool.resize,
+        )
+
+        # extraction_processes > 0 이면 CPU 바운드 추출을 프로세스 풀에서 실행 (-1: 코어 수만큼)
+        self.extraction_pool = None
+        if extraction_processes:
+            self.extraction_pool = ExtractionPool(
+                processes=None if extraction_processes < 0 else extraction_processes,
+                scraper_kwargs={'headless': headless, 'use_proxy': use_proxy, 'cache_enabled': False,
+                                'browser_pool_size': 1, 'render_decision': render_decision,
+                                'extraction_processes': 0, 'redis_client': None},
+            )
+
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.cache_enabled = cache_enabled
+        # Redis: 기본은 REDIS_HOST/REDIS_PORT. None 이면 Redis 를 쓰는 구성 요소(캐시/전략/렌더링 표본/
+        # 중복 인덱스)가 모두 로컬 상태만 쓰고, 클라이언트를 넘기면 그것을 쓴다 (기사 캐시는 로컬 LRU 만)
+        cache_redis = None
+        if redis_client == REDIS_FROM_ENV:
+            redis_client = redis.Redis(
+                host=os.getenv('REDIS_HOST', 'localhost'),
+                port=int(os.getenv('REDIS_PORT', 6379)),
+                db=0,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
+            cache_redis = redis.asyncio.Redis(
+                host=os.getenv('REDIS_HOST', 'localhost'),
+                port=int(os.getenv('REDIS_PORT', 6379)),
+                db=0,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
+        self.redis_client = redis_client
+        self.cache_ttl = timedelta(hours=24)  # 캐시 유효기간 24시간
+        
+        # 기사 캐시: 프로세스 내 LRU → Redis (비동기 클라이언트, 압축 바이너리 값)
+        self.cache = ArticleCache(
+            cache_redis,
+            LocalLRU(max_entries=local_cache_entries, max_bytes=local_cache_bytes, ttl=local_cache_ttl),
+        )
+        
+        # 도메인별로 성공한 추출 경로 학습 (fast_extract_domains 는 정적 추출로 시작)
+        self.strategies = StrategyTable(
+            self.redis_client,
+            seeds={domain: 'static' for domain in self.fast_extract_domains},
+        )
+        # JS 렌더링 여부: 'classifier' (도메인별 학습 임계값) 또는 'heuristic' (이전 규칙, 비교용)
+        if render_decision not in ('classifier', 'heuristic'):
+            raise ValueError(f"알 수 없는 렌더링 판단 방식: {render_decision}")
+        self.render_decision = render_decision
+        self.render_classifier = RenderClassifier(self.redis_client)
+        # 통신사 전재 기사 등 거의 같은 본문 탐지 (duplicate_of). False 면 중복 기사는 캐시에 본문 없이 저장
+        self.dedup = Deduplicator(self.redis_client)
+        self.store_duplicate_content = store_duplicate_content
+        self.cache_stale_ttl = timedelta(days=7)  # 만료 후 조건부 GET 재검증용 보관 기간
+        self.negative_cache_ttl = timedelta(minutes=5)  # 실패/페이월 결과 보관 기간
+
+        # 같은 URL 동시 요청 합치기 (shared_inflight=True 면 Redis 락으로 워커/컨테이너 간에도 공유)
+        if shared_inflight:
+            if self.redis_client is None:
+                raise ValueError("shared_inflight 에는 Redis 가 필요합니다")
+            self.inflight = RedisSingleFlight(self.redis_client, self._run_blocking)
+        else:
+            self.inflight = SingleFlight()
+
+        # 클러스터 모드: 캐시에 없는 URL 은 도메인 담당 노드에 맡긴다 (None 이면 단일 노드)
+        self.cluster = None
+
+    def setup_logging(self):
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        logging.getLogger('httpx').setLevel(logging.WARNING)  # 요청마다 INFO 로그를 남기지 않도록
+        self.logger = logging.getLogger(__name__)
+
+    def setup_selenium(self):
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument(f"user-agent={random.choice(self.USER_AGENTS)}")
+        
+        if self.use_proxy:
+            chrome_options.add_argument(f'--proxy-server={self.get_proxy()}')
+        
+        return webdriver.Chrome(options=chrome_options)
+
+    def get_proxy(self):
+        return 'http://your-proxy:port'
+
+    def _domain_encoding(self, domain):
+        """학습된(또는 custom_encodings에 설정된) 도메인 인코딩"""
+        learned = self.learned_encodings.get(domain)  # 다른 스레드가 clear() 할 수 있어 한 번에 읽는다
+        if learned:
+            return learned
+        for site, encoding in self.custom_encodings.items():
+            if domain == site or domain.endswith('.' + site):
+                return normalize_encoding(encoding)
+        return None
+
+    def _learn_encoding(self, domain, encoding):
+        if len(self.learned_encodings) >= 10000:
+            self.learned_encodings.clear()
+        self.learned_encodings[domain] = encoding
+
+    def detect_encoding(self, response):
+        """단계별 인코딩 감지: BOM → 헤더/meta → 도메인 학습값 → 앞부분 샘플 통계 분석"""
+        content = response.content
+        domain = urlparse(response.url).netloc.lower()
+
+        # 1. BOM
+        for bom, encoding in BOMS:
+            if content.startswith(bom):
+                return encoding
+
+        # 2. HTTP 헤더 (EUC-KR 계열만 신뢰 - 기본값 ISO-8859-1/UTF-8 을 잘못 보내는 서버가 많음)
+        header_encoding = normalize_encoding(response.encoding)
+        if header_encoding == 'cp949':
+            self._learn_encoding(domain, header_encoding)
+            return header_encoding
+
+        # 3. 앞부분 바이트에서 <meta charset> / http-equiv 검색 (파싱 없이 정규식)
+        meta_encoding = META_CHARSET_RE.search(content[:4096])
+        if meta_encoding:
+            encoding = normalize_encoding(meta_encoding.group(1).decode('ascii'))
+            if encoding:
+                self._learn_encoding(domain, encoding)
+                return encoding
+
+        # 4. 같은 도메인에서 이전에 확인된 인코딩
+        encoding = self._domain_encoding(domain)
+        if encoding:
+            return encoding
+
+        # 5. 최후 수단: 제한된 크기의 샘플만 분석
+        sample = content[:self.encoding_sample_size]
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+        # UTF-8 이 아니면서 CP949로 깨끗하게 디코딩되고 비ASCII 문자가 대부분 한글이면 CP949
+        try:
+            decoded = codecs.getincrementaldecoder('cp949')().decode(sample, final=False)
+            non_ascii = [ch for ch in decoded if ord(ch) > 127]
+            if non_ascii and sum('\uac00' <= ch <= '\ud7a3' for ch in non_ascii) / len(non_ascii) > 0.5:
+                self._learn_encoding(domain, 'cp949')
+                return 'cp949'
+        except UnicodeDecodeError:
+            pass
+
+        detector = chardet.UniversalDetector()
+        for start in range(0, len(sample), 4096):
+            detector.feed(sample[start:start + 4096])
+            if detector.done: break
+        detector.close()
+
+        encoding = normalize_encoding(detector.result.get('encoding')) or 'utf-8'
+        if (detector.result.get('confidence') or 0) >= 0.9:
+            self._learn_encoding(domain, encoding)
+        return encoding
+
+    def safe_decode(self, content, encoding):
+        """안전한 디코딩을 위한 래퍼 함수"""
+        try:
+            return content.decode(encoding, errors='replace')
+        except UnicodeDecodeError:
+            try:
+                return content.decode('cp949', errors='replace')
+            except:
+                return content.decode('utf-8', errors='replace')
+
+    def is_javascript_required(self, doc, url):
+        if self.render_decision == 'heuristic':
+            required = self._js_required_heuristic(doc)
+        else:
+            required = self.render_classifier.needs_render(urlparse(url).netloc.lower(), doc.features)
+        RENDER_DECISIONS.labels('render' if required else 'skip').inc()
+        return required
+
+    def _js_required_heuristic(self, doc):
+        """이전 규칙: <noscript>/javascript:void(0) 가 있거나 본문 블록이 3개 미만이면 렌더링"""
+        indicators = ["You need to enable JavaScript", "<noscript>", "javascript:void(0)"]
+        if any(indicator in doc.html for indicator in indicators):
+            return True
+            
+        article_content = ARTICLE_BLOCKS_XPATH(doc.tree)
+        return len(article_content) < 3
+
+    def get_js_rendered_content(self, url, timeout=30):
+        content_selectors = ["article", ".article-content", ".story-content", "main", "#main-content"]
+        start = None
+        try:
+            with self.browser_pool.lease() as driver:
+                start = time.monotonic()
+                self.logger.info(f"JavaScript 렌더링 시작: {url}")
+                deadline = time.monotonic() + timeout
+                driver.set_page_load_timeout(timeout)
+                driver.get(url)
+                
+                # 셀렉터 중 하나라도 나타나면 종료 (전체 대기 시간은 timeout 하나로 제한)
+                try:
+                    WebDriverWait(driver, max(deadline - time.monotonic(), 0.1)).until(
+                        EC.any_of(*[
+                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                            for selector in content_selectors
+                        ])
+                    )
+                except TimeoutException:
+                    self.logger.warning(f"본문 셀렉터 대기 시간 초과: {url}")
+                
+                self.scroll_page(driver)
+                page_source = driver.page_source
+            RENDERS.labels('success').inc()
+            self.browser_limit.record(time.monotonic() - start, saturated=self.browser_pool.saturated)
+            return page_source
+            
+        except Exception as e:
+            RENDERS.labels('failure').inc()
+            if start is not None:  # 대여 대기 시간 초과는 한도가 꽉 찬 것이지 브라우저 실패가 아님
+                self.browser_limit.record(time.monotonic() - start, error=True,
+                                          saturated=self.browser_pool.saturated)
+            self.logger.error(f"JavaScript 렌더링 실패: {e}")
+            return None
+
+    def scroll_page(self, driver):
+        for _ in range(3):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(0.2)
+
+    def is_paywall(self, doc):
+        paywall_indicators = {
+            'phrases': ["subscribe to continue", "premium content", "sign up to read"],
+            'elements': ['.paywall', '.subscription-required', '#piano-paywall']
+        }
+        
+        text_content = doc.text.lower()
+        if any(phrase in text_content for phrase in paywall_indicators['phrases']):
+            return True
+            
+        for element in paywall_indicators['elements']:
+            if doc.select(element):
+                return True
+                
+        return False
+
+    def _rule_values(self, rules, field, tree, accept=bool):
+        """언론사 규칙으로 field 값 목록을 얻고 규칙별 적중/실패를 기록 (규칙에 field 가 없으면 [])"""
+        values, tried = rules.extract(field, tree, accept)
+        if tried:
+            self.rules.record(rules.domain, field, tried)
+        return values
+
+    def extract_title(self, doc, url, rules=None):
+        """개선된 제목 추출 메서드 (rules: 언론사 규칙이 있으면 먼저 적용)"""
+        if rules is not None and 'title' in rules:
+            titles = self._rule_values(rules, 'title', doc.tree)
+            if titles:
+                return titles[0]
+
+        # 메타 태그에서 추출
+        for selector, attr in TITLE_META_SELECTORS:
+            element = doc.select_one(selector)
+            if element is not None:
+                title = (element.get(attr) or '').strip() if attr else element.text_content().strip()
+                if title:
+                    return title
+
+        # HTML 구조 기반 추출
+        for selector in TITLE_HTML_SELECTORS:
+            element = doc.select_one(selector)
+            if element is not None and element.text_content().strip():
+                return element.text_content().strip()
+
+        # newspaper3k 폴백 (이미 받은 HTML 사용)
+        try:
+            return self._newspaper_article(doc, url).title
+        except:
+            return "[제목을 찾을 수 없음]"
+
+    def clean_title(self, title):
+        """제목 정제 메서드"""
+        if not title:
+            return ""
+        
+        # HTML 태그 제거
+        title = HTML_TAG_RE.sub('', title)
+        
+        # 특수 문자 및 불필요한 공백 제거
+        title = CONTROL_CHARS_RE.sub(' ', title)  # 개행 문자 제거
+        title = MULTI_SPACE_RE.sub(' ', title)    # 다중 공백 단일화
+        title = SPECIAL_CHARS_RE.sub('', title)   # 특수 문자 제거
+        return title.strip()
+
+    def _extract_with_trafilatura(self, content):
+        try:
+            return trafilatura.extract(content, include_comments=False)
+        except:
+            return None
+
+    def fetch(self, url, timeout=None):
+        """동기 경로용 페치 (세션 keep-alive + 타임아웃)"""
+        read_timeout = self.read_timeout if timeout is None else timeout
+        return self.session.get(url, timeout=(min(self.connect_timeout, read_timeout), read_timeout))
+
+    def _fetch_with_retry(self, url, retry, deadline):
+        """연결 오류/타임아웃은 지터 백오프 후 재시도 (예산의 페치 구간 안에서만)"""
+        for attempt in range(retry):
+            deadline.check('fetch', self.fetch_share)
+            try:
+                return self.fetch(url, timeout=deadline.timeout(self.read_timeout, self.fetch_share))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = jittered_backoff(attempt)
+                if attempt + 1 >= retry or delay >= deadline.remaining(self.fetch_share):
+                    raise
+                self.logger.warning(f"페치 실패 재시도 ({attempt + 1}/{retry}, {delay:.1f}s 후): {url}: {e}")
+                time.sleep(delay)
+
+    def _extract_with_readability(self, doc):
+        # readability는 트리를 직접 수정하므로 복사본 사용 (재파싱보다 저렴)
+        summary = Document(copy.deepcopy(doc.tree)).summary(html_partial=True)
+        return lxml.html.fromstring(summary).text_content() if summary else None
+
+    def _newspaper_article(self, doc, url):
+        """이미 받은 HTML로 newspaper3k 파싱 (재다운로드/이미지 요청 없이 문서당 한 번)"""
+        if doc.newspaper is None:
+            article = Article(url, fetch_images=False)
+            article.download(input_html=doc.html)
+            article.parse()
+            doc.newspaper = article
+        return doc.newspaper
+
+    def _run_extractor(self, path, source, url, network, render_timeout=30):
+        """source 는 [문서] 한 칸짜리 리스트: JS 렌더링에 성공하면 이후 경로는 렌더링된 문서를 쓴다"""
+        doc = source[0]
+        if path == 'static':
+            return self._extract_with_trafilatura(doc.tree)
+        if path == 'readability':
+            return self._extract_with_readability(doc)
+        if path == 'js':
+            network['render'] += 1
+            js_content = self.get_js_rendered_content(url, timeout=render_timeout)
+            if not js_content:
+                return None
+            source[0] = ParsedDocument(js_content)
+            return self._extract_with_trafilatura(source[0].tree)
+        if path == 'newspaper':
+            return self._newspaper_article(doc, url).text
+        raise ValueError(f"알 수 없는 추출 경로: {path}")
+
+    def _is_valid_content(self, content):
+        return bool(content) and len(content.split()) >= self.min_content_words
+
+    def _extract_content(self, doc, url, domain, network, spans, deadline=None, rules=None):
+        """학습된 도메인별 순서대로 추출 경로를 시도하고 결과를 전략 테이블에 기록
+
+        언론사 본문 규칙(rules)이 유효한 본문을 찾으면 다른 경로는 시도하지 않는다.
+        (본문, 경로, 시간이 모자라 멈춘 단계 또는 None) 반환
+        """
+        if rules is not None and 'body' in rules:
+            with spans.span('extract_rules'):
+                # 개편 등으로 엉뚱한 요소를 고른 규칙이 적중으로 집계되지 않도록 본문 검증까지 통과해야 적중
+                paragraphs = self._rule_values(
+                    rules, 'body', doc.tree, accept=lambda values: self._is_valid_content('\n'.join(values)))
+            if paragraphs:
+                return '\n'.join(paragraphs), 'rules', None
+        source = [doc]
+        order = self.strategies.order(domain)
+        learned = order[0] if order != DEFAULT_ORDER else None
+        best, best_path, timed_out = None, None, None
+        render_timeout = self.render_timeout
+        for path in order:
+            if deadline is not None and deadline.expired():
+                DEADLINE_EXCEEDED.labels('extract').inc()
+                return best, best_path, 'extract'
+            # 학습된 승자가 아니면 기존 조건 유지: 렌더링은 JS가 필요해 보일 때만,
+            # newspaper3k 는 본문을 전혀 얻지 못했을 때만
+            if path != learned:
+                if path == 'js' and not self.is_javascript_required(doc, url):
+                    continue
+                if path == 'newspaper' and best:
+                    continue
+            if path == 'js' and deadline is not None:
+                render_timeout = deadline.timeout(self.render_timeout) - self.extract_reserve
+                if render_timeout < self.min_render_budget:
+                    DEADLINE_EXCEEDED.labels('render').inc()
+                    self.logger.warning(f"시간 예산 부족으로 렌더링 생략 ({render_timeout:.1f}s 남음): {url}")
+                    timed_out = 'render'
+                    continue
+            start = time.perf_counter()
+            try:
+                content = self._run_extractor(path, source, url, network, render_timeout)
+            except Exception as e:
+                self.logger.error(f"{path} 추출 실패: {e}")
+                content = None
+            elapsed = time.perf_counter() - start
+            spans.add(f"extract_{path}", elapsed)
+            valid = self._is_valid_content(content)
+            self.strategies.record(domain, path, valid, elapsed * 1000)
+            if path == 'js' and path != learned and source[0] is not doc:
+                # 정적 경로가 실패한 뒤 렌더링이 본문을 살렸는지를 정적 문서의 특징과 함께 남겨
+                # 도메인별 임계값 학습 (브라우저 실패는 판단의 옳고 그름과 무관하므로 제외)
+                self.render_classifier.record(domain, doc.features, valid)
+            if valid:
+                return content, path, None
+            if content and (best is None or len(content) > len(best)):
+                best, best_path = content, path
+        return best, best_path, timed_out
+
+    def extract_article(self, url):
+        try:
+            response = self.fetch(url)
+            encoding = self.detect_encoding(response)
+            doc = ParsedDocument(self.safe_decode(response.content, encoding))
+            
+            if self.is_javascript_required(doc, url):
+                js_content = self.get_js_rendered_content(url)
+                if js_content:
+                    doc = ParsedDocument(js_content)
+                
+            if self.is_paywall(doc):
+                return None
+                
+            return self._clean_content(
+                self._extract_with_trafilatura(doc.tree) or self._newspaper_article(doc, url).text
+            )
+            
+        except Exception as e:
+            self.logger.error(f"기사 추출 실패: {e}")
+            return None
+
+    def extract_article_with_metadata(self, url, retry=3, budget=None):
+        # 단일 요청으로 시작 (연결 오류는 예산 안에서 재시도)
+        spans = Spans()
+        deadline = Deadline(budget or self.article_budget)
+        try:
+            with spans.span('fetch'):
+                response = self._fetch_with_retry(url, retry, deadline)
+            RESPONSE_BYTES.observe(len(response.content))
+            return self.extract_from_response(response, url, retry, spans, deadline)
+        finally:
+            spans.observe(urlparse(url).netloc)
+
+    def extract_from_response(self, response, url, retry=3, spans=None, deadline=None):
+        """이미 받아온 응답(requests.Response 또는 FetchResult)에서 기사 추출
+
+        spans 를 넘기면 단계별 시간을 거기에 더하고 지표 기록은 호출한 쪽이 한다.
+        deadline 이 지나면 남은 추출 경로를 건너뛰고 그때까지의 결과에 partial 을 붙인다.
+        """
+        own_spans = spans is None
+        spans = Spans() if own_spans else spans
+        domain = urlparse(url).netloc.lower()
+        try:
+            return self._extract_from_response(response, url, retry, spans, domain, deadline)
+        finally:
+            if own_spans:
+                spans.observe(domain)
+
+    def _extract_from_response(self, response, url, retry, spans, domain, deadline):
+        for attempt in range(retry):
+            # 예산이 이미 끝났으면 (버려진 추출이 늦게 시작된 경우 등) 파싱 없이 제목만
+            if deadline is not None and deadline.expired():
+                DEADLINE_EXCEEDED.labels('extract').inc()
+                return self._partial_result(response, url, 'extract')
+            # 기사 하나당 네트워크 요청 수 (정적 페이지는 최초 페치 1회여야 함)
+            network = Counter(fetch=getattr(response, 'requests', 1))
+            try:
+                with spans.span('encoding'):
+                    encoding = self.detect_encoding(response)
+                # 1. lxml로 한 번만 파싱하고 이후 단계는 모두 이 트리를 공유
+                with spans.span('parse'):
+                    doc = ParsedDocument(self.safe_decode(response.content, encoding))
+                rules = self.rules.for_domain(domain)
+                with spans.span('title'):
+                    title = self.clean_title(self.extract_title(doc, url, rules))
+                
+                # 2. 언론사 본문 규칙, 이어서 도메인별로 학습된 순서대로 추출 경로 시도 (기본: trafilatura부터)
+                content, extractor, timed_out = self._extract_content(
+                    doc, url, domain, network, spans, deadline, rules)
+                
+                # 저자/작성일은 언론사 규칙이 있는 경우에만
+                authors, publish_date = [], None
+                if rules is not None:
+                    authors = list(dict.fromkeys(self._rule_values(rules, 'authors', doc.tree)))  # 순서 유지 중복 제거
+                    publish_date = next(iter(self._rule_values(rules, 'publish_date', doc.tree)), None)
+                
+                content = self._clean_content(content)
+                with spans.span('dedup'):
+                    duplicate_of = self.dedup.check(self._normalize_url(url), content)
+                result = {
+                    'title': title,
+                    'authors': authors,
+                    'publish_date': publish_date,
+                    'content': content,
+                    'paywall': not content and self.is_paywall(doc),
+                    'extractor': extractor,
+                    'network_requests': sum(network.values()),
+                    'duplicate_of': duplicate_of,
+                }
+                if timed_out:
+                    result['partial'] = True
+                    result['deadline_stage'] = timed_out
+                if result['network_requests'] > 1:
+                    self.logger.info(f"네트워크 요청 {dict(network)}: {url}")
+                
+                return result
+                
+            except UnicodeDecodeError as e:
+                alt_encodings = ['cp949', 'utf-8', 'euc-kr']
+                current_idx = alt_encodings.index(encoding) if encoding in alt_encodings else -1
+                next_encoding = alt_encodings[(current_idx + 1) % len(alt_encodings)] if current_idx != -1 else 'cp949'
+                
+                self.logger.warning(f"인코딩 재시도: {encoding} → {next_encoding}")
+                response.encoding = next_encoding
+                continue
+            except Exception as e:
+                self.logger.error(f"메타데이터 추출 실패: {e}")
+                raise
+
+    def _clean_content(self, text):
+        if not text:
+            return ""
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def _normalize_url(self, url):
+        """스킴/호스트 소문자화, 프래그먼트 제거"""
+        parts = urlsplit(url.strip())
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+    def _get_cache_key(self, url):
+        """URL에 대한 고유한 캐시 키 생성"""
+        return f"article:{hashlib.md5(self._normalize_url(url).encode()).hexdigest()}"
+
+    async def _run_blocking(self, func, *args):
+        """블로킹 호출(Redis 등)을 이벤트 루프 밖 스레드풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(func, *args))
+        EXECUTOR_QUEUE.set(self.executor._work_queue.qsize())  # 공개 API가 없어 내부 큐 길이를 직접 읽음
+        return await future
+
+    async def fetch_politely(self, url, retry=3, headers=None, deadline=None, waiting=None):
+        """호스트별 동시성/속도 제한을 지키며 페치하고, 429/503 이면 백오프 후 재시도
+
+        연결 오류/타임아웃은 지터 백오프 후 재시도하고, deadline 이 있으면 예산의 페치 구간
+        (fetch_share) 안에서만 기다린다. waiting(stage) 는 호스트 슬롯('host_wait')과
+        재시도 간격('backoff') 대기를 감쌀 비동기 컨텍스트 매니저를 돌려준다.
+        """
+        for attempt in range(retry):
+            if deadline is not None:
+                deadline.check('fetch', self.fetch_share)
+            try:
+                response = await self._fetch_hedged(url, headers, deadline, waiting)
+            except httpx.TransportError as e:
+                delay = jittered_backoff(attempt)
+                if attempt + 1 >= retry or (deadline is not None and delay >= deadline.remaining(self.fetch_share)):
+                    raise
+                self.logger.warning(f"페치 실패 재시도 ({attempt + 1}/{retry}, {delay:.1f}s 후): {url}: {e!r}")
+                if waiting is None:
+                    await asyncio.sleep(delay)
+                else:
+                    async with waiting('backoff'):
+                        await asyncio.sleep(delay)
+                continue
+            if not self.scheduler.report(url, response.status_code, response.headers.get('retry-after')):
+                break
+            self.logger.warning(f"요청 제한 응답 재시도 ({attempt + 1}/{retry}): {url}")
+        response.requests = attempt + 1
+        return response
+
+    async def _fetch_once(self, url, headers, deadline, sent=None, waiting=None):
+        async with self.scheduler.slot(url, waiting and waiting('host_wait')):
+            # 예산은 호스트 슬롯을 얻어 실제로 요청을 보낼 때부터 (예의상 대기열 시간은 제외)
+            if sent is not None:
+                sent.set()
+            if deadline is None:
+                start = time.monotonic()
+                response = await self.fetcher.fetch(url, headers=headers)
+            else:
+                deadline.start()
+                deadline.check('fetch', self.fetch_share)
+                timeout = deadline.timeout(fraction=self.fetch_share)
+                start = time.monotonic()
+                try:
+                    response = await asyncio.wait_for(
+                        self.fetcher.fetch(url, headers=headers, read_timeout=min(self.read_timeout, timeout)),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    DEADLINE_EXCEEDED.labels('fetch').inc()
+                    raise DeadlineExceeded('fetch') from None
+        if response.status_code < 400:
+            self.scheduler.observe_latency(url, time.monotonic() - start)
+        return response
+
+    async def _fetch_hedged(self, url, headers, deadline, waiting=None):
+        """요청을 보낸 뒤 호스트의 p95 안에 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 쪽을 쓴다"""
+        sent = asyncio.Event()
+        tasks = [asyncio.ensure_future(self._fetch_once(url, headers, deadline, sent, waiting))]
+        try:
+            hedge_after = self.scheduler.hedge_delay(url)
+            if hedge_after is not None:
+                waiter = asyncio.ensure_future(sent.wait())
+                await asyncio.wait([tasks[0], waiter], return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                worth_it = deadline is None or hedge_after < deadline.remaining(self.fetch_share)
+                if not tasks[0].done() and worth_it:
+                    await asyncio.wait(tasks, timeout=hedge_after)
+                    if not tasks[0].done():
+                        tasks.append(asyncio.ensure_future(self._fetch_once(url, headers, deadline)))
+
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1:
+                            HEDGED_REQUESTS.labels('primary' if task is tasks[0] else 'hedge').inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _cache_entry(self, result, response=None, negative=None, error=None):
+        """캐시 항목: 결과 + 재검증용 ETag/Last-Modified/본문 해시 + 신선도 만료 시각"""
+        ttl = self.negative_cache_ttl if negative else self.cache_ttl
+        entry = {'result': result, 'fresh_until': time.time() + ttl.total_seconds()}
+        if negative:
+            entry['negative'] = negative
+            entry['error'] = error
+        if response is not None:
+            entry['etag'] = response.headers.get('etag')
+            entry['last_modified'] = response.headers.get('last-modified')
+            entry['content_hash'] = hashlib.sha1(response.content).hexdigest()
+        return entry
+
+    @staticmethod
+    def _upgrade_entry(entry):
+        if 'fresh_until' not in entry:
+            # 검증자 없이 결과만 저장하던 이전 형식
+            entry = {'result': entry, 'fresh_until': float('inf')}
+        return entry
+
+    async def _cache_get(self, cache_key):
+        """캐시 항목 조회 (로컬 LRU → Redis, Redis 장애 시에는 캐시 없이 진행)"""
+        entry = await self.cache.get(cache_key)
+        return self._upgrade_entry(entry) if entry is not None else None
+
+    async def prefetch_cache(self, urls):
+        """배치 전체 키를 MGET 한 번으로 읽어 로컬 LRU 에 올려둔다"""
+        entries = await self.cache.get_many([self._get_cache_key(url) for url in urls])
+        return len(entries)
+
+    async def _original_content(self, url):
+        """원문 URL 의 캐시된 본문 (캐시에 없거나 네거티브 항목이면 None)"""
+        original = await self._cache_get(self._get_cache_key(url))
+        if not original or original.get('negative'):
+            return None
+        return original['result'].get('content') or None
+
+    async def _stored_result(self, result):
+        """캐시에 넣을 결과 - 중복 기사는 설정에 따라 본문을 빼고 원문 URL 만 남긴다
+
+        원문이 캐시에 없으면(캐시를 건너뛰었거나 부분 결과/네거티브 항목) 본문째 저장한다.
+        그러지 않으면 요청마다 원문을 찾지 못해 다시 스크래핑한다.
+        """
+        if self.store_duplicate_content or not result.get('duplicate_of'):
+            return result
+        if await self._original_content(result['duplicate_of']) is None:
+            return result
+        return dict(result, content=None)
+
+    async def _resolve_duplicate(self, result):
+        """본문 없이 저장된 중복 항목이면 원문 캐시에서 본문을 채운다 (원문도 없으면 None)"""
+        if result.get('content') is not None or not result.get('duplicate_of'):
+            return result
+        content = await self._original_content(result['duplicate_of'])
+        return None if content is None else dict(result, content=content)
+
+    async def _cache_put(self, cache_key, entry):
+        # 성공 항목은 신선도 만료 후에도 재검증용으로 cache_stale_ttl 동안 보관
+        if entry.get('negative'):
+            ttl = self.negative_cache_ttl
+        else:
+            ttl = self.cache_ttl + self.cache_stale_ttl
+        await self.cache.put(cache_key, entry, ttl)
+
+    async def _extract_async(self, response, url, retry, spans, deadline=None):
+        # 파싱/추출은 스레드풀(또는 프로세스 풀)에서 실행
+        if self.extraction_pool:
+            work = self._extract_pooled(response, url, retry, spans, deadline)
+        else:
+            work = self._extract_threaded(response, url, retry, spans, deadline)
+        if deadline is None:
+            return await work
+        # 추출은 예산을 보고 스스로 멈추지만, 한 단계가 오래 걸리면 기다리지 않고 제목만 돌려준다
+        try:
+            return await asyncio.wait_for(work, deadline.remaining() + self.extract_grace)
+        except asyncio.TimeoutError:
+            DEADLINE_EXCEEDED.labels('extract').inc()
+            self.logger.warning(f"추출 시간 예산 초과, 제목만 반환: {url}")
+            return self._partial_result(response, url, 'extract')
+
+    async def _extract_threaded(self, response, url, retry, spans, deadline):
+        # 시간 초과로 버려진 추출은 스레드에서 계속 돌므로 따로 모았다가 끝까지 기다린 경우에만 합친다
+        own_spans = Spans()
+        result = await self._run_blocking(self.extract_from_response, response, url, retry, own_spans, deadline)
+        if spans is not None:
+            spans.merge(own_spans.durations)
+        return result
+
+    async def _extract_pooled(self, response, url, retry, spans, deadline):
+        state = await self._run_blocking(self._worker_state, response, url)
+        result, learned = await self.extraction_pool.extract(response, url, state, retry, spans, deadline)
+        await self._run_blocking(self._apply_worker_learning, result, learned)
+        return result
+
+    def _worker_state(self, response, url):
+        """추출 프로세스 풀 워커에 넘길 도메인 학습 상태 (Redis 조회가 있을 수 있어 스레드풀에서 호출)"""
+        domain = urlparse(url).netloc.lower()
+        encoding_domain = urlparse(response.url).netloc.lower()  # detect_encoding 은 최종 URL 기준
+        return {
+            'encoding': (encoding_domain, self.learned_encodings.get(encoding_domain)),
+            'strategies': (domain, self.strategies.snapshot(domain)),
+            'render_samples': (domain, self.render_classifier.snapshot(domain)),
+            'rules_version': self.rules.version,
+        }
+
+    def _apply_worker_learning(self, result, learned):
+        """워커가 돌려준 학습 기록을 이 프로세스의 표에 적용하고 (Redis 저장 포함) 중복 인덱스 조회"""
+        domain, encoding = learned['encoding']
+        if encoding and self.learned_encodings.get(domain) != encoding:
+            self._learn_encoding(domain, encoding)
+        for name, args in learned['journal']:
+            getattr(self, name).record(*args)
+        self.render_classifier.add_decisions(learned['render_decisions'])
+        if learned['fingerprint'] is not None:
+            result['duplicate_of'] = self.dedup.check_signature(*learned['fingerprint'])
+
+    def _partial_result(self, response, url, stage):
+        """파싱 없이 응답 앞부분의 og:title/<title> 만 읽은 부분 결과"""
+        head = self.safe_decode(response.content[:64 * 1024], normalize_encoding(response.encoding) or 'utf-8')
+        match = OG_TITLE_RE.search(head) or TITLE_TAG_RE.search(head)
+        return {
+            'title': self.clean_title(html_lib.unescape(match.group(1))) if match else None,
+            'authors': [],
+            'publish_date': None,
+            'content': '',
+            'paywall': False,
+            'extractor': None,
+            'network_requests': getattr(response, 'requests', 1),
+            'duplicate_of': None,
+            'partial': True,
+            'deadline_stage': stage,
+        }
+
+    async def extract_with_cache_status(self, url, retry=3, use_cache=None, spans=None, deadline=None,
+                                        local=False):
+        """(결과, 캐시 상태) 반환. 상태는 hit / revalidated / miss / bypass
+
+        spans 를 넘기면 단계별 소요 시간을 호출한 쪽에서도 볼 수 있다 (내보내기 timings 등).
+        deadline 을 넘기지 않으면 article_budget 초 예산을 쓴다. 시간이 모자라면 결과에
+        partial=True 와 초과한 단계(deadline_stage)가 붙는다.
+        클러스터 모드에서는 다른 노드가 담당하는 도메인이면 그 노드에 맡긴다 (local=True 면 직접 처리).
+        """
+        use_cache = self.cache_enabled if use_cache is None else use_cache
+        deadline = Deadline(self.article_budget, start=False) if deadline is None else deadline
+        cache_key = self._get_cache_key(url)
+        spans = Spans() if spans is None else spans
+        try:
+            entry = None
+            if use_cache:
+                with spans.span('redis'):
+                    entry = await self._cache_get(cache_key)
+
+            if entry and entry['fresh_until'] > time.time():
+                if entry.get('negative') == 'error':
+                    CACHE_RESULTS.labels('hit').inc()
+                    raise CachedFailure(entry.get('error'))
+                result = await self._resolve_duplicate(entry['result'])
+                if result is not None:
+                    CACHE_RESULTS.labels('hit').inc()
+                    return result, 'hit'
+                entry = None  # 원문 캐시가 사라진 본문 없는 중복 항목은 다시 스크래핑
+
+            owner = self.cluster.owner(url) if self.cluster is not None and not local else None
+            if owner is not None:
+                # 담당 노드의 /cluster/scrape 가 같은 키의 (공유) 락을 잡아야 하므로 맡기기는 따로 합친다
+                forwarded = await self.inflight.do(
+                    f"forward:{cache_key}", lambda: self._forward(owner, url, use_cache, spans, deadline), deadline)
+                if forwarded is not None:
+                    return forwarded  # 캐시 통계는 담당 노드에서 기록
+
+            # 같은 URL을 동시에 요청한 호출은 하나의 스크래핑 결과를 함께 받는다
+            result, status = await self.inflight.do(
+                cache_key,
+                lambda: self._scrape_limited(url, retry, use_cache, cache_key, entry, spans, deadline),
+                deadline,
+            )
+            CACHE_RESULTS.labels(status).inc()
+            return result, status
+        finally:
+            spans.observe(urlparse(url).netloc)
+
+    async def _forward(self, owner, url, use_cache, spans, deadline):
+        """담당 노드에 스크래핑을 맡긴다. 담당 노드에 닿지 않으면 None (이 노드에서 직접 처리)"""
+        node_id, address = owner
+        try:
+            with spans.span('forward'):
+                result = await self.cluster.forward(address, url, use_cache, deadline.remaining())
+        except ForwardedError as e:
+            CLUSTER_FORWARDS.labels('forwarded').inc()
+            if e.kind == 'cached':
+                raise CachedFailure(str(e)) from e
+            if e.kind == 'deadline':
+                raise DeadlineExceeded(e.stage) from e
+            raise
+        except httpx.HTTPError as e:
+            CLUSTER_FORWARDS.labels('fallback').inc()
+            self.logger.warning(f"담당 노드 {node_id} 에 맡기지 못해 직접 처리: {url}: {e}")
+            return None
+        CLUSTER_FORWARDS.labels('forwarded').inc()
+        return result
+
+    async def _scrape_limited(self, url, retry, use_cache, cache_key, entry, spans, deadline=None):
+        """정적 경로 동시 처리 한도 안에서 스크래핑하고 지연/과부하 여부를 한도에 반영
+
+        지연은 요청을 보내고 추출을 마칠 때까지만 잰다. 호스트 슬롯/재시도 간격을 기다리는 동안은
+        자리를 내줘 한 호스트의 제한이 다른 호스트 작업을 막지 않게 하고, 렌더링 시간은 브라우저
+        한도가 따로 보므로 뺀다.
+        """
+        with spans.span('scrape_queue'), EXTRACT_WAITING.track_inprogress():
+            await self.static_limit.acquire()
+        held = True
+
+        @asynccontextmanager
+        async def waiting(stage):
+            nonlocal held
+            start = time.perf_counter()
+            self.static_limit.step_aside()
+            held = False
+            try:
+                yield
+                await self.static_limit.acquire()  # 취소되면 다시 받지 않는다 (release 도 건너뜀)
+                held = True
+            finally:
+                spans.add(stage, time.perf_counter() - start)
+
+        start = time.monotonic()
+        excluded = sum(spans.durations.get(stage, 0.0) for stage in UNLIMITED_STAGES)
+        overloaded = False
+        try:
+            with EXTRACT_ACTIVE.track_inprogress():
+                result, status = await self._scrape_and_cache(url, retry, use_cache, cache_key, entry, spans,
+                                                              deadline, waiting)
+            overloaded = bool(result and result.get('partial'))
+            return result, status
+        except OVERLOAD_ERRORS:
+            overloaded = True
+            raise
+        finally:
+            if held:
+                excluded = sum(spans.durations.get(stage, 0.0) for stage in UNLIMITED_STAGES) - excluded
+                self.static_limit.release(max(time.monotonic() - start - excluded, 0.0), overloaded)
+
+    async def _scrape_and_cache(self, url, retry, use_cache, cache_key, entry, spans, deadline=None, waiting=None):
+        # 만료된 성공 항목은 조건부 GET으로 재검증
+        stale = entry if entry and not entry.get('negative') else None
+        stale_result = await self._resolve_duplicate(stale['result']) if stale else None
+        if stale_result is None:
+            stale = None
+        conditional_headers = {}
+        if stale:
+            if stale.get('etag'):
+                conditional_headers['If-None-Match'] = stale['etag']
+            if stale.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = stale['last_modified']
+
+        try:
+            # 네트워크 대기는 호스트별 스케줄러 아래 이벤트 루프에서 수행
+            with spans.span('fetch'):
+                response = await self.fetch_politely(url, retry, headers=conditional_headers or None,
+                                                     deadline=deadline, waiting=waiting)
+            RESPONSE_BYTES.observe(len(response.content))
+
+            if stale and (
+                response.status_code == 304
+                or hashlib.sha1(response.content).hexdigest() == stale.get('content_hash')
+            ):
+                # 변경 없음: 추출을 건너뛰고 기존 결과의 신선도만 갱신
+                refreshed = self._cache_entry(stale['result'])
+                for field in ('etag', 'last_modified', 'content_hash'):
+                    refreshed[field] = stale.get(field)
+                if response.status_code != 304:
+                    refreshed['etag'] = response.headers.get('etag') or stale.get('etag')
+                    refreshed['last_modified'] = response.headers.get('last-modified') or stale.get('last_modified')
+                with spans.span('redis'):
+                    await self._cache_put(cache_key, refreshed)
+                return stale_result, 'revalidated'
+            # 재시도 후에도 남은 429/503 이나 404 등은 추출/캐싱하지 않고 짧은 네거티브 항목으로
+            if not 200 <= response.status_code < 300:
+                raise BadStatus(url, response.status_code)
+
+            result = await self._extract_async(response, url, retry, spans, deadline)
+        except Exception as e:
+            self.logger.error(f"기사 추출 실패: {e}")
+            # 시간 예산 초과는 다음 요청에서는 성공할 수 있으므로 네거티브 캐시에 넣지 않음
+            if use_cache and not isinstance(e, DeadlineExceeded):
+                await self._cache_put(cache_key, self._cache_entry(None, negative='error', error=str(e)))
+            raise
+
+        # 결과 캐싱 (본문이 없거나 페이월이면 짧은 TTL의 네거티브 항목, 부분 결과는 저장하지 않음)
+        if use_cache and result and not result.get('partial'):
+            if result.get('content'):
+                entry = self._cache_entry(await self._stored_result(result), response)
+            else:
+                reason = 'paywall' if result.get('paywall') else 'empty'
+                entry = self._cache_entry(result, negative=reason)
+            with spans.span('redis'):
+                await self._cache_put(cache_key, entry)
+
+        return result, 'miss' if use_cache else 'bypass'
+
+    async def extract_article_with_metadata_async(self, url, retry=3, deadline=None):
+        result, _ = await self.extract_with_cache_status(url, retry, deadline=deadline)
+        return result
@@ -0,0 +1,158 @@
+"""동시 처리 한도 시뮬레이션: 고정 한도 vs 적응형 한도 (AIMD)
+
+    python -m benchmarks.adaptive_limits [--requests 800] [--renders 120]
+
+지연을 주입하는 로컬 스텁 서버로 세 가지 상황을 만든다.
+    static-fast      서버 여유가 많은 정적 페이지 (고정 30 은 너무 적음)
+    static-overload  동시 처리 능력이 20 인 서버 (동시 요청이 늘면 지연이 그만큼 늘어남)
+    browser          렌더링마다 Chrome 메모리를 쓰는 브라우저 경로 (메모리 한도를 넘으면 OOM 으로
+                     진행 중인 렌더링이 모두 실패)
+브라우저 경로는 실제로는 BrowserPool 크기로 조절하지만, 여기서는 같은 한도 계산을 AsyncLimiter 로 돌린다.
+"""
+import argparse
+import asyncio
+import logging
+import threading
+import time
+
+import httpx
+
+from benchmarks.stub_server import StubServer
+from limiter import AsyncLimiter
+
+PAGE = ("<html><body><article>" + "<p>본문</p>" * 200 + "</article></body></html>").encode("utf-8")
+MB = 2 ** 20
+
+
+class Backend:
+    """동시 처리 능력이 capacity 인 서버: 동시 요청이 그보다 많으면 지연이 비례해서 늘어난다
+
+    StubServer 의 지연 함수로 쓰며, 직접 기다린 뒤 0 을 돌려준다 (요청이 끝날 때를 알기 위해).
+    """
+
+    def __init__(self, base, capacity):
+        self.base = base
+        self.capacity = capacity
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, path):
+        with self._lock:
+            self.active += 1
+            delay = self.base * max(1.0, self.active / self.capacity)
+        time.sleep(delay)
+        with self._lock:
+            self.active -= 1
+        return 0
+
+
+class Chrome:
+    """렌더링 하나당 chrome_mb 를 쓰고 CPU cores 개를 나눠 쓰는 브라우저 묶음"""
+
+    def __init__(self, base=0.2, cores=4, chrome_mb=300, memory_limit=2048 * MB, baseline_mb=400):
+        self.base = base
+        self.cores = cores
+        self.chrome = chrome_mb * MB
+        self.memory_limit = memory_limit
+        self.baseline = baseline_mb * MB
+        self.rendering = 0
+        self.generation = 0     # OOM 이 날 때마다 증가 (진행 중이던 렌더링은 실패)
+        self.ooms = 0
+
+    def memory(self):
+        return self.baseline + self.rendering * self.chrome
+
+    async def render(self):
+        self.rendering += 1
+        generation = self.generation
+        if self.memory() > self.memory_limit:
+            self.ooms += 1
+            self.generation += 1
+        try:
+            await asyncio.sleep(self.base * max(1.0, self.rendering / self.cores))
+            if generation != self.generation:
+                raise RuntimeError("OOM 으로 브라우저 종료")
+        finally:
+            self.rendering -= 1
+
+
+def make_limiter(mode, name, initial, max_limit, **kwargs):
+    if mode == "fixed":
+        return AsyncLimiter(name, initial, min_limit=initial, max_limit=initial)
+    return AsyncLimiter(name, initial, max_limit=max_limit, **kwargs)
+
+
+async def drive(limiter, total, work, concurrency):
+    """작업 total 건을 동시에 concurrency 개씩 밀어 넣는다 (한도가 실제 동시 실행 수를 정함)"""
+    latencies, errors = [], 0
+    queue = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in queue:
+            await limiter.acquire()
+            start = time.monotonic()
+            error = False
+            try:
+                await work()
+            except Exception:
+                error = True
+                errors += 1
+            finally:
+                latency = time.monotonic() - start
+                limiter.release(latency, error)
+            latencies.append(latency)
+
+    start = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.monotonic() - start
+
+
+async def run_static(mode, backend, total):
+    limiter = make_limiter(mode, f"bench-{mode}", 30, 120, min_limit=4)
+    with StubServer({"/article": PAGE}, latency=backend) as stub:
+        limits = httpx.Limits(max_connections=200, max_keepalive_connections=200)
+        async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+            async def fetch():
+                response = await client.get(stub.base_url + "/article")
+                response.raise_for_status()
+
+            latencies, errors, elapsed = await drive(limiter, total, fetch, concurrency=200)
+    return latencies, errors, elapsed, limiter.limit, None
+
+
+async def run_browser(mode, total):
+    chrome = Chrome()
+    limiter = make_limiter(mode, f"bench-browser-{mode}", 8 if mode == "fixed" else 2, 16, window=5,
+                           memory=chrome.memory, memory_limit=int(chrome.memory_limit * 0.9))
+    latencies, errors, elapsed = await drive(limiter, total, chrome.render, concurrency=32)
+    return latencies, errors, elapsed, limiter.limit, chrome.ooms
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="고정 vs 적응형 동시 처리 한도")
+    parser.add_argument("--requests", type=int, default=800, help="정적 상황별 요청 수")
+    parser.add_argument("--renders", type=int, default=120, help="브라우저 상황 렌더링 수")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    scenarios = [
+        ("static-fast", lambda mode: run_static(mode, Backend(1.0, 200), args.requests)),
+        ("static-overload", lambda mode: run_static(mode, Backend(1.0, 20), args.requests)),
+        ("browser", lambda mode: run_browser(mode, args.renders)),
+    ]
+    print(f"{'상황':<17}{'한도':<10}{'처리량/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'오류':>6}{'OOM':>5}{'최종 한도':>10}")
+    for name, run in scenarios:
+        for mode in ("fixed", "adaptive"):
+            latencies, errors, elapsed, limit, ooms = asyncio.run(run(mode))
+            print(f"{name:<17}{mode:<10}{len(latencies) / elapsed:>9.1f}{percentile(latencies, 50) * 1000:>9.1f}"
+                  f"{percentile(latencies, 95) * 1000:>9.1f}{errors:>6}{'-' if ooms is None else ooms:>5}{limit:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""articles/ 에 저장된 기사로 벤치마크용 HTML 코퍼스 생성"""
+import glob
+import html
+import os
+import re
+
+ARTICLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "articles")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="{charset}">
+<title>{title}</title>
+<meta property="og:title" content="{title}">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<script src="/static/js/common.js"></script>
+</head>
+<body>
+<header><nav>{nav}</nav></header>
+<article>
+<h1 class="title">{title}</h1>
+<div class="author">{author}</div>
+<div class="article content">
+{paragraphs}
+</div>
+</article>
+<aside>{nav}</aside>
+<footer><p>Copyright. All rights reserved.</p></footer>
+</body>
+</html>
+"""
+
+
+def parse_saved_article(path):
+    """test.py save_article 형식(헤더 + 구분선 + 본문)을 읽어 dict로 반환"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        raw = f.read()
+    header, _, body = raw.partition("-" * 50)
+    fields = dict(re.findall(r"^(\S+): (.*)$", header, re.MULTILINE))
+    return {
+        "site": os.path.basename(path).rsplit("_", 1)[0],
+        "title": fields.get("제목", ""),
+        "authors": fields.get("작성자", ""),
+        "url": fields.get("원본 URL", ""),
+        "content": body.strip(),
+    }
+
+
+def build_page(article, charset="utf-8"):
+    """저장된 본문을 뉴스 사이트와 비슷한 구조의 HTML 페이지로 감싼다"""
+    sentences = re.split(r"(?<=[.!?다])\s+", article["content"])
+    paragraphs = "\n".join(
+        f"<p>{html.escape(' '.join(sentences[i:i + 3]))}</p>"
+        for i in range(0, len(sentences), 3)
+    )
+    nav = "".join(f'<a href="/section/{i}">메뉴 {i}</a>' for i in range(40))
+    page = PAGE_TEMPLATE.format(
+        charset=charset,
+        title=html.escape(article["title"]),
+        author=html.escape(article["authors"]),
+        nav=nav,
+        paragraphs=paragraphs,
+    )
+    return page.encode(charset, errors="replace")
+
+
+def load_corpus(charset="utf-8"):
+    """(기사 정보, HTML 바이트) 목록"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(ARTICLES_DIR, "*.txt"))):
+        article = parse_saved_article(path)
+        if article["content"]:
+            corpus.append((article, build_page(article, charset)))
+    return corpus
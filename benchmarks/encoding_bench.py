@@ -0,0 +1,79 @@
+"""인코딩 감지 마이크로 벤치마크 (UTF-8 / EUC-KR / CP949 페이지, meta 유무별)
+
+    python -m benchmarks.encoding_bench [반복횟수]
+"""
+import logging
+import re
+import statistics
+import sys
+import time
+
+import chardet
+from bs4 import BeautifulSoup
+
+from article_scraper import ArticleScraper
+from benchmarks.corpus import build_page, load_corpus
+from fetcher import FetchResult
+
+
+def legacy_detect(response):
+    """이전 detect_encoding: meta 탐색용 BeautifulSoup + 본문 전체 chardet"""
+    soup = BeautifulSoup(response.content[:2000], 'html.parser')
+    meta = soup.find('meta', charset=True)
+    if meta:
+        return meta['charset'].lower()
+    detector = chardet.UniversalDetector()
+    for start in range(0, len(response.content), 1000):
+        detector.feed(response.content[start:start + 1000])
+        if detector.done: break
+    detector.close()
+    return (detector.result.get('encoding') or 'utf-8').lower()
+
+
+def variants():
+    corpus = load_corpus()
+    for charset in ('utf-8', 'euc-kr', 'cp949'):
+        for with_meta in (True, False):
+            pages = []
+            for i, (article, _) in enumerate(corpus):
+                page = build_page(article, charset)
+                if not with_meta:
+                    page = re.sub(rb'<meta charset="[^"]+">', b'', page)
+                # 도메인 학습값이 섞이지 않도록 기사마다 다른 호스트 사용
+                pages.append(FetchResult(url=f"http://site{i}.example/", status_code=200, content=page))
+            yield f"{charset:<6} {'meta' if with_meta else 'no-meta':<7}", charset, pages
+
+
+def measure(detect, pages, rounds):
+    timings = []
+    correct = 0
+    for _ in range(rounds):
+        for response in pages:
+            start = time.perf_counter()
+            encoding = detect(response)
+            timings.append((time.perf_counter() - start) * 1000)
+            try:
+                correct += response.content.decode(encoding) == response.content.decode(response.expected)
+            except (UnicodeDecodeError, LookupError):
+                pass
+    return statistics.mean(timings), correct / (len(pages) * rounds)
+
+
+def main():
+    logging.getLogger('bs4').setLevel(logging.ERROR)
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+
+    print(f"{'page':<15} {'legacy':>10} {'layered':>10} {'speedup':>8}  정확도(legacy/layered)")
+    for name, charset, pages in variants():
+        for response in pages:
+            response.expected = charset
+        legacy_ms, legacy_ok = measure(legacy_detect, pages, rounds)
+        scraper.learned_encodings.clear()
+        layered_ms, layered_ok = measure(scraper.detect_encoding, pages, rounds)
+        print(f"{name:<15} {legacy_ms:8.3f}ms {layered_ms:8.3f}ms {legacy_ms / layered_ms:7.1f}x  "
+              f"{legacy_ok:.0%}/{layered_ok:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""추출 처리량 벤치마크: 스레드풀 vs 프로세스 풀 (articles/ 코퍼스, 네트워크 없음)
+
+    python -m benchmarks.extract_throughput [반복횟수] [프로세스수]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from article_scraper import ArticleScraper
+from benchmarks.corpus import load_corpus
+from fetcher import FetchResult
+from metrics import Spans
+
+
+async def run(scraper, responses):
+    start = time.perf_counter()
+    await asyncio.gather(*(scraper._extract_async(response, response.url, 3, Spans()) for response in responses))
+    return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    responses = [
+        FetchResult(url=article["url"] or "http://localhost/", status_code=200, content=page, encoding="utf-8")
+        for article, page in load_corpus()
+    ] * rounds
+    print(f"기사 {len(responses)}건, CPU {os.cpu_count()}개")
+
+    threaded = ArticleScraper(cache_enabled=False, redis_client=None)
+    pooled = ArticleScraper(cache_enabled=False, extraction_processes=processes, redis_client=None)
+
+    # 프로세스 기동/모듈 import 비용은 측정에서 제외
+    asyncio.run(run(pooled, responses[:processes * 2]))
+
+    for name, scraper in [("threads (30)", threaded), (f"processes ({processes})", pooled)]:
+        elapsed = asyncio.run(run(scraper, responses))
+        print(f"{name:<16} {elapsed:6.2f}s  {len(responses) / elapsed:7.1f} articles/s")
+
+    pooled.extraction_pool.close()
+
+
+if __name__ == "__main__":
+    main()
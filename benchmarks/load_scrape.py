@@ -0,0 +1,72 @@
+"""/scrape 동시 요청 부하 테스트 (로컬 스텁 서버 대상)
+
+    python -m benchmarks.load_scrape [동시요청수] [총요청수] [스텁지연초]
+
+캐시는 끄고 실행한다.
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+import main
+from benchmarks.corpus import load_corpus
+from benchmarks.stub_server import StubServer
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+async def run_load(base_url, paths, concurrency, total):
+    # 세마포어/httpx 클라이언트가 이 이벤트 루프에 묶이도록 스크래퍼를 루프 안에서 새로 만든다 (Python 3.9)
+    main.scraper = main.ArticleScraper(headless=True, cache_enabled=False, redis_client=None)
+    transport = httpx.ASGITransport(app=main.app)
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(paths[i % len(paths)])
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://scraper", timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get("/scrape", params={"url": base_url + path})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    await main.scraper.fetcher.aclose()
+    return latencies, errors, elapsed
+
+
+def main_cli():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+    pages = {f"/article/{i}": page for i, (_, page) in enumerate(load_corpus())}
+    with StubServer(pages, latency=latency) as stub:
+        latencies, errors, elapsed = asyncio.run(
+            run_load(stub.base_url, list(pages), concurrency, total)
+        )
+
+    print(f"동시 요청 {concurrency}, 총 {total}건, 스텁 지연 {latency * 1000:.0f}ms")
+    print(f"  p50 {percentile(latencies, 50):8.1f}ms")
+    print(f"  p99 {percentile(latencies, 99):8.1f}ms")
+    print(f"  mean {statistics.mean(latencies):7.1f}ms")
+    print(f"  throughput {total / elapsed:7.1f} req/s  (오류 {errors}건)")
+
+
+if __name__ == "__main__":
+    main_cli()
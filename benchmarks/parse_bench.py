@@ -0,0 +1,80 @@
+"""기사당 파싱 시간 벤치마크: 기존 다중 파싱 경로 vs ParsedDocument 단일 파싱 경로
+
+    python -m benchmarks.parse_bench [반복횟수]
+"""
+import logging
+import statistics
+import sys
+import time
+
+import chardet
+import trafilatura
+from bs4 import BeautifulSoup
+
+from article_scraper import ArticleScraper, ParsedDocument
+from benchmarks.corpus import load_corpus
+
+
+def legacy_pipeline(scraper, url, raw):
+    """이전 extract_article_with_metadata 의 파싱 순서를 그대로 재현"""
+    soup = BeautifulSoup(raw[:2000], 'html.parser')
+    meta = soup.find('meta', charset=True)
+    if not meta:
+        detector = chardet.UniversalDetector()
+        detector.feed(raw)
+        detector.close()
+    decoded = raw.decode('utf-8', errors='replace')
+    content = trafilatura.extract(decoded, include_comments=False)
+    soup = BeautifulSoup(decoded, 'html.parser')
+    title = soup.select_one('meta[property="og:title"]')
+    authors = [e.get_text().strip() for e in soup.select('.author')]
+    BeautifulSoup(decoded, 'html.parser').find_all(['p', 'article', 'div'], class_=['article', 'content', 'story'])
+    text = BeautifulSoup(decoded, 'html.parser').get_text().lower()
+    return title, authors, content, text
+
+
+def single_parse_pipeline(scraper, url, raw):
+    doc = ParsedDocument(raw.decode('utf-8', errors='replace'))
+    title = scraper.clean_title(scraper.extract_title(doc, url))
+    authors = [e.text_content().strip() for e in doc.select('.author')]
+    content = scraper._extract_with_trafilatura(doc.tree)
+    scraper.is_javascript_required(doc, url)
+    scraper.is_paywall(doc)
+    return title, authors, content
+
+
+def run(pipeline, scraper, corpus, rounds):
+    timings = []
+    for _ in range(rounds):
+        for article, raw in corpus:
+            start = time.perf_counter()
+            pipeline(scraper, article["url"], raw)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    logging.getLogger('bs4').setLevel(logging.ERROR)
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    # Redis 없이: 렌더링 표본 조회 등 네트워크 왕복이 측정 구간에 끼지 않도록
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    corpus = load_corpus()
+    print(f"코퍼스: {len(corpus)}개 기사, 반복 {rounds}회")
+
+    results = {}
+    for name, pipeline in [("before (multi-parse)", legacy_pipeline), ("after (single-parse)", single_parse_pipeline)]:
+        timings = run(pipeline, scraper, corpus, rounds)
+        results[name] = timings
+        print(
+            f"{name:<22} mean {statistics.mean(timings):7.2f}ms  "
+            f"median {statistics.median(timings):7.2f}ms  "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95)]:7.2f}ms"
+        )
+
+    # 느린 기사 몇 개에 흔들리지 않도록 중앙값 기준
+    before, after = (statistics.median(t) for t in results.values())
+    print(f"speedup (median): {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
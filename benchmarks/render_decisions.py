@@ -0,0 +1,114 @@
+"""JS 렌더링 판단 비교: 이전 규칙(heuristic) vs 분류기(classifier)
+
+    python -m benchmarks.render_decisions [--dir benchmarks/recordings]
+
+articles/ 코퍼스 페이지를 네 가지 모양으로 만들어 판단한다.
+    static   기사 본문이 HTML 에 있는 페이지
+    tracked  static + <noscript> 추적 코드 + javascript:void(0) 링크 (국내 언론사 대부분)
+    shell    본문 없이 #app 과 번들 스크립트만 있는 SPA 껍데기 (렌더링이 필요한 경우)
+    brief    사진/속보처럼 본문이 원래 짧은 페이지 + 추적 코드 (렌더링해도 본문이 없음)
+녹화본 디렉터리가 있으면 녹화된 원본 응답도 함께 판단한다.
+
+정답은 "정적 HTML 로는 유효한 본문이 없고 렌더링하면 생기는가" 이고, 모드별로
+  판단  extract_article 처럼 추출 전에 렌더링 여부를 물었을 때의 렌더링/불필요/누락 건수
+  경로  extract_from_response 를 실제로 돌렸을 때 렌더링 시도 횟수 (렌더링 자체는 하지 않음)
+를 출력한다. 렌더링 결과는 같은 기사의 static 페이지로 대신하고, 모양마다 도메인을
+따로 두어 실제 사이트처럼 도메인 안에서는 페이지 구조가 같도록 한다.
+"""
+import argparse
+import html
+import logging
+import os
+import re
+
+from article_scraper import ArticleScraper, ParsedDocument
+from benchmarks.corpus import load_corpus
+from benchmarks.replay import DEFAULT_DIR, load_recordings
+from fetcher import FetchResult
+from render_classifier import RenderClassifier
+
+SHELL_TEMPLATE = """<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{title}</title>
+<script src="/static/js/runtime.js"></script><script src="/static/js/vendor.js"></script>
+<script src="/static/js/main.js"></script></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="app"></div></body></html>"""
+
+TRACKING = ('<noscript><iframe src="https://www.googletagmanager.com/ns.html?id=GTM-XXXX" '
+            'height="0" width="0"></iframe></noscript><a href="javascript:void(0)" class="share">공유</a>')
+
+
+def build_pages(recordings_dir):
+    """(모양, URL, HTML 바이트, 렌더링 결과 HTML) 목록"""
+    pages = []
+    for index, (article, page) in enumerate(load_corpus()):
+        site = article["site"].lower()
+        shell = SHELL_TEMPLATE.format(title=html.escape(article["title"])).encode("utf-8")
+        tracked = page.replace(b"<body>", b"<body>" + TRACKING.encode())
+        brief = re.sub(rb"<p>.*</p>", b"<p>" + html.escape(article["title"]).encode("utf-8") + b"</p>",
+                       tracked, count=1, flags=re.DOTALL)
+        for shape, raw, result in (("static", page, page), ("tracked", tracked, tracked), ("shell", shell, page),
+                                   ("brief", brief, brief)):
+            pages.append((shape, f"https://{shape}.{site}.example.com/article/{index}", raw, result))
+    if recordings_dir and os.path.exists(os.path.join(recordings_dir, "manifest.json")):
+        for entry in load_recordings(recordings_dir):
+            pages.append(("recorded", entry["url"], entry["content"], entry["content"]))
+    return pages
+
+
+def make_scraper(mode):
+    scraper = ArticleScraper(cache_enabled=False, render_decision=mode, redis_client=None)
+    scraper.render_classifier = RenderClassifier(explore_rate=0)
+    return scraper
+
+
+def evaluate(mode, pages):
+    scraper = make_scraper(mode)
+    rendered = {url: result.decode("utf-8", errors="replace") for _, url, _, result in pages}
+    renders = []
+
+    def fake_render(url, timeout=30):
+        renders.append(url)
+        return rendered.get(url)
+
+    scraper.get_js_rendered_content = fake_render
+    report = {"pages": len(pages), "needed": 0, "render": 0, "unnecessary": 0, "missed": 0, "pipeline_renders": 0}
+    def has_content(raw):
+        doc = ParsedDocument(raw.decode("utf-8", errors="replace"))
+        return scraper._is_valid_content(scraper._extract_with_trafilatura(doc.tree))
+
+    for _, url, raw, result in pages:
+        doc = ParsedDocument(raw.decode("utf-8", errors="replace"))
+        needed = not has_content(raw) and has_content(result)
+        render = scraper.is_javascript_required(doc, url)
+        report["needed"] += needed
+        report["render"] += render
+        report["unnecessary"] += render and not needed
+        report["missed"] += needed and not render
+
+        before = len(renders)
+        response = FetchResult(url=url, status_code=200, content=raw, encoding="utf-8")
+        scraper.extract_from_response(response, url)
+        report["pipeline_renders"] += len(renders) > before
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JS 렌더링 판단 비교")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="녹화본 디렉터리 (없으면 코퍼스만)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    pages = build_pages(args.dir)
+    reports = {mode: evaluate(mode, pages) for mode in ("heuristic", "classifier")}
+
+    print(f"페이지 {len(pages)}개 (렌더링이 실제로 필요한 페이지 {reports['heuristic']['needed']}개)\n")
+    print(f"{'모드':<12}{'판단 렌더링':>12}{'불필요':>8}{'누락':>6}{'경로 렌더링':>12}")
+    for mode, report in reports.items():
+        print(f"{mode:<12}{report['render']:>12}{report['unnecessary']:>8}{report['missed']:>6}"
+              f"{report['pipeline_renders']:>12}")
+    before, after = reports["heuristic"], reports["classifier"]
+    print(f"\n피한 렌더링: 판단 {before['render'] - after['render']}건, "
+          f"경로 {before['pipeline_renders'] - after['pipeline_renders']}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""녹화/재생 벤치마크: 원본 HTTP 응답을 저장해 두고 로컬 스텁 서버로 재생한다
+
+    python -m benchmarks.replay record [--dir DIR]     # test_urls 를 실제로 받아 녹화 (네트워크 필요)
+    python -m benchmarks.replay seed [--dir DIR]       # 네트워크 없이 articles/ 로 녹화본 생성
+    python -m benchmarks.replay run [--dir DIR] [--rounds 5] [--concurrency 10]
+                                    [--save-baseline] [--tolerance 0.2]
+
+녹화본 디렉터리(기본 benchmarks/recordings):
+    manifest.json   URL, 최종 URL, 상태코드, 헤더, 기대 추출 결과(제목/본문)
+    <key>.body      원본 응답 바이트 (디코딩하지 않음)
+    baseline.json   run --save-baseline 으로 저장한 성능 기준값 (장비별로 따로 저장)
+
+run 은 ArticleScraper 의 실제 페치(httpx 풀)·추출 경로를 그대로 타되 요청만 스텁 서버로
+돌린다. JS 렌더링은 재생할 수 없으므로 건너뛴다. 추출 품질이 기대값과 다르거나 성능이
+기준값보다 tolerance 이상 나빠지면 종료 코드 1.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+
+from article_scraper import ArticleScraper
+from benchmarks.corpus import load_corpus
+from benchmarks.sites import test_urls
+from benchmarks.stub_server import StubServer
+from fetcher import AsyncFetcher
+from metrics import Spans
+from scheduler import HostScheduler
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+# 재생 시 의미가 없거나(requests 가 이미 풀어놓은 압축 등) 스텁이 다시 붙이는 헤더
+DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive",
+                "set-cookie", "strict-transport-security", "alt-svc"}
+
+
+def recording_key(url):
+    return hashlib.md5(url.encode()).hexdigest()[:12]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def similarity(expected, actual):
+    """단어 집합 Jaccard 유사도"""
+    expected_words, actual_words = set(expected.split()), set(actual.split())
+    if not expected_words and not actual_words:
+        return 1.0
+    return len(expected_words & actual_words) / len(expected_words | actual_words)
+
+
+def save_recordings(directory, entries):
+    os.makedirs(directory, exist_ok=True)
+    manifest = []
+    for entry in entries:
+        body = entry.pop("body")
+        entry["body"] = f"{entry['key']}.body"
+        with open(os.path.join(directory, entry["body"]), "wb") as f:
+            f.write(body)
+        manifest.append(entry)
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"녹화본 {len(manifest)}건 저장: {directory}")
+
+
+def load_recordings(directory):
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    for entry in manifest:
+        with open(os.path.join(directory, entry["body"]), "rb") as f:
+            entry["content"] = f.read()
+    return manifest
+
+
+def record(directory):
+    """test_urls 를 실제로 받아 원본 응답과 현재 추출 결과(기대값)를 저장"""
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    entries = []
+    for site, url in test_urls.items():
+        try:
+            response = scraper.fetch(url)
+            result = scraper.extract_from_response(response, url)
+        except Exception as e:
+            print(f"  [실패] {site}: {e}")
+            continue
+        entries.append({
+            "key": recording_key(url),
+            "site": site,
+            "url": url,
+            "final_url": response.url,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROP_HEADERS},
+            "expected": {"title": result["title"], "content": result["content"]},
+            "body": response.content,
+        })
+        print(f"  [녹화] {site}: {len(response.content)}바이트, 본문 {len(result['content'])}자")
+    save_recordings(directory, entries)
+
+
+def seed(directory):
+    """네트워크 없이 articles/ 에 저장된 기사로 사이트별 녹화본을 만든다 (기대값 = 저장된 본문)"""
+    latest = {}
+    for article, page in load_corpus():
+        if article["site"] in test_urls:
+            latest[article["site"]] = (article, page)  # 파일명 타임스탬프 순이므로 마지막이 최신
+    entries = []
+    for site, (article, page) in latest.items():
+        url = test_urls[site]
+        entries.append({
+            "key": recording_key(url),
+            "site": site,
+            "url": url,
+            "final_url": url,
+            "status": 200,
+            "headers": {"Content-Type": "text/html; charset=utf-8"},
+            "expected": {"title": article["title"], "content": article["content"]},
+            "body": page,
+        })
+    save_recordings(directory, entries)
+
+
+class ReplayFetcher(AsyncFetcher):
+    """원래 URL 요청을 스텁 서버의 녹화본 경로로 바꿔 보낸다 (결과의 URL은 원래 URL)"""
+
+    def __init__(self, base_url, routes, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+        self.routes = routes  # 원래 URL -> 스텁 경로
+
+    async def fetch(self, url, *args, **kwargs):
+        result = await super().fetch(self.base_url + self.routes[url], *args, **kwargs)
+        result.url = url
+        return result
+
+
+def make_replay_scraper(base_url, recordings, concurrency):
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    scraper.fetcher = ReplayFetcher(base_url, {entry["url"]: f"/{entry['key']}" for entry in recordings},
+                                    headers=scraper.headers)
+    # 사이트 예절용 속도 제한 대신 동시성만 제한 (코드 성능을 재기 위함)
+    scraper.scheduler = HostScheduler(default_policy={"concurrency": concurrency, "rate": 1e9})
+    scraper.get_js_rendered_content = lambda url, timeout=30: None
+    return scraper
+
+
+async def replay(scraper, recordings, rounds, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(entry):
+        async with slots:
+            spans = Spans()
+            start = time.perf_counter()
+            with spans.span("fetch"):
+                response = await scraper.fetch_politely(entry["url"])
+            result = await scraper._extract_async(response, entry["url"], 3, spans)
+            samples.append({
+                "entry": entry,
+                "latency": time.perf_counter() - start,
+                "stages": spans.durations,
+                "result": result,
+            })
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(entry) for _ in range(rounds) for entry in recordings))
+    elapsed = time.perf_counter() - start
+    await scraper.fetcher.aclose()
+    return samples, elapsed
+
+
+def check_quality(samples, min_similarity):
+    failures = {}
+    for sample in samples:
+        entry, result = sample["entry"], sample["result"]
+        expected = entry["expected"]
+        score = similarity(expected["content"], result.get("content") or "")
+        same_title = " ".join((result.get("title") or "").split()) == " ".join(expected["title"].split())
+        if not same_title or score < min_similarity:
+            failures[entry["site"]] = {"title": result.get("title"), "expected_title": expected["title"],
+                                       "similarity": round(score, 3)}
+    return failures
+
+
+def summarize(samples, elapsed):
+    latencies = [s["latency"] * 1000 for s in samples]
+    stages = defaultdict(list)
+    sites = defaultdict(list)
+    for sample in samples:
+        for stage, seconds in sample["stages"].items():
+            stages[stage].append(seconds * 1000)
+        sites[sample["entry"]["site"]].append(sample["latency"] * 1000)
+    return {
+        "articles": len(samples),
+        "throughput": len(samples) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": {
+            stage: {"p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+                    "total_ms": sum(values)}
+            for stage, values in stages.items()
+        },
+        "sites": {
+            site: {"n": len(values), "p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+                   "articles_per_s": len(values) / (sum(values) / 1000)}
+            for site, values in sites.items()
+        },
+    }
+
+
+def print_report(summary):
+    print(f"기사 {summary['articles']}건: {summary['throughput']:.1f} articles/s, "
+          f"p50 {summary['p50_ms']:.1f}ms, p95 {summary['p95_ms']:.1f}ms, p99 {summary['p99_ms']:.1f}ms, "
+          f"최대 RSS {summary['max_rss_mb']:.0f}MB")
+    total = sum(stage["total_ms"] for stage in summary["stages"].values()) or 1
+    print(f"\n{'단계':<22}{'p50 ms':>10}{'p95 ms':>10}{'비중':>8}")
+    for name, stage in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<22}{stage['p50_ms']:>10.2f}{stage['p95_ms']:>10.2f}{stage['total_ms'] / total:>8.1%}")
+    print(f"\n{'사이트':<12}{'건수':>6}{'p50 ms':>10}{'p95 ms':>10}{'건/s':>8}")
+    for site, stats in sorted(summary["sites"].items()):
+        print(f"{site:<12}{stats['n']:>6}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['articles_per_s']:>8.1f}")
+
+
+def find_regressions(summary, baseline, tolerance, floor_ms=1.0):
+    """기준값 대비 tolerance 이상 나빠진 항목 (floor_ms 미만 차이는 측정 잡음으로 무시)"""
+    regressions = []
+    if summary["throughput"] < baseline["throughput"] * (1 - tolerance):
+        regressions.append(f"처리량 {summary['throughput']:.1f} < 기준 {baseline['throughput']:.1f} articles/s")
+
+    def slower(name, current, base):
+        if current > base * (1 + tolerance) and current - base > floor_ms:
+            regressions.append(f"{name} {current:.1f}ms > 기준 {base:.1f}ms")
+
+    slower("p95", summary["p95_ms"], baseline["p95_ms"])
+    for stage, stats in baseline["stages"].items():
+        if stage in summary["stages"]:
+            slower(f"{stage} p95", summary["stages"][stage]["p95_ms"], stats["p95_ms"])
+    return regressions
+
+
+def run(args):
+    recordings = load_recordings(args.dir)
+    pages = {f"/{entry['key']}": (entry["status"], entry["headers"], entry["content"]) for entry in recordings}
+    with StubServer(pages) as stub:
+        scraper = make_replay_scraper(stub.base_url, recordings, args.concurrency)
+        # 첫 실행의 import/캐시 워밍업 비용은 제외
+        asyncio.run(replay(scraper, recordings, 1, args.concurrency))
+        scraper = make_replay_scraper(stub.base_url, recordings, args.concurrency)
+        samples, elapsed = asyncio.run(replay(scraper, recordings, args.rounds, args.concurrency))
+
+    summary = summarize(samples, elapsed)
+    print_report(summary)
+    failed = False
+
+    quality_failures = check_quality(samples, args.min_similarity)
+    for site, failure in quality_failures.items():
+        print(f"[품질] {site}: {failure}")
+        failed = True
+
+    baseline_path = os.path.join(args.dir, "baseline.json")
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for regression in find_regressions(summary, baseline, args.tolerance):
+            print(f"[성능 저하] {regression}")
+            failed = True
+    else:
+        print("\n기준값 없음 (--save-baseline 으로 저장)")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화/재생 벤치마크")
+    parser.add_argument("command", choices=["record", "seed", "run"])
+    parser.add_argument("--dir", default=DEFAULT_DIR)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-similarity", type=float, default=0.9)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.command == "record":
+        record(args.dir)
+    elif args.command == "seed":
+        seed(args.dir)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
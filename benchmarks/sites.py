@@ -0,0 +1,24 @@
+"""test.py 와 녹화/재생 벤치마크가 함께 쓰는 언론사별 테스트 URL"""
+
+test_urls = {
+    "조선일보": "https://www.chosun.com/economy/industry-company/2025/01/10/53UYCPNYXNCUZETTQXEO3ESDLI/",
+    "중앙일보": "https://www.joongang.co.kr/article/25235095",
+    "동아일보": "https://www.donga.com/news/Economy/article/all/20250110/130835500/1",
+    "한겨레": "https://www.hani.co.kr/arti/economy/economy_general/1177260.html",
+    "경향신문": "https://www.khan.co.kr/article/202501101358001",
+    "MBC": "https://imnews.imbc.com/news/2025/econo/article/6675628_36737.html",
+    "KBS": "https://news.kbs.co.kr/news/view.do?ncd=7878391",
+    "SBS": "https://news.sbs.co.kr/news/endPage.do?news_id=N1007574671",
+    "매일경제": "https://www.mk.co.kr/news/politics/10953645",
+    "한국경제": "https://www.hankyung.com/article/2025011085857",
+    "연합뉴스": "https://www.yna.co.kr/view/AKR20250110067700009?section=economy/international-economy",
+    "뉴시스": "https://www.newsis.com/view/NISX20250110_0003027792",
+    "노컷뉴스": "https://www.nocutnews.co.kr/news/6270582?page=1&c1=225",
+    "오마이뉴스": "https://www.ohmynews.com/NWS_Web/View/at_pg.aspx?CNTN_CD=A0003095029",
+    "국민일보": "https://www.kmib.co.kr/article/view.asp?arcid=1736411593&code=11151400&sid1=eco",
+    "서울신문": "https://www.seoul.co.kr/news/newsView.php?id=20240322500094",
+    "세계일보": "https://www.segye.com/newsView/20250110512479",
+    "문화일보": "https://www.munhwa.com/news/view.html?no=2025011001070807207002",
+    "머니투데이": "https://news.mt.co.kr/mtview.php?no=2025011011112051675&MT_T",
+    "이데일리": "https://www.edaily.co.kr/News/Read?newsId=02499366642036408&mediaCodeNo=257"
+}
@@ -0,0 +1,73 @@
+"""벤치마크용 로컬 스텁 HTTP 서버"""
+import http.server
+import threading
+import time
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 기본값 5 는 동시 연결이 몰리면 SYN 재전송(1s, 3s) 지연이 생김
+
+
+class StubServer:
+    """경로별로 고정된 HTML을 돌려주는 스레드 HTTP 서버 (선택적으로 지연 주입)"""
+
+    def __init__(self, pages, latency=0.0, content_type="text/html; charset=utf-8"):
+        self.pages = pages          # {"/path": bytes 또는 (상태코드, 헤더 dict, bytes)}, ETag 헤더가 있으면 304 지원
+        self.latency = latency      # 초 단위 고정 지연 또는 callable(path) -> 초
+        self.content_type = content_type
+        self.requests = 0
+        self._server = None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests += 1
+                delay = stub.latency(self.path) if callable(stub.latency) else stub.latency
+                if delay:
+                    time.sleep(delay)
+                body = stub.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status, headers = 200, {"Content-Type": stub.content_type}
+                if isinstance(body, tuple):
+                    status, headers, body = body
+                if status == 200 and "ETag" in headers and self.headers.get("If-None-Match") == headers["ETag"]:
+                    status, body = 304, b""  # 조건부 GET
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,198 @@
+"""JS 렌더링용 headless Chrome 인스턴스 풀"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """미리 띄워둔 브라우저를 요청마다 빌려주고, N페이지 후 또는 크래시 시 교체한다"""
+
+    def __init__(self, factory, size=2, max_pages=50, lease_timeout=60):
+        self._factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []          # 대기 중인 드라이버 (LIFO: 최근 사용한 것을 먼저)
+        self._pages = {}         # id(driver) -> 렌더링한 페이지 수
+        self._created = 0        # 살아있는 드라이버 수 (대기 + 사용 중)
+        self._waiting = 0
+
+        # 풀 크기 산정용 지표
+        self._leases = 0
+        self._lease_wait_total = 0.0
+        self._lease_wait_max = 0.0
+        self._lease_timeouts = 0
+        self._recycled = 0
+        self._crashes = 0
+
+    def _start_driver(self):
+        driver = self._factory()
+        with self._cond:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.lease_timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._created < self.size:
+                        self._created += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._lease_timeouts += 1
+                        raise TimeoutError(f"브라우저 대여 대기 시간 초과 ({self.lease_timeout}s)")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+        # 새 드라이버 기동은 락 밖에서 (Chrome 기동이 수 초 걸림)
+        try:
+            return self._start_driver()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def _forget(self, driver):
+        """풀에서 뺀다 (self._cond 를 쥐고 호출, 종료는 _quit 으로 락 밖에서)"""
+        self._pages.pop(id(driver), None)
+        self._created -= 1
+        self._cond.notify()
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"브라우저 종료 실패: {e}")
+
+    def _reset(self, driver):
+        """다음 요청에 상태가 새지 않도록 탭/쿠키/스토리지 정리"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank 등 스토리지 접근이 막힌 페이지
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _release(self, driver, crashed):
+        # 종료 여부 판단과 _created 감소를 한 번에 해야 동시에 반납한 브라우저가 둘 다 남는 몫으로
+        # 판단돼 size 아래로 줄어들지 않는다
+        with self._cond:
+            pages = self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            if crashed:
+                self._crashes += 1
+            elif pages >= self.max_pages:
+                self._recycled += 1
+            keep = not crashed and pages < self.max_pages and self._created <= self.size
+            if not keep:  # 크래시, 페이지 수 초과, 또는 resize 로 줄어든 만큼 반납 시 종료
+                self._forget(driver)
+        if not keep:
+            self._quit(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            logger.warning(f"브라우저 초기화 실패, 교체합니다: {e}")
+            with self._cond:
+                self._crashes += 1
+                self._forget(driver)
+            self._quit(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        start = time.monotonic()
+        driver = self._acquire()
+        wait = time.monotonic() - start
+        with self._cond:
+            self._leases += 1
+            self._lease_wait_total += wait
+            self._lease_wait_max = max(self._lease_wait_max, wait)
+
+        crashed = False
+        try:
+            yield driver
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            crashed = True
+            raise
+        finally:
+            self._release(driver, crashed)
+
+    @property
+    def saturated(self):
+        """모든 브라우저가 사용 중이거나 대여를 기다리는 요청이 있는지"""
+        with self._cond:
+            return self._waiting > 0 or (self._created >= self.size and not self._idle)
+
+    def resize(self, size):
+        """풀 크기 변경. 줄이면 남는 대기 브라우저는 바로, 사용 중인 것은 반납할 때 종료"""
+        with self._cond:
+            self.size = size
+            surplus = [self._idle.pop(0) for _ in range(min(max(self._created - size, 0), len(self._idle)))]
+            for driver in surplus:
+                self._forget(driver)
+            self._cond.notify_all()
+        for driver in surplus:
+            self._quit(driver)
+
+    def warm(self, count=None):
+        """서버 기동 시 브라우저를 미리 띄워 첫 요청의 Chrome 기동 지연을 없앤다"""
+        started = []
+        for _ in range(min(count or self.size, self.size)):
+            try:
+                started.append(self._acquire())
+            except Exception as e:
+                logger.warning(f"브라우저 예열 실패: {e}")
+                break
+        with self._cond:
+            self._idle.extend(started)
+            self._cond.notify_all()
+        return len(started)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "waiting": self._waiting,
+                "leases": self._leases,
+                "lease_wait_avg_ms": round(self._lease_wait_total / self._leases * 1000, 2) if self._leases else 0.0,
+                "lease_wait_max_ms": round(self._lease_wait_max * 1000, 2),
+                "lease_timeouts": self._lease_timeouts,
+                "recycled": self._recycled,
+                "crashes": self._crashes,
+            }
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            for driver in idle:
+                self._forget(driver)
+        for driver in idle:
+            self._quit(driver)
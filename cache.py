@@ -0,0 +1,181 @@
+"""기사 캐시: 프로세스 내 LRU → Redis(비동기 클라이언트) 2단 구성
+
+Redis 값 형식은 1바이트 코덱 표시 + 압축한 JSON(UTF-8, 공백 없음).
+한글을 \\uXXXX 로 이스케이프하지 않는 것만으로도 본문 크기가 절반 가까이 줄고,
+zstandard 패키지가 있으면 zstd, 없으면 zlib 으로 압축한다.
+"""
+import asyncio
+import importlib.util
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+
+import redis
+
+from redis_backed import RedisBacked
+
+logger = logging.getLogger(__name__)
+
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+
+if importlib.util.find_spec('zstandard') is not None:
+    import zstandard
+else:
+    zstandard = None
+
+
+class CachedFailure(Exception):
+    """네거티브 캐시에 저장된 최근 실패"""
+
+
+def dumps_entry(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress(raw):
+    if zstandard is not None:
+        return CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(raw)
+    return CODEC_ZLIB + zlib.compress(raw, 6)
+
+
+def decompress(data):
+    """Redis 값 → JSON 바이트. 압축 없이 JSON 문자열로 저장하던 이전 형식도 읽는다"""
+    codec, payload = data[:1], data[1:]
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd 로 저장된 항목이지만 zstandard 패키지가 없습니다")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return data
+
+
+class LocalLRU:
+    """항목 수·바이트·TTL 로 제한되는 프로세스 내 LRU (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl=60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._items = OrderedDict()  # key -> (만료 시각, 크기, 값)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                self.discard(key)
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[2]
+
+    def put(self, key, value, size, ttl=None):
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        self.discard(key)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._items[key] = (time.monotonic() + ttl, size, value)
+        self.bytes += size
+        while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted, _) = self._items.popitem(last=False)
+            self.bytes -= evicted
+
+    def discard(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.bytes -= item[1]
+
+    def stats(self):
+        return {'entries': len(self._items), 'bytes': self.bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+class ArticleCache(RedisBacked):
+    """로컬 LRU 에 없으면 Redis 에서 읽고, 쓰기는 짧은 간격으로 모아 파이프라인 한 번에 보낸다"""
+
+    redis_label = '캐시'
+    local_fallback = '로컬 캐시만 사용'
+
+    def __init__(self, redis_client=None, local=None, error_backoff=30, flush_delay=0.002):
+        super().__init__(redis_client, error_backoff)  # redis.asyncio.Redis (decode_responses=False) 또는 None
+        self.local = local or LocalLRU()
+        self.flush_delay = flush_delay
+        self._pending = {}
+        self._flush_task = None
+
+    async def get(self, key):
+        entries = await self.get_many([key])
+        return entries.get(key)
+
+    async def get_many(self, keys):
+        """{key: 항목}. 로컬에 없는 키만 MGET 한 번으로 조회"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            entry = self.local.get(key)
+            if entry is not None:
+                found[key] = entry
+            else:
+                missing.append(key)
+        if not missing or not self._redis_available():
+            return found
+
+        try:
+            values = await self.redis.mget(missing)
+        except redis.RedisError as e:
+            self._redis_failed('조회', e)
+            return found
+
+        corrupted = []
+        for key, data in zip(missing, values):
+            if data is None:
+                continue
+            try:
+                raw = decompress(data)
+                entry = json.loads(raw)
+            except (ValueError, zlib.error) as e:
+                logger.warning(f"손상된 캐시 항목 삭제 {key}: {e}")
+                corrupted.append(key)
+                continue
+            self.local.put(key, entry, len(raw))
+            found[key] = entry
+        if corrupted:
+            try:
+                await self.redis.delete(*corrupted)
+            except redis.RedisError as e:
+                self._redis_failed('삭제', e)
+        return found
+
+    async def put(self, key, entry, ttl):
+        raw = dumps_entry(entry)
+        self.local.put(key, entry, len(raw), ttl.total_seconds())
+        if not self._redis_available():
+            return
+        self._pending[key] = (compress(raw), ttl)
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush())
+        # 호출자가 취소돼도 다른 항목과 함께 묶인 쓰기는 끝까지 보낸다
+        await asyncio.shield(self._flush_task)
+
+    async def _flush(self):
+        await asyncio.sleep(self.flush_delay)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, (data, ttl) in pending.items():
+                    pipe.set(key, data, ex=ttl)
+                await pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed('저장', e)
+
+    async def aclose(self):
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.redis.aclose()
@@ -0,0 +1,186 @@
+"""여러 스크래퍼 컨테이너가 도메인을 나눠 맡는 클러스터 모드
+
+    CLUSTER_MODE=1 CLUSTER_NODE_ID=web-1 CLUSTER_ADVERTISE=http://10.0.0.5:8099 uvicorn main:app
+
+노드는 공유 Redis 의 cluster:nodes 해시에 주소와 heartbeat 시각을 남기고, 살아 있는 노드로
+일관 해시 링(노드당 가상 노드 vnodes 개)을 만든다. 캐시에 없는 URL 은 도메인(www. 제외)의
+담당 노드에 맡기므로 인코딩 학습, 호스트별 속도 제한, keep-alive 연결, 브라우저 같은 도메인 상태가
+한 노드에만 쌓이고 같은 언론사에 여러 노드가 따로 요청을 보내지 않는다.
+노드가 들어오거나 heartbeat 가 node_ttl 을 넘겨 빠지면 링을 다시 만들고, 옮겨가는 도메인은 대략 1/N 이다.
+작업 큐 워커처럼 HTTP 요청을 받지 않는 프로세스는 member=False 로 라우팅만 한다.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+NODES_KEY = "cluster:nodes"
+
+
+def cluster_key(url):
+    """담당 노드를 정하는 키 (www. 를 뗀 netloc)"""
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    def __init__(self, nodes=(), vnodes=64):
+        self.nodes = sorted(nodes)
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key):
+        if not self._hashes:
+            return None
+        return self._owners[bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)]
+
+
+class ForwardedError(Exception):
+    """담당 노드에서 스크래핑이 실패한 경우 (kind: error / cached / deadline)"""
+
+    def __init__(self, message, kind='error', stage=None):
+        super().__init__(message)
+        self.kind = kind
+        self.stage = stage
+
+
+class ClusterNode:
+    def __init__(self, redis_client, node_id, address=None, member=True, heartbeat_interval=2.0, node_ttl=6.0,
+                 vnodes=64, forward_grace=5.0):
+        self.redis = redis_client
+        self.node_id = node_id
+        self.address = address
+        self.member = member
+        self.heartbeat_interval = heartbeat_interval
+        self.node_ttl = node_ttl
+        self.vnodes = vnodes
+        self.forward_grace = forward_grace    # 담당 노드의 시간 예산 외에 더 기다릴 시간
+        self.members = {}                     # 노드 ID -> 주소
+        self.ring = HashRing(vnodes=vnodes)
+        self.rebalances = 0
+        self.forwarded = 0
+        self._client = None
+        self._task = None
+
+    @classmethod
+    def from_env(cls, redis_client, member=True):
+        """CLUSTER_MODE=1 이 아니면 None"""
+        if os.getenv('CLUSTER_MODE') != '1':
+            return None
+        hostname = socket.gethostname()
+        address = os.getenv('CLUSTER_ADVERTISE')
+        if member and not address:
+            address = f"http://{socket.gethostbyname(hostname)}:{os.getenv('CLUSTER_PORT', '8099')}"
+        return cls(
+            redis_client,
+            node_id=os.getenv('CLUSTER_NODE_ID') or f"{hostname}-{os.getpid()}",
+            address=address,
+            member=member,
+            heartbeat_interval=float(os.getenv('CLUSTER_HEARTBEAT', 2.0)),
+            node_ttl=float(os.getenv('CLUSTER_NODE_TTL', 6.0)),
+        )
+
+    # 멤버십
+
+    def heartbeat(self):
+        """자신을 등록(갱신)하고 살아 있는 노드로 링을 다시 만든다. 멤버가 바뀌었으면 True"""
+        now = time.time()
+        if self.member:
+            self.redis.hset(NODES_KEY, self.node_id, json.dumps({'address': self.address, 'heartbeat': now}))
+        members, expired = {}, []
+        for node_id, value in self.redis.hgetall(NODES_KEY).items():
+            info = json.loads(value)
+            if now - info['heartbeat'] <= self.node_ttl:
+                members[node_id] = info['address']
+            else:
+                expired.append(node_id)
+        if expired:
+            self.redis.hdel(NODES_KEY, *expired)  # 죽은 노드는 아무 노드나 정리 (다시 살아나면 재등록)
+        return self._update(members)
+
+    def _update(self, members):
+        if set(members) == set(self.members):
+            self.members = members
+            return False
+        joined, left = set(members) - set(self.members), set(self.members) - set(members)
+        self.members = members
+        self.ring = HashRing(members, self.vnodes)
+        self.rebalances += 1
+        logger.info(f"클러스터 멤버 변경 (참여 {sorted(joined)}, 이탈 {sorted(left)}): 노드 {len(members)}개")
+        return True
+
+    def leave(self):
+        if self.member:
+            self.redis.hdel(NODES_KEY, self.node_id)
+
+    async def start(self, run_blocking):
+        await run_blocking(self.heartbeat)
+        self._task = asyncio.ensure_future(self._run(run_blocking))
+
+    async def _run(self, run_blocking):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await run_blocking(self.heartbeat)
+            except Exception as e:
+                # Redis 가 잠시 안 되면 마지막으로 본 링을 그대로 쓴다
+                logger.error(f"클러스터 heartbeat 실패: {e}")
+
+    async def stop(self, run_blocking):
+        if self._task is not None:
+            self._task.cancel()
+        try:
+            await run_blocking(self.leave)
+        except Exception as e:
+            logger.error(f"클러스터 탈퇴 실패: {e}")
+        if self._client is not None:
+            await self._client.aclose()
+
+    # 라우팅
+
+    def owner(self, url):
+        """담당 노드가 다른 노드면 (노드 ID, 주소), 이 노드가 담당이거나 링이 비었으면 None"""
+        node_id = self.ring.owner(cluster_key(url))
+        address = self.members.get(node_id)  # 링을 바꾸는 중이면 없을 수 있음
+        if node_id == self.node_id or address is None:
+            return None
+        return node_id, address
+
+    async def forward(self, address, url, use_cache, budget):
+        """담당 노드의 /cluster/scrape 호출. 담당 노드에서 실패했으면 ForwardedError"""
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        response = await self._client.post(
+            f"{address}/cluster/scrape",
+            json={'url': url, 'use_cache': use_cache, 'budget': budget},
+            timeout=budget + self.forward_grace,
+        )
+        response.raise_for_status()
+        self.forwarded += 1
+        payload = response.json()
+        if 'error' in payload:
+            raise ForwardedError(payload['error'], payload.get('kind', 'error'), payload.get('stage'))
+        return payload['result'], payload['cache_status']
+
+    def stats(self):
+        return {
+            'node_id': self.node_id,
+            'member': self.member,
+            'members': dict(sorted(self.members.items())),
+            'rebalances': self.rebalances,
+            'forwarded': self.forwarded,
+        }
@@ -0,0 +1,55 @@
+"""기사 한 건의 전체 시간 예산과 지터 백오프
+
+    deadline = Deadline(30, start=False)     # 페치 + 렌더링 + 추출 전체 30초
+    deadline.start()                         # 호스트 슬롯을 얻어 실제로 요청을 보낼 때부터 잰다
+    deadline.timeout(20, fraction=0.6)       # 예산의 앞 60% 안에서 설정값과 남은 시간 중 작은 값
+
+배치에서는 예의상 호스트별 대기열에서 기다리는 시간까지 예산에 넣지 않도록 start=False 로
+만들어 두고 첫 요청 때 시작한다. 시작 전에는 예산 전체가 남은 것으로 본다.
+time.monotonic 기준 시각만 들고 있으므로 스레드/프로세스 풀에 넘겨도 된다.
+"""
+import random
+import time
+
+
+class DeadlineExceeded(Exception):
+    """시간 예산을 다 쓴 경우 (stage: 초과한 단계)"""
+
+    def __init__(self, stage):
+        super().__init__(f"{stage} 단계에서 시간 예산 초과")
+        self.stage = stage
+
+
+class Deadline:
+    def __init__(self, budget, start=True):
+        self.budget = budget
+        self.started_at = time.monotonic() if start else None
+
+    def start(self):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+    def remaining(self, fraction=1.0):
+        """예산의 앞 fraction 구간이 끝날 때까지 남은 초"""
+        now = time.monotonic()
+        started_at = now if self.started_at is None else self.started_at
+        return max(started_at + self.budget * fraction - now, 0.0)
+
+    def expired(self, fraction=1.0):
+        return self.remaining(fraction) <= 0
+
+    def timeout(self, cap=None, fraction=1.0):
+        remaining = self.remaining(fraction)
+        return remaining if cap is None else min(cap, remaining)
+
+    def check(self, stage, fraction=1.0):
+        if self.expired(fraction):
+            raise DeadlineExceeded(stage)
+
+    def __repr__(self):
+        return f"Deadline(budget={self.budget}, remaining={self.remaining():.2f}s)"
+
+
+def jittered_backoff(attempt, base=0.5, cap=10.0):
+    """full jitter: 0 ~ min(cap, base * 2^attempt) 사이 임의 대기 (재시도가 한꺼번에 몰리지 않도록)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
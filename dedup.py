@@ -0,0 +1,182 @@
+"""통신사(연합뉴스·뉴시스) 전재 기사 같은 거의 같은 본문을 찾는 MinHash + LSH 인덱스
+
+    dedup = Deduplicator(redis_client)
+    duplicate_of = dedup.check(url, content)   # 먼저 본 기사 URL 또는 None
+
+한국어는 띄어쓰기가 들쭉날쭉해 공백·문장부호를 뺀 글자 5-gram 을 shingle 로 쓴다.
+서명은 해시를 shingle 당 한 번만 계산하는 one-permutation MinHash (빈 칸은 이웃 칸으로 채움)
+이고, 밴드별 해시 버킷으로 후보를 찾은 뒤 서명 일치율로 확인한다.
+인덱스는 프로세스 안에 두고, Redis 가 있으면 워커/컨테이너 간에 공유한다.
+"""
+import hashlib
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+
+from redis_backed import RedisBacked
+
+_NON_WORD = re.compile(r'[\W_]+')
+_VALUE_BITS = 25              # crc32 의 하위 7비트는 칸 번호, 나머지가 값
+_EMPTY = 0xFFFFFFFF
+
+
+def shingles(text, size=5):
+    text = _NON_WORD.sub('', text or '').lower()
+    return {text[i:i + size] for i in range(max(len(text) - size + 1, 0))}
+
+
+def signature(text, num_perm=128, size=5):
+    """one-permutation MinHash 서명 (array('I'), 길이 num_perm)"""
+    sig = array('I', [_EMPTY]) * num_perm
+    for shingle in shingles(text, size):
+        h = zlib.crc32(shingle.encode('utf-8'))
+        slot, value = h % num_perm, h // num_perm
+        if value < sig[slot]:
+            sig[slot] = value
+    if _EMPTY not in sig or sig.count(_EMPTY) == num_perm:
+        return sig
+    # 빈 칸은 오른쪽으로 가장 가까운 원래 칸의 값 + 거리 오프셋으로 채운다 (densification)
+    original = sig[:]
+    for i in range(num_perm):
+        distance = 0
+        while original[(i + distance) % num_perm] == _EMPTY:
+            distance += 1
+        if distance:
+            sig[i] = (original[(i + distance) % num_perm] + (distance << _VALUE_BITS)) & 0xFFFFFFFF
+    return sig
+
+
+def similarity(a, b):
+    """서명 일치율 = 추정 자카드 유사도"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class Deduplicator(RedisBacked):
+    """밴드 수·행 수로 임계값 근처부터 후보가 잡히도록 (16x8 이면 약 0.7 이상)"""
+
+    redis_label = '중복 인덱스'
+    local_fallback = '로컬 인덱스만 사용'
+
+    def __init__(self, redis_client=None, threshold=0.8, num_perm=128, bands=16, min_chars=300,
+                 capacity=200_000, ttl=3 * 24 * 3600, error_backoff=30):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        super().__init__(redis_client, error_backoff)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_chars = min_chars        # 이보다 짧은 본문은 지문을 만들지 않음
+        self.capacity = capacity
+        self.ttl = ttl
+        self._signatures = OrderedDict()  # URL -> 서명 (오래된 것부터 제거)
+        self._buckets = [{} for _ in range(bands)]  # 밴드 해시 -> 처음 본 URL
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.duplicates = 0
+
+    def _band_keys(self, sig):
+        return [
+            hashlib.blake2b(sig[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def _best(self, url, sig, candidates):
+        best, best_score = None, self.threshold
+        for candidate, candidate_sig in candidates:
+            if candidate == url or candidate_sig is None:
+                continue
+            score = similarity(sig, candidate_sig)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    # 프로세스 내 인덱스
+
+    def _local_match(self, url, sig, keys):
+        with self._lock:
+            urls = {self._buckets[band].get(key) for band, key in enumerate(keys)} - {None}
+            candidates = [(candidate, self._signatures.get(candidate)) for candidate in urls]
+        return self._best(url, sig, candidates)
+
+    def _local_add(self, url, sig, keys):
+        with self._lock:
+            if url in self._signatures:
+                self._signatures.move_to_end(url)
+                return
+            self._signatures[url] = sig
+            for band, key in enumerate(keys):
+                self._buckets[band].setdefault(key, url)
+            while len(self._signatures) > self.capacity:
+                old, old_sig = self._signatures.popitem(last=False)
+                for band, key in enumerate(self._band_keys(old_sig)):
+                    if self._buckets[band].get(key) == old:
+                        del self._buckets[band][key]
+
+    # Redis 공유 인덱스
+
+    @staticmethod
+    def _band_key(band, key):
+        return f"dedup:band:{band}:{key}"
+
+    @staticmethod
+    def _sig_key(url):
+        return f"dedup:sig:{url}"
+
+    def _redis_match(self, url, sig, keys):
+        """(먼저 본 URL, 그 서명) 또는 (None, None). 일치하는 것이 없으면 이 기사를 등록한다"""
+        band_keys = [self._band_key(band, key) for band, key in enumerate(keys)]
+        urls = {value for value in self.redis.mget(band_keys) if value} - {url}
+        if urls:
+            urls = sorted(urls)
+            signatures = [bytes.fromhex(value) if value else None
+                          for value in self.redis.mget([self._sig_key(candidate) for candidate in urls])]
+            candidates = {candidate: array('I', raw) for candidate, raw in zip(urls, signatures) if raw}
+            best = self._best(url, sig, candidates.items())
+            if best:
+                return best, candidates[best]
+        pipe = self.redis.pipeline()
+        pipe.set(self._sig_key(url), sig.tobytes().hex(), ex=self.ttl)
+        for key in band_keys:
+            pipe.set(key, url, ex=self.ttl, nx=True)
+        pipe.execute()
+        return None, None
+
+    def fingerprint(self, content):
+        """check_signature 에 넘길 서명 (본문이 min_chars 보다 짧으면 None)"""
+        if not content or len(content) < self.min_chars:
+            return None
+        return signature(content, self.num_perm)
+
+    def check(self, url, content):
+        """먼저 색인된 거의 같은 기사의 URL (없으면 None). 처음 보는 본문이면 색인에 추가"""
+        sig = self.fingerprint(content)
+        return None if sig is None else self.check_signature(url, sig)
+
+    def check_signature(self, url, sig):
+        """서명을 다른 곳(추출 프로세스 풀 워커)에서 만든 경우의 check"""
+        keys = self._band_keys(sig)
+        self.checked += 1
+
+        duplicate_of = self._local_match(url, sig, keys)
+        if duplicate_of is None and self._redis_available():
+            try:
+                duplicate_of, original_sig = self._redis_match(url, sig, keys)
+            except Exception as e:
+                self._redis_failed('조회', e)
+            else:
+                if duplicate_of:
+                    # 다음 전재본은 Redis 왕복 없이 로컬에서 찾도록
+                    self._local_add(duplicate_of, original_sig, self._band_keys(original_sig))
+        if duplicate_of:
+            self.duplicates += 1
+            return duplicate_of
+        self._local_add(url, sig, keys)
+        return None
+
+    def stats(self):
+        with self._lock:
+            indexed = len(self._signatures)
+        return {'indexed': indexed, 'checked': self.checked, 'duplicates': self.duplicates}
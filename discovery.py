@@ -0,0 +1,349 @@
+"""RSS/Atom·뉴스 사이트맵을 주기적으로 확인해 새 기사 URL만 작업 큐로 보내는 탐색기
+
+    python discovery.py run      # 계속 실행 (피드별 적응형 주기)
+    python discovery.py once     # 모든 피드를 한 번씩 확인하고 종료
+
+피드 목록은 DEFAULT_FEEDS 이고, DISCOVERY_FEEDS 환경변수로 같은 형식의 JSON 파일을 지정할 수 있다.
+키 구성:
+    discovery:seen          이미 본 URL Bloom filter (Redis 비트맵)
+    discovery:feed:<md5>    피드별 ETag/Last-Modified, 게시 속도 추정치, 다음 확인 시각
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import signal
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# 도메인 -> 피드/사이트맵 URL (RSS, Atom, urlset, sitemapindex 자동 판별)
+DEFAULT_FEEDS = {
+    'chosun.com': ['https://www.chosun.com/arc/outboundfeeds/rss/?outputType=xml'],
+    'joongang.co.kr': ['https://www.joongang.co.kr/sitemap/news'],
+    'donga.com': ['https://rss.donga.com/total.xml'],
+    'yna.co.kr': ['https://www.yna.co.kr/rss/news.xml'],
+    'hani.co.kr': ['https://www.hani.co.kr/rss/'],
+    'khan.co.kr': ['https://www.khan.co.kr/rss/rssdata/total_news.xml'],
+    'newsis.com': ['https://www.newsis.com/RSS/sokbo.xml'],
+    'mk.co.kr': ['https://www.mk.co.kr/rss/30000001/'],
+    'hankyung.com': ['https://www.hankyung.com/feed/all-news'],
+}
+
+SEEN_KEY = "discovery:seen"
+FEED_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True, huge_tree=False)
+
+
+def feed_key(feed_url):
+    return f"discovery:feed:{hashlib.md5(feed_url.encode()).hexdigest()}"
+
+
+def load_feeds():
+    path = os.getenv('DISCOVERY_FEEDS')
+    if not path:
+        return DEFAULT_FEEDS
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)  # RSS (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))  # Atom / 사이트맵 (ISO 8601)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local(element):
+    return etree.QName(element).localname if isinstance(element.tag, str) else ''
+
+
+def _child_text(element, *names):
+    for child in element:
+        if _local(child) in names and child.text:
+            return child.text.strip()
+    return None
+
+
+def parse_feed(content):
+    """(항목 목록, 하위 사이트맵 목록). 항목은 (URL, 게시 시각 또는 None)"""
+    root = etree.fromstring(content, parser=FEED_PARSER)
+    if root is None:
+        return [], []
+    kind = _local(root)
+    items, children = [], []
+
+    if kind == 'sitemapindex':
+        for sitemap in root:
+            loc = _child_text(sitemap, 'loc')
+            if loc:
+                children.append((loc, _parse_date(_child_text(sitemap, 'lastmod'))))
+        return items, children
+
+    for element in root.iter():
+        name = _local(element)
+        if name == 'item':  # RSS
+            link = _child_text(element, 'link') or _child_text(element, 'guid')
+            published = _child_text(element, 'pubDate', 'date')
+        elif name == 'entry':  # Atom
+            link = None
+            for child in element:
+                if _local(child) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                    break
+            published = _child_text(element, 'published', 'updated')
+        elif name == 'url' and kind == 'urlset':  # 사이트맵 (Google News 확장 포함)
+            link = _child_text(element, 'loc')
+            published = _child_text(element, 'lastmod')
+            for child in element:
+                if _local(child) == 'news':
+                    published = _child_text(child, 'publication_date') or published
+        else:
+            continue
+        if link and link.startswith(('http://', 'https://')):
+            items.append((link.strip(), _parse_date(published)))
+    return items, children
+
+
+class RedisBloomFilter:
+    """Redis 비트맵 위의 Bloom filter (capacity 1천만, 오탐 0.1% 기준 약 18MB)"""
+
+    def __init__(self, redis_client, key=SEEN_KEY, capacity=10_000_000, error_rate=0.001):
+        self.redis = redis_client
+        self.key = key
+        self.size = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+
+    def _positions(self, item):
+        # 이중 해싱: 128비트 다이제스트 하나로 k 개 위치 생성
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def unseen(self, items):
+        """처음 보는 항목만 (순서 유지, 중복 제거). 기록은 add 로 따로 한다"""
+        items = list(dict.fromkeys(items))
+        if not items:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for item in items:
+            for position in self._positions(item):
+                pipe.getbit(self.key, position)
+        bits = pipe.execute()
+        return [item for index, item in enumerate(items)
+                if not all(bits[index * self.hashes:(index + 1) * self.hashes])]
+
+    def add(self, items):
+        if not items:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for item in items:
+            for position in self._positions(item):
+                pipe.setbit(self.key, position, 1)
+        pipe.execute()
+
+    def add_new(self, items):
+        """처음 보는 항목만 돌려주고 모두 기록한다 (동시에 같은 URL을 넣으면 드물게 둘 다 새 항목)"""
+        new_items = self.unseen(items)
+        self.add(new_items)
+        return new_items
+
+
+class FeedState:
+    """피드별 조건부 GET 검증자와 게시 속도(초당 새 기사 수) 추정치"""
+
+    def __init__(self, url, domain, data=None):
+        data = data or {}
+        self.url = url
+        self.domain = domain
+        self.etag = data.get('etag') or None
+        self.last_modified = data.get('last_modified') or None
+        self.rate = float(data['rate']) if data.get('rate') else None
+        self.interval = float(data.get('interval', 0)) or None
+        self.next_poll = float(data.get('next_poll', 0))
+        self.last_poll = float(data.get('last_poll', 0))
+
+    def to_redis(self):
+        return {
+            'etag': self.etag or '',
+            'last_modified': self.last_modified or '',
+            'rate': '' if self.rate is None else self.rate,
+            'interval': self.interval or 0,
+            'next_poll': self.next_poll,
+            'last_poll': self.last_poll,
+        }
+
+
+class Discovery:
+    def __init__(self, scraper, job_queue, feeds=None, min_interval=60, max_interval=3600,
+                 target_per_poll=5, smoothing=0.3, concurrency=8, max_child_sitemaps=3,
+                 seen_capacity=10_000_000):
+        self.scraper = scraper          # fetch_politely(스케줄러/조건부 GET), URL 정규화, Redis 공유
+        self.job_queue = job_queue
+        self.redis = scraper.redis_client
+        self.seen = RedisBloomFilter(self.redis, capacity=seen_capacity)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_per_poll = target_per_poll  # 한 번 확인할 때 새 기사가 이 정도 나오도록 주기 조절
+        self.smoothing = smoothing
+        self.concurrency = concurrency
+        self.max_child_sitemaps = max_child_sitemaps
+        feeds = load_feeds() if feeds is None else feeds
+        self.feeds = [(url, domain) for domain, urls in feeds.items() for url in urls]
+        self.states = {}
+        self._stop = asyncio.Event()
+
+    async def _call(self, func, *args):
+        return await self.scraper._run_blocking(func, *args)
+
+    async def _state(self, url, domain):
+        state = self.states.get(url)
+        if state is None:
+            data = await self._call(self.redis.hgetall, feed_key(url))
+            state = self.states[url] = FeedState(url, domain, data)
+        return state
+
+    def next_interval(self, state, new_count, elapsed, published):
+        """새 기사 수/경과 시간으로 게시 속도를 지수 평활하고, target_per_poll 개가 쌓일 시간으로 주기 결정"""
+        if state.rate is None and len(published) >= 2:
+            # 첫 확인: 피드 항목의 게시 시각 분포로 초기 속도 추정
+            span = max(published) - min(published)
+            observed = (len(published) - 1) / span if span > 0 else None
+        else:
+            observed = new_count / elapsed if elapsed > 0 else None
+        if observed is not None:
+            state.rate = observed if state.rate is None else (
+                self.smoothing * observed + (1 - self.smoothing) * state.rate
+            )
+        if not state.rate:
+            interval = (state.interval or self.min_interval) * 2
+        else:
+            interval = self.target_per_poll / state.rate
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    async def _fetch(self, url, state=None):
+        headers = {}
+        if state is not None:
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+        return await self.scraper.fetch_politely(url, headers=headers or None)
+
+    async def poll(self, url, domain):
+        """피드 하나를 확인하고 작업 큐에 넣은 새 URL 목록을 돌려준다"""
+        state = await self._state(url, domain)
+        now = time.time()
+        new_urls, published = [], []
+        try:
+            response = await self._fetch(url, state)
+            if response.status_code == 200:
+                items, children = parse_feed(response.content)
+                # 사이트맵 인덱스는 최근에 바뀐 하위 사이트맵 몇 개만 확인
+                children.sort(key=lambda child: child[1] or 0, reverse=True)
+                for child_url, _ in children[:self.max_child_sitemaps]:
+                    child = await self._fetch(child_url)
+                    if child.status_code == 200:
+                        items.extend(parse_feed(child.content)[0])
+                published = [ts for _, ts in items if ts]
+                candidates = [self.scraper._normalize_url(link) for link, _ in items]
+                unseen = await self._call(self.seen.unseen, candidates)
+                if unseen:
+                    job_id = await self._call(self.job_queue.submit, unseen)
+                    new_urls = unseen
+                    # 작업 큐에 들어간 뒤에만 본 것으로 기록 (제출이 실패하면 다음 확인 때 다시 새 기사로 나온다)
+                    await self._call(self.seen.add, unseen)
+                # 검증자도 제출 뒤에 갱신 (먼저 바꾸면 다음 확인이 304 를 받아 실패한 URL 을 다시 보지 못한다)
+                state.etag = response.headers.get('etag')
+                state.last_modified = response.headers.get('last-modified')
+            elif response.status_code != 304:
+                logger.warning(f"피드 응답 {response.status_code}: {url}")
+        except Exception as e:
+            logger.error(f"피드 확인 실패 {url}: {e}")
+
+        elapsed = now - state.last_poll if state.last_poll else 0
+        state.interval = self.next_interval(state, len(new_urls), elapsed, published)
+        state.last_poll = now
+        state.next_poll = now + state.interval
+        await self._call(functools.partial(self.redis.hset, feed_key(url), mapping=state.to_redis()))
+
+        if new_urls:
+            logger.info(f"새 기사 {len(new_urls)}건 → 작업 {job_id} ({domain}, 다음 확인 {state.interval:.0f}s 후)")
+        return new_urls
+
+    async def poll_due(self):
+        """확인 시각이 된 피드를 동시에 최대 concurrency 개씩 확인. 다음 확인까지 남은 초를 돌려준다"""
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def guarded(url, domain):
+            async with slots:
+                return await self.poll(url, domain)
+
+        due = []
+        for url, domain in self.feeds:
+            state = await self._state(url, domain)
+            if state.next_poll <= time.time():
+                due.append(guarded(url, domain))
+        results = await asyncio.gather(*due)
+        soonest = min(state.next_poll for state in self.states.values()) if self.states else time.time()
+        return sum(len(urls) for urls in results), max(soonest - time.time(), 0)
+
+    async def run(self, max_sleep=30):
+        logger.info(f"기사 탐색 시작: 피드 {len(self.feeds)}개")
+        while not self._stop.is_set():
+            _, wait = await self.poll_due()
+            try:
+                await asyncio.wait_for(self._stop.wait(), min(wait, max_sleep))
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS/사이트맵 기사 탐색기")
+    parser.add_argument("command", choices=["run", "once"])
+    args = parser.parse_args()
+
+    from jobs import JobQueue
+    from article_scraper import ArticleScraper
+
+    async def run():
+        # asyncio 객체(세마포어/이벤트)가 이 이벤트 루프에 묶이도록 루프 안에서 생성 (Python 3.9)
+        scraper = ArticleScraper(headless=True)
+        discovery = Discovery(scraper, JobQueue(scraper.redis_client))
+        if args.command == "once":
+            for state in [await discovery._state(url, domain) for url, domain in discovery.feeds]:
+                state.next_poll = 0
+            found, _ = await discovery.poll_due()
+            logger.info(f"새 기사 {found}건")
+        else:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, discovery.stop)
+            await discovery.run()
+        await scraper.fetcher.aclose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""CPU 바운드 추출(파싱/trafilatura/정규식/chardet)을 프로세스 풀에서 실행해 GIL을 피한다
+
+네트워크 I/O는 비동기 계층에 그대로 두고, 받은 원본 바이트와 URL만 넘긴다.
+본문은 pickle/파이프를 거치지 않도록 공유 메모리 블록으로 전달한다.
+
+도메인별 학습 상태(확인된 인코딩, 추출 전략 통계, 렌더링 표본, 규칙 적중)와 중복 인덱스는
+부모 프로세스가 가진다. 워커는 호출마다 부모가 넘긴 도메인 상태로 판단만 하고, 그 사이 생긴
+기록과 본문의 MinHash 서명은 결과와 함께 돌려보내 부모가 적용/조회한다. 그래서 /health/* 와
+Redis 에는 부모의 값만 보이고, 다른 워커가 처리한 전재 기사도 찾으며, /rules/reload 는 다음
+호출부터 워커에도 적용된다. 워커는 Redis 를 쓰지 않는다.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from fetcher import FetchResult
+from metrics import Spans
+
+_scraper = None
+_journal = []          # 이번 호출에서 생긴 학습 기록 (부모가 같은 순서로 다시 적용)
+_fingerprints = []     # 이번 호출에서 중복 확인을 맡길 (URL, 서명)
+_rules_version = None
+
+
+class _Recorder:
+    """record 호출을 적용하지 않고 _journal 에 쌓는 대리 객체 (나머지는 원래 객체로)"""
+
+    def __init__(self, name, target):
+        self._name = name
+        self._target = target
+
+    def record(self, *args):
+        _journal.append((self._name, args))
+
+    def __getattr__(self, attr):
+        return getattr(self._target, attr)
+
+
+class _DeferredDedup:
+    """서명만 만들어 두고 중복이 아니라고 답한다 (조회/색인은 부모가 결과를 받은 뒤에)"""
+
+    def __init__(self, dedup):
+        self._dedup = dedup
+
+    def check(self, url, content):
+        sig = self._dedup.fingerprint(content)
+        if sig is not None:
+            _fingerprints.append((url, sig))
+        return None
+
+
+def _init_worker(scraper_kwargs):
+    global _scraper
+    from article_scraper import ArticleScraper
+    _scraper = ArticleScraper(**scraper_kwargs)
+    _scraper.dedup = _DeferredDedup(_scraper.dedup)
+    for name in ('strategies', 'render_classifier', 'rules'):
+        setattr(_scraper, name, _Recorder(name, getattr(_scraper, name)))
+
+
+def _apply_state(state):
+    global _rules_version
+    domain, encoding = state['encoding']
+    if encoding:
+        _scraper._learn_encoding(domain, encoding)
+    else:
+        _scraper.learned_encodings.pop(domain, None)
+    _scraper.strategies.restore(*state['strategies'])
+    _scraper.render_classifier.restore(*state['render_samples'])
+    if _rules_version is not None and state['rules_version'] != _rules_version and _scraper.rules.path:
+        _scraper.rules.reload()
+    _rules_version = state['rules_version']
+
+
+def _extract_shared(shm_name, size, url, final_url, status_code, encoding, headers, requests, retry, deadline,
+                    state):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        content = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    response = FetchResult(url=final_url, status_code=status_code, content=content,
+                           encoding=encoding, headers=headers, requests=requests)
+    _apply_state(state)
+    del _journal[:]
+    del _fingerprints[:]
+    decisions = dict(_scraper.render_classifier.decisions)
+    # 단계별 시간과 학습 기록은 부모 프로세스에서 적용하도록 함께 돌려준다
+    spans = Spans()
+    result = _scraper.extract_from_response(response, url, retry, spans, deadline)
+    encoding_domain = state['encoding'][0]
+    learned = {
+        'encoding': (encoding_domain, _scraper.learned_encodings.get(encoding_domain)),
+        'journal': list(_journal),
+        'fingerprint': _fingerprints[-1] if _fingerprints else None,
+        'render_decisions': {decision: count - decisions[decision]
+                             for decision, count in _scraper.render_classifier.decisions.items()},
+    }
+    return result, spans.durations, learned
+
+
+class ExtractionPool:
+    def __init__(self, processes=None, scraper_kwargs=None):
+        self.processes = processes or os.cpu_count() or 1
+        # 부모 프로세스에 스레드/이벤트 루프가 이미 있으므로 fork 대신 spawn
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(scraper_kwargs or {},),
+        )
+
+    async def extract(self, response, url, state, retry=3, spans=None, deadline=None):
+        """(결과, 학습 기록) 반환. state/학습 기록은 ArticleScraper 의 _worker_state/_apply_worker_learning 참고"""
+        content = response.content
+        shm = shared_memory.SharedMemory(create=True, size=max(len(content), 1))
+        try:
+            shm.buf[:len(content)] = content
+            loop = asyncio.get_running_loop()
+            result, durations, learned = await loop.run_in_executor(
+                self._executor, _extract_shared,
+                shm.name, len(content), url, response.url, response.status_code,
+                response.encoding, dict(response.headers), response.requests, retry, deadline,
+                state,
+            )
+            if spans is not None:
+                spans.merge(durations)
+            return result, learned
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
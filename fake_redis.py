@@ -0,0 +1,509 @@
+"""테스트용 인메모리 Redis 대체 (이 저장소가 쓰는 명령만 지원, decode_responses=True 동작)
+
+여러 프로세스가 하나의 Redis 를 나눠 써야 하는 테스트(클러스터 모드 등)는 RespServer 로
+FakeRedis 를 TCP(RESP2) 로 띄우고 REDIS_HOST/REDIS_PORT 를 그쪽으로 돌린다.
+"""
+import socketserver
+import threading
+import time
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        with self._redis._lock:
+            return [method(*args, **kwargs) for method, args, kwargs in calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+
+    # --- 공통 ---
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _get(self, key, default_factory=None):
+        if not self._alive(key):
+            if default_factory is None:
+                return None
+            self._data[key] = default_factory()
+        return self._data[key]
+
+    @staticmethod
+    def _str(value):
+        if isinstance(value, bytes):
+            return value.decode()
+        return value if isinstance(value, str) else str(value)
+
+    def ping(self):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def exists(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._alive(key))
+
+    def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key):
+                    removed += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if not self._alive(key):
+                return False
+            seconds = seconds.total_seconds() if hasattr(seconds, 'total_seconds') else seconds
+            self._expires[key] = time.time() + seconds
+            return True
+
+    def keys(self, pattern='*'):
+        import fnmatch
+        with self._lock:
+            return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    def scan_iter(self, match='*', count=None):
+        return iter(self.keys(match))
+
+    # --- 문자열 ---
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def mget(self, keys, *args):
+        keys = list(keys) + list(args) if not isinstance(keys, str) else [keys, *args]
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        with self._lock:
+            exists = self._alive(key)
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[key] = self._str(value)
+            self._expires.pop(key, None)
+            if ex is not None:
+                self.expire(key, ex)
+            elif px is not None:
+                self.expire(key, px / 1000)
+            return True
+
+    def setex(self, key, seconds, value):
+        return self.set(key, value, ex=seconds)
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._get(key) or 0) + amount
+            self._data[key] = str(value)
+            return value
+
+    def eval(self, script, numkeys, *keys_and_args):
+        # 이 저장소의 스크립트만 지원 (같은 동작을 파이썬으로)
+        from jobs import FINISH_JOB_SCRIPT
+        from singleflight import RELEASE_LOCK_SCRIPT
+        numkeys = int(numkeys)
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        with self._lock:
+            if script == RELEASE_LOCK_SCRIPT:
+                if self._get(keys[0]) == args[0]:
+                    return self.delete(keys[0])
+                return 0
+            if script == FINISH_JOB_SCRIPT:
+                job = self._get(keys[0])
+                if not job:
+                    return None
+                if int(job['done']) + int(job['failed']) >= int(job['total']):
+                    job['status'] = 'done'
+                elif job['status'] == 'queued':
+                    job['status'] = 'running'
+                return job['status']
+        raise NotImplementedError("FakeRedis 가 지원하지 않는 스크립트")
+
+    # --- 비트맵 ---
+
+    def setbit(self, key, offset, value):
+        with self._lock:
+            bits = self._get(key, bytearray)
+            index, shift = divmod(offset, 8)
+            if index >= len(bits):
+                bits.extend(b'\x00' * (index + 1 - len(bits)))
+            old = (bits[index] >> (7 - shift)) & 1
+            if value:
+                bits[index] |= 1 << (7 - shift)
+            else:
+                bits[index] &= ~(1 << (7 - shift)) & 0xFF
+            return old
+
+    def getbit(self, key, offset):
+        with self._lock:
+            bits = self._get(key)
+            index, shift = divmod(offset, 8)
+            if bits is None or index >= len(bits):
+                return 0
+            return (bits[index] >> (7 - shift)) & 1
+
+    # --- 해시 ---
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        with self._lock:
+            hash_ = self._get(key, dict)
+            items = dict(mapping or {})
+            if field is not None:
+                items[field] = value
+            added = sum(1 for f in items if f not in hash_)
+            hash_.update({self._str(f): self._str(v) for f, v in items.items()})
+            return added
+
+    def hget(self, key, field):
+        with self._lock:
+            return (self._get(key) or {}).get(field)
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._get(key) or {})
+
+    def hdel(self, key, *fields):
+        with self._lock:
+            hash_ = self._get(key) or {}
+            return sum(1 for field in fields if hash_.pop(field, None) is not None)
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            hash_ = self._get(key, dict)
+            hash_[field] = str(int(hash_.get(field, 0)) + amount)
+            return int(hash_[field])
+
+    def hincrbyfloat(self, key, field, amount=1.0):
+        with self._lock:
+            hash_ = self._get(key, dict)
+            hash_[field] = repr(float(hash_.get(field, 0)) + amount)
+            return float(hash_[field])
+
+    # --- 리스트 ---
+
+    def rpush(self, key, *values):
+        with self._lock:
+            items = self._get(key, list)
+            items.extend(self._str(v) for v in values)
+            self._changed.notify_all()
+            return len(items)
+
+    def lpush(self, key, *values):
+        with self._lock:
+            items = self._get(key, list)
+            for value in values:
+                items.insert(0, self._str(value))
+            self._changed.notify_all()
+            return len(items)
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._get(key) or [])
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            items = self._get(key) or []
+            end = len(items) if end == -1 else end + 1
+            return items[start:end]
+
+    def ltrim(self, key, start, end):
+        with self._lock:
+            items = self._get(key) or []
+            size = len(items)
+            start, end = (start + size if start < 0 else start), (end + size if end < 0 else end)
+            items[:] = items[max(start, 0):end + 1]
+            return True
+
+    def lrem(self, key, count, value):
+        with self._lock:
+            items = self._get(key) or []
+            removed = 0
+            for i in range(len(items) - 1, -1, -1) if count < 0 else range(len(items)):
+                if i < len(items) and items[i] == value and (count == 0 or removed < abs(count)):
+                    items.pop(i)
+                    removed += 1
+            return removed
+
+    def lmove(self, source, destination, src='LEFT', dest='RIGHT'):
+        with self._lock:
+            items = self._get(source) or []
+            if not items:
+                return None
+            value = items.pop(0 if src == 'LEFT' else -1)
+            target = self._get(destination, list)
+            if dest == 'LEFT':
+                target.insert(0, value)
+            else:
+                target.append(value)
+            self._changed.notify_all()
+            return value
+
+    def blmove(self, source, destination, timeout, src='LEFT', dest='RIGHT'):
+        deadline = time.time() + timeout
+        with self._changed:
+            while True:
+                value = self.lmove(source, destination, src, dest)
+                if value is not None:
+                    return value
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+
+    # --- 셋 / 정렬 셋 ---
+
+    def sadd(self, key, *members):
+        with self._lock:
+            set_ = self._get(key, set)
+            before = len(set_)
+            set_.update(self._str(m) for m in members)
+            return len(set_) - before
+
+    def srem(self, key, *members):
+        with self._lock:
+            set_ = self._get(key) or set()
+            before = len(set_)
+            set_.difference_update(self._str(m) for m in members)
+            return before - len(set_)
+
+    def smembers(self, key):
+        with self._lock:
+            return set(self._get(key) or set())
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            zset = self._get(key, dict)
+            added = sum(1 for member in mapping if member not in zset)
+            zset.update({self._str(m): float(score) for m, score in mapping.items()})
+            return added
+
+    def zrem(self, key, *members):
+        with self._lock:
+            zset = self._get(key) or {}
+            return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    def zrangebyscore(self, key, min, max, start=None, num=None):
+        with self._lock:
+            zset = self._get(key) or {}
+            members = sorted((score, member) for member, score in zset.items() if float(min) <= score <= float(max))
+            members = [member for _, member in members]
+            if start is not None and num is not None:
+                members = members[start:start + num]
+            return members
+
+
+# --- RESP 서버 ---
+
+def _float(value):
+    return float(value.lstrip('('))  # -inf / +inf / (배타 범위는 포함으로 취급
+
+
+def _set(redis, key, value, *options):
+    kwargs, options = {}, [option.upper() for option in options]
+    for i, option in enumerate(options):
+        if option in ('EX', 'PX'):
+            kwargs[option.lower()] = int(options[i + 1])
+        elif option in ('NX', 'XX'):
+            kwargs[option.lower()] = True
+    return redis.set(key, value, **kwargs)
+
+
+def _zrangebyscore(redis, key, min, max, *options):
+    if len(options) == 3 and options[0].upper() == 'LIMIT':
+        return redis.zrangebyscore(key, _float(min), _float(max), int(options[1]), int(options[2]))
+    return redis.zrangebyscore(key, _float(min), _float(max))
+
+
+# 명령 -> FakeRedis 호출 (인자는 모두 문자열로 들어온다)
+COMMANDS = {
+    'PING': lambda r: 'PONG',
+    'EXISTS': lambda r, *keys: r.exists(*keys),
+    'DEL': lambda r, *keys: r.delete(*keys),
+    'EXPIRE': lambda r, key, seconds: r.expire(key, int(seconds)),
+    'KEYS': lambda r, pattern: r.keys(pattern),
+    'SCAN': lambda r, cursor, *options: ['0', r.keys(dict(zip(options[::2], options[1::2])).get('MATCH', '*'))],
+    'GET': lambda r, key: r.get(key),
+    'MGET': lambda r, *keys: r.mget(keys),
+    'SET': _set,
+    'SETEX': lambda r, key, seconds, value: r.setex(key, int(seconds), value),
+    'INCR': lambda r, key: r.incr(key),
+    'INCRBY': lambda r, key, amount: r.incr(key, int(amount)),
+    'EVAL': lambda r, script, numkeys, *args: r.eval(script, int(numkeys), *args),
+    'SETBIT': lambda r, key, offset, value: r.setbit(key, int(offset), int(value)),
+    'GETBIT': lambda r, key, offset: r.getbit(key, int(offset)),
+    'HSET': lambda r, key, *pairs: r.hset(key, mapping=dict(zip(pairs[::2], pairs[1::2]))),
+    'HGET': lambda r, key, field: r.hget(key, field),
+    'HGETALL': lambda r, key: r.hgetall(key),
+    'HDEL': lambda r, key, *fields: r.hdel(key, *fields),
+    'HINCRBY': lambda r, key, field, amount: r.hincrby(key, field, int(amount)),
+    'HINCRBYFLOAT': lambda r, key, field, amount: r.hincrbyfloat(key, field, float(amount)),
+    'RPUSH': lambda r, key, *values: r.rpush(key, *values),
+    'LPUSH': lambda r, key, *values: r.lpush(key, *values),
+    'LLEN': lambda r, key: r.llen(key),
+    'LRANGE': lambda r, key, start, end: r.lrange(key, int(start), int(end)),
+    'LTRIM': lambda r, key, start, end: r.ltrim(key, int(start), int(end)),
+    'LREM': lambda r, key, count, value: r.lrem(key, int(count), value),
+    'LMOVE': lambda r, source, destination, src, dest: r.lmove(source, destination, src.upper(), dest.upper()),
+    'BLMOVE': lambda r, source, destination, src, dest, timeout:
+        r.blmove(source, destination, float(timeout), src.upper(), dest.upper()),
+    'SADD': lambda r, key, *members: r.sadd(key, *members),
+    'SREM': lambda r, key, *members: r.srem(key, *members),
+    'SMEMBERS': lambda r, key: r.smembers(key),
+    'ZADD': lambda r, key, *pairs: r.zadd(key, dict(zip(pairs[1::2], pairs[::2]))),
+    'ZREM': lambda r, key, *members: r.zrem(key, *members),
+    'ZRANGEBYSCORE': _zrangebyscore,
+}
+# 성공하면 +OK 로 답하는 명령
+STATUS_COMMANDS = {'SET', 'SETEX', 'LTRIM'}
+# 연결 설정용 명령은 무시 (redis-py 가 연결마다 CLIENT SETINFO 를 보냄)
+IGNORED_COMMANDS = {'CLIENT', 'SELECT', 'READONLY'}
+
+
+def _encode(value, status=False, resp3=False):
+    """RESP2 응답 (resp3=True 면 HELLO 3 으로 연결한 클라이언트용 RESP3 타입: null, 맵, 셋, 실수)"""
+    if isinstance(value, Exception):
+        return f"-ERR {value}\r\n".encode()
+    if value is True and status:
+        return b"+OK\r\n"
+    if isinstance(value, bool):
+        return b":1\r\n" if value else b":0\r\n"
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if value is None:
+        return b"_\r\n" if resp3 else b"$-1\r\n"
+    if isinstance(value, dict):
+        items = [item for pair in value.items() for item in pair]
+        prefix = b"%%%d\r\n" % len(value) if resp3 else b"*%d\r\n" % len(items)
+        return prefix + b"".join(_encode(item, resp3=resp3) for item in items)
+    if isinstance(value, (list, tuple, set)):
+        prefix = b"~" if resp3 and isinstance(value, set) else b"*"
+        return prefix + b"%d\r\n" % len(value) + b"".join(_encode(item, resp3=resp3) for item in value)
+    if isinstance(value, float):
+        if resp3:
+            return f",{value!r}\r\n".encode()
+        value = repr(value)
+    if isinstance(value, str):
+        value = value.encode('utf-8', 'surrogateescape')  # 압축된 캐시 값 같은 바이너리도 그대로 돌려준다
+    return b"$%d\r\n%s\r\n" % (len(value), bytes(value))
+
+
+class RespServer:
+    """FakeRedis 를 RESP2 TCP 서버로 띄운다 (여러 프로세스가 redis-py 로 접속하는 테스트용)
+
+        with RespServer() as server:
+            env = {'REDIS_HOST': '127.0.0.1', 'REDIS_PORT': str(server.port)}
+    """
+
+    def __init__(self, redis=None, host='127.0.0.1', port=0):
+        self.redis = redis or FakeRedis()
+        self.address = (host, port)
+        self._server = None
+
+    def _handler(self):
+        redis = self.redis
+
+        class Handler(socketserver.StreamRequestHandler):
+            def read_command(self):
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                if not line.startswith(b'*'):
+                    return line.decode().split()  # 인라인 명령 (redis-cli, telnet)
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(size + 2)[:-2].decode('utf-8', 'surrogateescape'))
+                return args
+
+            def execute(self, args):
+                name = args[0].upper()
+                if name in IGNORED_COMMANDS:
+                    return b"+OK\r\n"
+                if name == 'HELLO':
+                    self.resp3 = len(args) > 1 and args[1] == '3'
+                    return _encode({'server': 'fake_redis', 'proto': 3 if self.resp3 else 2}, resp3=self.resp3)
+                command = COMMANDS.get(name)
+                if command is None:
+                    return _encode(ValueError(f"unknown command '{args[0]}'"))
+                try:
+                    return _encode(command(redis, *args[1:]), name in STATUS_COMMANDS, self.resp3)
+                except Exception as e:
+                    return _encode(e)
+
+            def handle(self):
+                self.resp3 = False
+                transaction = None  # MULTI 이후 EXEC 까지 모은 명령
+                while True:
+                    args = self.read_command()
+                    if args is None:
+                        return
+                    if not args:
+                        continue
+                    name = args[0].upper()
+                    if name == 'MULTI':
+                        transaction, reply = [], b"+OK\r\n"
+                    elif name == 'DISCARD':
+                        transaction, reply = None, b"+OK\r\n"
+                    elif name == 'EXEC':
+                        with redis._lock:
+                            replies = [self.execute(queued) for queued in transaction or []]
+                        transaction, reply = None, b"*%d\r\n" % len(replies) + b"".join(replies)
+                    elif transaction is not None:
+                        transaction.append(args)
+                        reply = b"+QUEUED\r\n"
+                    else:
+                        reply = self.execute(args)
+                    self.wfile.write(reply)
+
+        return Handler
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._server = socketserver.ThreadingTCPServer(self.address, self._handler(), bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.allow_reuse_address = True
+        self._server.server_bind()
+        self._server.server_activate()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,127 @@
+"""호스트별 커넥션 풀을 사용하는 비동기 HTTP 페치 계층"""
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseTooLarge(Exception):
+    """응답 본문이 max_body_size를 넘은 경우"""
+
+
+class BadStatus(Exception):
+    """최종 응답이 2xx(재검증 중이면 304 포함)가 아닌 경우 - 추출하지 않고 실패로 다룬다"""
+
+    def __init__(self, url, status_code):
+        super().__init__(f"{url}: HTTP {status_code}")
+        self.status_code = status_code
+
+
+@dataclass
+class FetchResult:
+    """requests.Response 와 같은 이름의 속성만 가진 응답 객체"""
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str] = None  # Content-Type 헤더의 charset
+    headers: Dict[str, str] = field(default_factory=dict)
+    requests: int = 1  # 이 응답을 얻기까지 보낸 요청 수 (429/503 재시도 포함)
+
+
+class AsyncFetcher:
+    """호스트마다 keep-alive 커넥션 풀(httpx.AsyncClient)을 하나씩 유지한다"""
+
+    def __init__(
+        self,
+        headers=None,
+        max_connections_per_host=10,
+        keepalive_expiry=30.0,
+        connect_timeout=5.0,
+        read_timeout=20.0,
+        max_body_size=10 * 1024 * 1024,
+        http2=False,
+        proxy=None,
+    ):
+        self.headers = headers or {}
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_body_size = max_body_size
+        self.proxy = proxy
+        self.http2 = http2 and self._http2_available()
+        self._clients = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _http2_available():
+        if importlib.util.find_spec('h2') is None:
+            logger.warning("h2 패키지가 없어 HTTP/1.1로 동작합니다 (pip install httpx[http2])")
+            return False
+        return True
+
+    def _timeout(self, connect_timeout=None, read_timeout=None):
+        read = read_timeout or self.read_timeout
+        return httpx.Timeout(
+            connect=connect_timeout or self.connect_timeout,
+            read=read,
+            write=read,
+            pool=read,
+        )
+
+    async def _client_for(self, url):
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+        client = self._clients.get(key)
+        if client is None:
+            async with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = httpx.AsyncClient(
+                        headers=self.headers,
+                        limits=self.limits,
+                        timeout=self._timeout(),
+                        http2=self.http2,
+                        proxy=self.proxy,
+                        follow_redirects=True,
+                    )
+                    self._clients[key] = client
+        return client
+
+    async def fetch(self, url, headers=None, connect_timeout=None, read_timeout=None):
+        """본문을 스트리밍으로 읽으면서 max_body_size를 넘으면 중단한다"""
+        client = await self._client_for(url)
+        timeout = self._timeout(connect_timeout, read_timeout)
+        async with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+            declared = response.headers.get('content-length')
+            if declared and declared.isdigit() and int(declared) > self.max_body_size:
+                raise ResponseTooLarge(f"{url}: Content-Length {declared} > {self.max_body_size}")
+
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_body_size:
+                    raise ResponseTooLarge(f"{url}: 본문이 {self.max_body_size}바이트를 초과")
+                chunks.append(chunk)
+
+            return FetchResult(
+                url=str(response.url),
+                status_code=response.status_code,
+                content=b''.join(chunks),
+                encoding=response.charset_encoding,
+                headers=dict(response.headers),
+            )
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
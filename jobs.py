@@ -0,0 +1,334 @@
+"""Redis 기반 대용량 스크래핑 작업 큐
+
+    python jobs.py worker [--concurrency 20] [--worker-id ID]
+
+키 구성:
+    job:<id>             작업 상태 해시 (status, total, done, failed, ...)
+    job:<id>:results     완료된 URL 결과 (RPUSH, 페이지 단위 조회)
+    job:<id>:dead        재시도를 모두 소진한 URL (dead letter)
+    jobs:queue           대기 중인 URL 태스크
+    jobs:delayed         재시도 대기 태스크 (score = 실행 가능 시각)
+    jobs:processing:<w>  워커 w 가 처리 중인 태스크 (재시작 시 복구용)
+    jobs:workers         워커별 마지막 heartbeat 시각
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "jobs:queue"
+DELAYED_KEY = "jobs:delayed"
+WORKERS_KEY = "jobs:workers"
+
+# 진행 상태 갱신을 한 번에 (따로 읽고 쓰면 "running" 을 쓰던 워커가 다른 워커의 "done" 을 덮는다)
+FINISH_JOB_SCRIPT = """
+local job = redis.call('hmget', KEYS[1], 'status', 'total', 'done', 'failed')
+if not job[1] then
+    return false
+end
+if tonumber(job[3]) + tonumber(job[4]) >= tonumber(job[2]) then
+    redis.call('hset', KEYS[1], 'status', 'done')
+    return 'done'
+end
+if job[1] == 'queued' then
+    redis.call('hset', KEYS[1], 'status', 'running')
+    return 'running'
+end
+return job[1]
+"""
+
+
+def processing_key(worker_id):
+    return f"jobs:processing:{worker_id}"
+
+
+class JobQueue:
+    def __init__(self, redis_client, job_ttl=7 * 24 * 3600):
+        self.redis = redis_client
+        self.job_ttl = job_ttl
+
+    def submit(self, urls, use_cache=True, max_attempts=3):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        job_key = f"job:{job_id}"
+        self.redis.hset(job_key, mapping={
+            "status": "queued",
+            "total": len(urls),
+            "done": 0,
+            "failed": 0,
+            "dead": 0,
+            "use_cache": int(use_cache),
+            "max_attempts": max_attempts,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.redis.expire(job_key, self.job_ttl)
+
+        # 수만 건도 한 번에 넣을 수 있도록 파이프라인으로 나눠 적재
+        for start in range(0, len(urls), 1000):
+            pipe = self.redis.pipeline()
+            for index, url in enumerate(urls[start:start + 1000], start):
+                pipe.rpush(QUEUE_KEY, json.dumps({"job_id": job_id, "index": index, "url": url, "attempts": 0}))
+            pipe.execute()
+        return job_id
+
+    def status(self, job_id):
+        job = self.redis.hgetall(f"job:{job_id}")
+        if not job:
+            return None
+        total = int(job["total"])
+        finished = int(job["done"]) + int(job["failed"])
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "total": total,
+            "done": int(job["done"]),
+            "failed": int(job["failed"]),
+            "dead": int(job["dead"]),
+            "progress": round(finished / total, 4) if total else 1.0,
+            "created_at": float(job["created_at"]),
+            "updated_at": float(job["updated_at"]),
+        }
+
+    def results(self, job_id, offset=0, limit=100):
+        items = self.redis.lrange(f"job:{job_id}:results", offset, offset + limit - 1)
+        return [json.loads(item) for item in items]
+
+    def dead_letters(self, job_id, offset=0, limit=100):
+        items = self.redis.lrange(f"job:{job_id}:dead", offset, offset + limit - 1)
+        return [json.loads(item) for item in items]
+
+    # --- 워커용 ---
+
+    def claim(self, worker_id, timeout=1):
+        """대기 큐에서 하나를 꺼내 워커의 처리 중 목록으로 원자적으로 옮긴다"""
+        return self.redis.blmove(QUEUE_KEY, processing_key(worker_id), timeout, "LEFT", "RIGHT")
+
+    def ack(self, worker_id, raw):
+        self.redis.lrem(processing_key(worker_id), 1, raw)
+
+    def job_options(self, job_id):
+        job = self.redis.hgetall(f"job:{job_id}")
+        if not job:
+            return None
+        return {"use_cache": job.get("use_cache") == "1", "max_attempts": int(job.get("max_attempts", 3))}
+
+    def complete(self, worker_id, raw, record, success):
+        task = json.loads(raw)
+        job_key = f"job:{task['job_id']}"
+        pipe = self.redis.pipeline()
+        pipe.rpush(f"{job_key}:results", json.dumps(record, ensure_ascii=False))
+        pipe.expire(f"{job_key}:results", self.job_ttl)
+        pipe.hincrby(job_key, "done" if success else "failed", 1)
+        pipe.hset(job_key, "updated_at", time.time())
+        pipe.lrem(processing_key(worker_id), 1, raw)
+        pipe.execute()
+        self._maybe_finish(task["job_id"])
+
+    def retry_later(self, worker_id, raw, delay):
+        task = json.loads(raw)
+        task["attempts"] += 1
+        pipe = self.redis.pipeline()
+        pipe.zadd(DELAYED_KEY, {json.dumps(task): time.time() + delay})
+        pipe.lrem(processing_key(worker_id), 1, raw)
+        pipe.execute()
+
+    def dead_letter(self, worker_id, raw, error):
+        task = json.loads(raw)
+        job_key = f"job:{task['job_id']}"
+        task["error"] = error
+        pipe = self.redis.pipeline()
+        pipe.rpush(f"{job_key}:dead", json.dumps(task, ensure_ascii=False))
+        pipe.expire(f"{job_key}:dead", self.job_ttl)
+        pipe.hincrby(job_key, "dead", 1)
+        pipe.execute()
+        # 결과 목록에도 실패 레코드를 남겨 진행률이 끝까지 도달하도록 함
+        record = {"url": task["url"], "index": task["index"], "success": False,
+                  "error": error, "attempts": task["attempts"] + 1}
+        self.complete(worker_id, raw, record, success=False)
+
+    def promote_delayed(self, limit=100):
+        """실행 시각이 된 재시도 태스크를 대기 큐로 옮긴다"""
+        due = self.redis.zrangebyscore(DELAYED_KEY, 0, time.time(), start=0, num=limit)
+        for raw in due:
+            # 여러 워커가 동시에 옮기지 않도록 zrem 에 성공한 쪽만 적재
+            if self.redis.zrem(DELAYED_KEY, raw):
+                self.redis.rpush(QUEUE_KEY, raw)
+        return len(due)
+
+    def heartbeat(self, worker_id):
+        self.redis.hset(WORKERS_KEY, worker_id, time.time())
+
+    def unregister(self, worker_id):
+        self.redis.hdel(WORKERS_KEY, worker_id)
+
+    def recover(self, worker_id):
+        """워커의 처리 중 목록에 남은 태스크를 대기 큐 앞쪽으로 되돌린다"""
+        recovered = 0
+        while self.redis.lmove(processing_key(worker_id), QUEUE_KEY, "RIGHT", "LEFT"):
+            recovered += 1
+        return recovered
+
+    def recover_stale(self, max_age=60):
+        """heartbeat 가 끊긴 워커(컨테이너 재시작 등)의 태스크를 복구"""
+        recovered = 0
+        now = time.time()
+        for worker_id, last_seen in self.redis.hgetall(WORKERS_KEY).items():
+            if now - float(last_seen) > max_age:
+                recovered += self.recover(worker_id)
+                self.unregister(worker_id)
+        return recovered
+
+    def _maybe_finish(self, job_id):
+        return self.redis.eval(FINISH_JOB_SCRIPT, 1, f"job:{job_id}")
+
+
+class JobWorker:
+    """큐에서 URL을 꺼내 ArticleScraper 로 처리하는 워커"""
+
+    def __init__(self, queue, scrape, worker_id=None, concurrency=10,
+                 retry_base_delay=5.0, heartbeat_interval=10.0, stale_after=60.0):
+        self.queue = queue
+        self.scrape = scrape  # async (url, use_cache) -> result
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency
+        self.retry_base_delay = retry_base_delay
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._stop = asyncio.Event()
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def _process(self, raw):
+        task = json.loads(raw)
+        options = await self._call(self.queue.job_options, task["job_id"])
+        if options is None:
+            # 만료되었거나 삭제된 작업
+            await self._call(self.queue.ack, self.worker_id, raw)
+            return
+
+        try:
+            result = await self.scrape(task["url"], options["use_cache"])
+        except Exception as e:
+            attempts = task["attempts"] + 1
+            if attempts >= options["max_attempts"]:
+                logger.error(f"재시도 소진, dead letter: {task['url']} ({e})")
+                await self._call(self.queue.dead_letter, self.worker_id, raw, str(e))
+            else:
+                delay = self.retry_base_delay * (2 ** task["attempts"]) * random.uniform(0.5, 1.5)
+                logger.warning(f"재시도 예약 {attempts}/{options['max_attempts']} ({delay:.1f}s 후): {task['url']} ({e})")
+                await self._call(self.queue.retry_later, self.worker_id, raw, delay)
+            return
+
+        record = {"url": task["url"], "index": task["index"], "success": True,
+                  "data": result, "attempts": task["attempts"] + 1}
+        await self._call(self.queue.complete, self.worker_id, raw, record, True)
+
+    async def _process_safely(self, raw):
+        try:
+            await self._process(raw)
+        except Exception as e:
+            # Redis 오류 등: 태스크는 처리 중 목록에 남아 재시작/복구 시 다시 실행된다
+            logger.error(f"태스크 처리 실패: {e}")
+
+    async def _consume(self):
+        """빈 슬롯이 있을 때만 큐에서 꺼내 동시에 최대 concurrency 건 처리"""
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+
+        def finished(task):
+            running.discard(task)
+            slots.release()
+
+        while not self._stop.is_set():
+            await slots.acquire()
+            raw = await self._call(self.queue.claim, self.worker_id, 1)
+            if not raw:
+                slots.release()
+                continue
+            task = asyncio.ensure_future(self._process_safely(raw))
+            running.add(task)
+            task.add_done_callback(finished)
+
+        # 종료 시 진행 중인 태스크는 마무리
+        await asyncio.gather(*running)
+
+    async def _maintain(self):
+        while not self._stop.is_set():
+            await self._call(self.queue.heartbeat, self.worker_id)
+            await self._call(self.queue.promote_delayed)
+            await self._call(self.queue.recover_stale, self.stale_after)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        # 같은 ID로 재시작한 경우 처리 중이던 태스크부터 되돌린다
+        recovered = await self._call(self.queue.recover, self.worker_id)
+        if recovered:
+            logger.info(f"재시작 복구: {recovered}건을 큐로 되돌림")
+        await self._call(self.queue.heartbeat, self.worker_id)
+        try:
+            await asyncio.gather(self._maintain(), self._consume())
+        finally:
+            await self._call(self.queue.recover, self.worker_id)
+            await self._call(self.queue.unregister, self.worker_id)
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 작업 큐 워커")
+    parser.add_argument("command", choices=["worker"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--worker-id", default=os.getenv("WORKER_ID"))
+    args = parser.parse_args()
+
+    from cluster import ClusterNode
+    from deadline import DeadlineExceeded
+    from article_scraper import ArticleScraper
+
+    async def run():
+        # asyncio 객체(세마포어/이벤트)가 이 이벤트 루프에 묶이도록 루프 안에서 생성 (Python 3.9)
+        scraper = ArticleScraper(headless=True)
+        # 클러스터 모드면 캐시에 없는 URL 은 도메인 담당 웹 노드에 맡긴다 (워커는 링에 참여하지 않음)
+        scraper.cluster = ClusterNode.from_env(scraper.redis_client, member=False)
+        if scraper.cluster is not None:
+            await scraper.cluster.start(scraper._run_blocking)
+
+        async def scrape(url, use_cache):
+            result, _ = await scraper.extract_with_cache_status(url, use_cache=use_cache)
+            if result.get('partial'):
+                # 작업 큐는 응답 지연에 덜 민감하므로 부분 결과 대신 나중에 다시 시도
+                raise DeadlineExceeded(result['deadline_stage'])
+            return result
+
+        worker = JobWorker(JobQueue(scraper.redis_client), scrape,
+                           worker_id=args.worker_id, concurrency=args.concurrency)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        logger.info(f"작업 큐 워커 시작: {worker.worker_id}")
+        try:
+            await worker.run()
+        finally:
+            if scraper.cluster is not None:
+                await scraper.cluster.stop(scraper._run_blocking)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""지연 시간·오류율·메모리를 보고 동시 처리 수를 조절하는 적응형 한도 (AIMD)
+
+    limiter = AsyncLimiter('static', initial=30, max_limit=120)
+    await limiter.acquire()
+    ...
+    limiter.release(latency, error=timed_out)
+
+완료 window 건마다 한 번씩 한도를 조정한다.
+    감소 (x decrease)  구간 중 최대 메모리가 memory_limit 이상, 과부하 오류율이 max_error_rate 초과,
+                       또는 지연 중앙값이 기준 지연 x tolerance 초과
+    증가 (+increase)   위에 해당하지 않고 한도가 꽉 차서 기다린 작업이 있었을 때
+                       (increase 를 주지 않으면 gradient2 처럼 sqrt(한도))
+기준 지연은 구간 중앙값의 최솟값이고, 사이트가 전반적으로 느려지는 경우를 따라가도록
+구간마다 drift 만큼 올라간다. 메모리가 memory_limit x memory_soft 이상이면 늘리지 않는다.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from metrics import CONCURRENCY_LIMIT, LIMIT_ADJUSTMENTS
+
+logger = logging.getLogger(__name__)
+
+
+def process_tree_rss(pid=None):
+    """프로세스와 그 자손(Chrome 등) RSS 합 (바이트). /proc 이 없으면 None"""
+    pid = pid or os.getpid()
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return None
+    children, rss = {}, {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue  # 그 사이 종료된 프로세스
+        fields = stat[stat.rfind(b')') + 2:].split()  # 3번째 필드(state)부터
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21])
+    if pid not in rss:
+        return None
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, ()))
+    return total * os.sysconf('SC_PAGE_SIZE')
+
+
+def container_memory_limit():
+    """cgroup 메모리 한도 (바이트, 없으면 None)"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:  # 한도가 없으면 'max' 또는 아주 큰 수
+            return int(value)
+    return None
+
+
+class MemoryProbe:
+    """process_tree_rss 를 interval 초에 한 번만 읽는다 (/proc 전체를 훑으므로)"""
+
+    def __init__(self, interval=1.0, read=process_tree_rss):
+        self.interval = interval
+        self._read = read
+        self._value = None
+        self._read_at = float('-inf')
+
+    def __call__(self):
+        now = time.monotonic()
+        if now - self._read_at >= self.interval:
+            self._value = self._read()
+            self._read_at = now
+        return self._value
+
+
+class AdaptiveLimit:
+    """동시 처리 한도 계산 (스레드 안전). 실제 대기열은 하위 클래스나 on_change 쪽에서 관리"""
+
+    def __init__(self, name, initial, min_limit=1, max_limit=100, window=20, increase=None, decrease=0.75,
+                 tolerance=1.5, drift=1.01, max_error_rate=0.2, memory=None, memory_limit=None,
+                 memory_soft=0.85, on_change=None):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.drift = drift
+        self.max_error_rate = max_error_rate
+        self.memory = memory              # 현재 메모리 사용량(바이트)을 돌려주는 함수
+        self.memory_limit = memory_limit
+        self.memory_soft = memory_soft
+        self.on_change = on_change        # 정수 한도가 바뀌면 on_change(limit)
+        self.baseline = None              # 기준 지연(초)
+        self.last_reason = None
+        self._samples = []
+        self._saturated = False
+        self._peak_memory = None
+        self._lock = threading.Lock()
+        CONCURRENCY_LIMIT.labels(name).set(self.limit)
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def record(self, latency, error=False, saturated=False):
+        """완료된 작업 하나 (error: 과부하로 볼 수 있는 실패, saturated: 한도가 꽉 차 있었는지)"""
+        memory = self.memory() if self.memory and self.memory_limit else None
+        with self._lock:
+            self._samples.append((latency, error))
+            self._saturated = self._saturated or saturated
+            if memory is not None:
+                self._peak_memory = max(memory, self._peak_memory or 0)
+            if len(self._samples) < self.window:
+                return
+            samples, self._samples = self._samples, []
+            saturated, self._saturated = self._saturated, False
+            memory, self._peak_memory = self._peak_memory, None
+            before = self.limit
+            self._adjust(samples, saturated, memory)
+            after = self.limit
+        if after != before:
+            CONCURRENCY_LIMIT.labels(self.name).set(after)
+            LIMIT_ADJUSTMENTS.labels(self.name, self.last_reason).inc()
+            logger.info(f"{self.name} 동시 처리 한도 {before} → {after} ({self.last_reason})")
+            if self.on_change:
+                self.on_change(after)
+
+    def _adjust(self, samples, saturated, memory):
+        latencies = sorted(latency for latency, error in samples if not error)
+        error_rate = sum(error for _, error in samples) / len(samples)
+        median = latencies[len(latencies) // 2] if latencies else None
+        if median is not None:
+            self.baseline = median if self.baseline is None else min(self.baseline * self.drift, median)
+        if memory is not None and memory >= self.memory_limit:
+            reason = 'memory'
+        elif error_rate > self.max_error_rate:
+            reason = 'errors'
+        elif median is not None and median > self.baseline * self.tolerance:
+            reason = 'latency'
+        else:
+            reason = None
+        if reason:
+            self._limit = max(self._limit * self.decrease, self.min_limit)
+        elif saturated and (memory is None or memory < self.memory_limit * self.memory_soft):
+            reason = 'saturated'
+            increase = self.increase if self.increase is not None else self._limit ** 0.5
+            self._limit = min(self._limit + increase, self.max_limit)
+        self.last_reason = reason
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'min': self.min_limit,
+                'max': self.max_limit,
+                'baseline_ms': round(self.baseline * 1000, 1) if self.baseline is not None else None,
+                'last_adjustment': self.last_reason,
+                'memory_limit_mb': round(self.memory_limit / 2 ** 20) if self.memory_limit else None,
+            }
+
+
+class AsyncLimiter(AdaptiveLimit):
+    """asyncio 작업용 적응형 세마포어 (먼저 기다린 작업부터)"""
+
+    def __init__(self, name, initial, **kwargs):
+        super().__init__(name, initial, **kwargs)
+        self.in_flight = 0
+        self._waiters = deque()
+
+    async def acquire(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1  # 자리를 받은 직후 취소됨: 다음 대기자에게 넘긴다
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency, error=False):
+        saturated = bool(self._waiters) or self.in_flight >= self.limit
+        self.in_flight -= 1
+        self.record(latency, error, saturated)
+        self._wake()
+
+    def step_aside(self):
+        """지연 표본 없이 자리를 잠시 내준다 (다른 자원을 기다리는 동안). 다시 쓰려면 acquire"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self):
+        return {**super().stats(), 'in_flight': self.in_flight, 'waiting': len(self._waiters)}
@@ -0,0 +1,94 @@
+"""Prometheus 지표와 단계별 소요 시간 스팬
+
+    spans = Spans()
+    with spans.span('fetch'):
+        ...
+    spans.observe(domain)   # 단계·도메인별 히스토그램에 기록
+
+여러 uvicorn 워커로 실행할 때는 PROMETHEUS_MULTIPROC_DIR 을 지정하면
+/metrics 가 모든 워커의 값을 합쳐서 내보낸다.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+# 도메인 라벨 수 제한 (라벨 조합이 무한히 늘지 않도록 나머지는 'other')
+MAX_DOMAIN_LABELS = int(os.getenv('METRICS_MAX_DOMAINS', 200))
+
+STAGE_SECONDS = Histogram(
+    'scraper_stage_seconds', '기사 처리 단계별 소요 시간', ['stage', 'domain'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+RESPONSE_BYTES = Histogram(
+    'scraper_response_bytes', '응답 본문 크기',
+    buckets=(1024, 8192, 32768, 65536, 131072, 262144, 524288, 1048576, 4194304, 10485760),
+)
+CACHE_RESULTS = Counter('scraper_cache_results_total', '캐시 조회 결과', ['status'])
+RENDERS = Counter('scraper_browser_renders_total', 'Selenium 렌더링 횟수', ['outcome'])
+HEDGED_REQUESTS = Counter('scraper_hedged_requests_total', '헤지(중복) 요청을 보낸 페치의 승자', ['winner'])
+DEADLINE_EXCEEDED = Counter('scraper_deadline_exceeded_total', '시간 예산 초과', ['stage'])
+CLUSTER_FORWARDS = Counter('scraper_cluster_forwards_total', '담당 노드로 넘긴 스크래핑', ['outcome'])
+RULE_RESULTS = Counter('scraper_rule_results_total', '언론사별 추출 규칙 적중/실패', ['domain', 'field', 'rule', 'outcome'])
+RENDER_DECISIONS = Counter('scraper_render_decisions_total', 'JS 렌더링 필요 여부 판단 결과', ['decision'])
+CONCURRENCY_LIMIT = Gauge('scraper_concurrency_limit', '경로별 적응형 동시 처리 한도', ['path'], multiprocess_mode='livesum')
+LIMIT_ADJUSTMENTS = Counter('scraper_limit_adjustments_total', '동시 처리 한도 조정 횟수', ['path', 'reason'])
+EXTRACT_WAITING = Gauge('scraper_extract_waiting', '동시 처리 한도 대기 중인 작업 수', multiprocess_mode='livesum')
+EXTRACT_ACTIVE = Gauge('scraper_extract_active', '동시 처리 한도 안에서 실행 중인 작업 수', multiprocess_mode='livesum')
+EXECUTOR_QUEUE = Gauge('scraper_executor_queue_depth', '스레드풀 대기열 길이', multiprocess_mode='livemax')
+
+_domains = set()
+_domains_lock = threading.Lock()
+
+
+def domain_label(domain):
+    domain = (domain or '').lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    if domain in _domains:
+        return domain
+    with _domains_lock:
+        if len(_domains) < MAX_DOMAIN_LABELS:
+            _domains.add(domain)
+            return domain
+    return 'other'
+
+
+class Spans:
+    """기사 한 건의 단계별 소요 시간(초). 같은 단계가 여러 번 열리면 합산"""
+
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage, seconds):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def merge(self, durations):
+        for stage, seconds in durations.items():
+            self.add(stage, seconds)
+
+    def observe(self, domain):
+        label = domain_label(domain)
+        for stage, seconds in self.durations.items():
+            STAGE_SECONDS.labels(stage, label).observe(seconds)
+
+
+def render_latest():
+    """(본문, Content-Type) - 멀티프로세스 모드면 워커별 값을 합산"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,41 @@
+"""Redis 를 선택적으로 쓰는 구성 요소(캐시, 추출 전략, 렌더링 표본, 중복 인덱스)의 공통 처리
+
+    redis 가 None 이면 로컬 상태만 쓴다.
+    Redis 오류가 나면 error_backoff 초 동안 Redis 를 건너뛴다 (요청마다 연결 재시도 대기를 하지 않도록).
+    다른 워커/컨테이너가 쓴 값은 키별로 refresh_interval 초에 한 번만 다시 읽는다.
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBacked:
+    """하위 클래스는 로그에 쓸 redis_label(무엇을)과 local_fallback(실패 시 무엇을 쓰는지)을 정한다"""
+
+    redis_label = 'Redis'
+    local_fallback = '로컬 상태만 사용'
+
+    def __init__(self, redis_client=None, error_backoff=30, refresh_interval=300):
+        self.redis = redis_client
+        self.error_backoff = error_backoff
+        self.refresh_interval = refresh_interval
+        self._redis_retry_at = 0.0
+        self._loaded_at = {}
+
+    def _redis_available(self):
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, action, error):
+        self._redis_retry_at = time.monotonic() + self.error_backoff
+        logger.error(f"{self.redis_label} {action} 실패 ({self.error_backoff}s 동안 {self.local_fallback}): {error}")
+
+    def _refresh_due(self, key):
+        """key 를 Redis 에서 다시 읽을 때인지 (그렇다면 지금 읽은 것으로 기록)"""
+        if not self._redis_available():
+            return False
+        loaded_at = self._loaded_at.get(key)
+        if loaded_at is not None and time.monotonic() - loaded_at < self.refresh_interval:
+            return False
+        self._loaded_at[key] = time.monotonic()
+        return True
@@ -0,0 +1,185 @@
+"""정적 HTML 로 충분한지, Selenium 렌더링이 필요한지 판단하는 가벼운 분류기
+
+특징은 파싱된 트리를 한 번 순회해서 얻는다.
+    content_chars  링크 밖의 40자 이상 텍스트 조각 합 (본문 문장)
+    text_chars     보이는 텍스트 전체
+    script_chars   인라인 스크립트 길이, scripts 는 스크립트 태그 수
+    shell          #app/#root/#__next 같은 빈 SPA 마운트 지점이나 "JavaScript 를 켜라" 는
+                   <noscript> 안내가 있는지 (추적 코드만 든 <noscript> 는 해당 없음)
+
+점수 = 본문 부족 정도 x JS 의존 정도 (0~1). 스크립트 태그 수는 광고/분석 코드 때문에
+거의 모든 페이지에서 많으므로 약한 신호로만 쓴다. 도메인별 임계값은 실제 렌더링 결과
+(렌더링해서 유효한 본문을 얻었는지)로 학습하고, 표본은 Redis 에 남겨 워커 간에 공유한다.
+"""
+import random
+import threading
+from collections import deque
+
+from redis_backed import RedisBacked
+
+SKIP_TAGS = {'script', 'style', 'template', 'noscript'}
+MOUNT_IDS = {'app', 'root', '__next', '__nuxt'}
+MIN_SENTENCE_CHARS = 40
+CONTENT_TARGET_CHARS = 1000   # 본문이 이만큼 있으면 렌더링할 이유가 없다
+MAX_SCRIPTS = 20
+JS_NOTICES = ('javascript', '자바스크립트')
+
+
+def page_features(tree):
+    features = {'text_chars': 0, 'content_chars': 0, 'script_chars': 0, 'scripts': 0, 'shell': False}
+    for element in tree.iter():
+        tag = element.tag
+        if not isinstance(tag, str):  # 주석/처리 지시문: 꼬리 텍스트만 보인다
+            tag = None
+        elif tag == 'script':
+            features['scripts'] += 1
+            features['script_chars'] += len(element.text or '')
+        elif tag == 'noscript':
+            notice = (element.text or '').lower()
+            features['shell'] = features['shell'] or any(word in notice for word in JS_NOTICES)
+        elif element.get('id') in MOUNT_IDS and len(element) == 0 and not (element.text or '').strip():
+            features['shell'] = True
+        if tag is not None and tag not in SKIP_TAGS:
+            _count_text(features, element.text, in_link=tag == 'a')
+        parent = element.getparent()
+        _count_text(features, element.tail, in_link=parent is not None and parent.tag == 'a')
+    return features
+
+
+def _count_text(features, text, in_link):
+    if not text:
+        return
+    length = len(text.strip())
+    features['text_chars'] += length
+    if length >= MIN_SENTENCE_CHARS and not in_link:
+        features['content_chars'] += length
+
+
+def render_score(features):
+    text_poor = 1 - min(features['content_chars'] / CONTENT_TARGET_CHARS, 1)
+    if features['shell']:
+        js_signal = 1.0
+    else:
+        script_ratio = features['script_chars'] / (features['script_chars'] + features['text_chars'] + 1)
+        js_signal = max(script_ratio, 0.5 * min(features['scripts'], MAX_SCRIPTS) / MAX_SCRIPTS)
+    return text_poor * (0.3 + 0.7 * js_signal)
+
+
+class RenderClassifier(RedisBacked):
+    """도메인별 렌더링 임계값. 표본이 min_samples 보다 적으면 기본 임계값을 쓴다"""
+
+    redis_label = '렌더링 표본'
+    local_fallback = '로컬 표본만 사용'
+
+    def __init__(self, redis_client=None, threshold=0.5, min_samples=5, max_samples=50, miss_cost=3.0,
+                 explore_rate=0.05, ttl=7 * 24 * 3600, refresh_interval=300, error_backoff=30):
+        super().__init__(redis_client, error_backoff, refresh_interval)
+        self.default_threshold = threshold
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.miss_cost = miss_cost        # 필요한 렌더링을 건너뛴 비용 (불필요한 렌더링 = 1)
+        self.explore_rate = explore_rate  # 건너뛸 페이지도 가끔 렌더링해서 임계값이 한쪽으로 굳지 않게
+        self.ttl = ttl
+        self._samples = {}                # 도메인 -> deque[(점수, 유효 본문 여부)]
+        self._thresholds = {}
+        self._lock = threading.Lock()
+        self.decisions = {'render': 0, 'skip': 0}
+
+    @staticmethod
+    def _key(domain):
+        return f"render:{domain}"
+
+    def _load(self, domain):
+        if not self._refresh_due(domain):
+            return
+        try:
+            raw = self.redis.lrange(self._key(domain), 0, -1)
+        except Exception as e:
+            self._redis_failed('조회', e)
+            return
+        samples = []
+        for value in raw:
+            score, _, helped = value.partition(':')
+            samples.append((float(score), helped == '1'))
+        if samples:
+            with self._lock:
+                self._samples[domain] = deque(samples, maxlen=self.max_samples)
+                self._thresholds.pop(domain, None)
+
+    def _learn(self, samples):
+        """놓친 렌더링 x miss_cost + 불필요한 렌더링 합이 가장 작은 임계값 (동점이면 기본값에 가까운 쪽)"""
+        candidates = {0.0, 1.01, self.default_threshold}
+        for score, _ in samples:
+            candidates.update((score, score + 1e-6))
+
+        def cost(threshold):
+            missed = sum(1 for score, helped in samples if helped and score < threshold)
+            wasted = sum(1 for score, helped in samples if not helped and score >= threshold)
+            return missed * self.miss_cost + wasted
+
+        return min(sorted(candidates), key=lambda t: (cost(t), abs(t - self.default_threshold)))
+
+    def threshold(self, domain):
+        self._load(domain)
+        with self._lock:
+            if domain not in self._thresholds:
+                samples = self._samples.get(domain, ())
+                self._thresholds[domain] = (
+                    self._learn(samples) if len(samples) >= self.min_samples else self.default_threshold)
+            return self._thresholds[domain]
+
+    def needs_render(self, domain, features):
+        render = render_score(features) >= self.threshold(domain) or random.random() < self.explore_rate
+        with self._lock:  # 스레드풀의 여러 추출이 동시에 센다
+            self.decisions['render' if render else 'skip'] += 1
+        return render
+
+    def record(self, domain, features, helped):
+        """렌더링 결과 기록 - helped: 렌더링한 문서에서 유효한 본문을 얻었는지"""
+        score = round(render_score(features), 3)
+        with self._lock:
+            self._samples.setdefault(domain, deque(maxlen=self.max_samples)).append((score, helped))
+            self._thresholds.pop(domain, None)
+        if not self._redis_available():
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.rpush(self._key(domain), f"{score}:{int(helped)}")
+            pipe.ltrim(self._key(domain), -self.max_samples, -1)
+            pipe.expire(self._key(domain), self.ttl)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed('저장', e)
+
+    def snapshot(self, domain):
+        """도메인 표본 사본 (추출 프로세스 풀 워커에 넘긴다)"""
+        self._load(domain)
+        with self._lock:
+            return list(self._samples.get(domain, ()))
+
+    def restore(self, domain, samples):
+        with self._lock:
+            self._samples[domain] = deque(samples, maxlen=self.max_samples)
+            self._thresholds.pop(domain, None)
+
+    def add_decisions(self, decisions):
+        """추출 프로세스 풀 워커에서 내린 판단 횟수 합산"""
+        with self._lock:
+            for decision, count in decisions.items():
+                self.decisions[decision] += count
+
+    def stats(self):
+        with self._lock:
+            domains = list(self._samples)
+        report = {}
+        for domain in domains:
+            with self._lock:
+                samples = list(self._samples.get(domain, ()))
+            report[domain] = {
+                'threshold': round(self.threshold(domain), 3),
+                'samples': len(samples),
+                'helped_rate': round(sum(helped for _, helped in samples) / len(samples), 3) if samples else 0.0,
+            }
+        with self._lock:
+            decisions = dict(self.decisions)
+        return {'decisions': decisions, 'domains': report}
@@ -0,0 +1,221 @@
+"""언론사별 추출 규칙 (제목/저자/작성일/본문) 레지스트리
+
+    registry = RulesRegistry()
+    rules = registry.for_domain('www.chosun.com')          # 규칙이 없는 도메인이면 None
+    values, tried = rules.extract('title', doc.tree)
+    registry.record(rules.domain, 'title', tried)
+
+규칙 목록은 DEFAULT_RULES 이고, EXTRACTION_RULES 환경변수로 같은 형식의 JSON 파일을 지정할 수 있다.
+규칙은 CSS 선택자(기본) 또는 'xpath:' 로 시작하는 XPath 이며 로드할 때 모두 XPath 로 컴파일한다.
+필드마다 앞의 규칙부터 시도해 처음 값이 나오는(accept 를 통과하는) 규칙을 쓴다. 본문처럼 값이
+쓸 만한지 따로 봐야 하는 필드는 accept 로 검사해서, 값은 나왔지만 버려진 규칙도 실패로 센다. 파일은 수정 시각이 바뀌면 다음 조회 때
+다시 읽고, 잘못된 규칙이 있으면 기존 규칙을 유지한다. 규칙별 적중/실패 횟수는 stats() 와 Prometheus 로 본다.
+"""
+import json
+import logging
+import os
+import time
+
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from metrics import RULE_RESULTS
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('title', 'authors', 'publish_date', 'body')
+PUBLISHED_TIME = "xpath://meta[@property='article:published_time']/@content"
+
+# 도메인 -> 필드 -> 규칙 목록 (하위 도메인에도 적용)
+DEFAULT_RULES = {
+    'chosun.com': {
+        'title': ['h1.news-title', 'h1.article-title', 'h1.article-header__headline'],
+        'authors': ['.author'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['section.article-body'],
+    },
+    'joongang.co.kr': {
+        'title': ['h1.headline'],
+        'authors': ['.byline a'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['#article_body'],
+    },
+    'donga.com': {
+        'title': ['h1.title'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['section.news_view', '.article_txt'],
+    },
+    'mk.co.kr': {
+        'title': ['h1.top_title', 'h2.news_ttl'],
+        'authors': ['.author_text', '.author .name'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['.news_cnt_detail_wrap'],
+    },
+    'hankyung.com': {
+        'title': ['h1.headline', 'h1.title'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['#articletxt'],
+    },
+    'yna.co.kr': {
+        'title': ['h1.tit'],
+        'authors': ['.writer-zone01 .tit-name a'],
+        'publish_date': [PUBLISHED_TIME],
+        'body': ['.story-news.article'],
+    },
+}
+
+# 본문 요소 안의 스크립트/스타일 텍스트는 제외
+BODY_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+
+
+class RuleError(ValueError):
+    """규칙 파일 형식 오류 또는 컴파일할 수 없는 선택자"""
+
+
+class Rule:
+    def __init__(self, domain, field, source):
+        self.domain = domain
+        self.field = field
+        self.source = source
+        try:
+            if source.startswith('xpath:'):
+                self.xpath = etree.XPath(source[len('xpath:'):])
+            else:
+                self.xpath = etree.XPath(CSSSelector(source).path)
+        except Exception as e:
+            raise RuleError(f"{domain} {field} 규칙 컴파일 실패 '{source}': {e}") from e
+        self.hits = 0
+        self.misses = 0
+
+    def values(self, tree):
+        """매칭된 요소의 텍스트 (속성/텍스트 노드를 고르는 XPath 면 그 문자열)"""
+        values = []
+        for match in self.xpath(tree):
+            if isinstance(match, str):
+                value = match
+            elif self.field == 'body':
+                value = ' '.join(text.strip() for text in BODY_TEXT_XPATH(match) if text.strip())
+            else:
+                value = match.text_content()
+            value = value.strip()
+            if value:
+                values.append(value)
+        return values
+
+    def record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        RULE_RESULTS.labels(self.domain, self.field, self.source, 'hit' if hit else 'miss').inc()
+
+
+class DomainRules:
+    def __init__(self, domain, spec):
+        unknown = set(spec) - set(FIELDS)
+        if unknown:
+            raise RuleError(f"{domain}: 알 수 없는 필드 {', '.join(sorted(unknown))}")
+        self.domain = domain
+        self.fields = {}
+        for field, sources in spec.items():
+            if isinstance(sources, str):
+                sources = [sources]
+            self.fields[field] = [Rule(domain, field, source) for source in sources]
+
+    def __contains__(self, field):
+        return field in self.fields
+
+    def extract(self, field, tree, accept=bool):
+        """(처음으로 accept(값 목록)를 통과한 규칙의 값 목록, 시도한 규칙별 [(선택자, 통과 여부)])
+
+        모든 규칙이 실패하면 값 목록은 []. 결과 기록은 RulesRegistry.record 로 한다.
+        """
+        tried = []
+        for rule in self.fields.get(field, ()):
+            values = rule.values(tree)
+            passed = bool(values) and accept(values)
+            tried.append((rule.source, passed))
+            if passed:
+                return values, tried
+        return [], tried
+
+    def first(self, field, tree):
+        values, _ = self.extract(field, tree)
+        return values[0] if values else None
+
+
+class RulesRegistry:
+    def __init__(self, path=None, check_interval=5.0):
+        self.path = path or os.getenv('EXTRACTION_RULES')
+        self.check_interval = check_interval
+        self._rules = self.compile(DEFAULT_RULES)
+        self._mtime = None
+        self.version = 0  # 다시 로드할 때마다 증가 (추출 프로세스 풀 워커가 따라 로드)
+        self._checked_at = time.monotonic()
+        if self.path:
+            self.reload()
+
+    @staticmethod
+    def compile(config):
+        return {domain.lower(): DomainRules(domain.lower(), spec) for domain, spec in config.items()}
+
+    def reload(self):
+        """규칙 파일을 다시 읽어 컴파일. 실패하면 기존 규칙을 유지하고 False"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, encoding='utf-8') as f:
+                rules = self.compile(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"추출 규칙 로드 실패, 기존 규칙 유지: {e}")
+            return False
+        finally:
+            self._checked_at = time.monotonic()
+        self._rules, self._mtime = rules, mtime  # 통째로 바꾸므로 읽는 쪽은 락이 필요 없다
+        self.version += 1
+        logger.info(f"추출 규칙 {len(rules)}개 도메인 로드: {self.path}")
+        return True
+
+    def _maybe_reload(self):
+        if not self.path or time.monotonic() - self._checked_at < self.check_interval:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._mtime = mtime  # 잘못된 파일이면 다음 수정 때까지 다시 읽지 않음
+            self.reload()
+
+    def for_domain(self, domain):
+        """'chosun.com' 규칙은 'www.chosun.com' 에도 적용. 규칙이 없으면 None"""
+        self._maybe_reload()
+        rules = self._rules
+        while domain:
+            if domain in rules:
+                return rules[domain]
+            domain = domain.partition('.')[2]
+        return None
+
+    def record(self, domain, field, tried):
+        """extract 가 돌려준 규칙별 결과 기록 (그 사이 규칙이 다시 로드돼 없어진 규칙은 건너뜀)"""
+        domain_rules = self._rules.get(domain)
+        if domain_rules is None:
+            return
+        rules = {rule.source: rule for rule in domain_rules.fields.get(field, ())}
+        for source, hit in tried:
+            if source in rules:
+                rules[source].record(hit)
+
+    def stats(self):
+        return {
+            domain: {
+                field: [
+                    {'rule': rule.source, 'hits': rule.hits, 'misses': rule.misses,
+                     'hit_rate': round(rule.hits / (rule.hits + rule.misses), 3) if rule.hits + rule.misses else None}
+                    for rule in field_rules
+                ]
+                for field, field_rules in domain_rules.fields.items()
+            }
+            for domain, domain_rules in self._rules.items()
+        }
@@ -0,0 +1,184 @@
+"""도메인(netloc)별 동시성 제한 + 토큰 버킷 + 적응형 백오프 스케줄러"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = (429, 503)
+_END = object()
+
+
+@asynccontextmanager
+async def _no_wait():
+    yield  # contextlib.nullcontext 는 3.10 부터 async with 지원
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate            # 초당 토큰
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostState:
+    def __init__(self, policy):
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy['concurrency'])
+        self.bucket = TokenBucket(policy['rate'], policy.get('burst', policy['concurrency']))
+        self.backoff_until = 0.0
+        self.strikes = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=200)  # 최근 성공 응답 시간(초), 헤지 요청 기준
+
+
+class HostScheduler:
+    """호스트마다 동시 요청 수와 초당 요청 수를 제한하고, 429/503 응답 시 물러선다"""
+
+    def __init__(self, policies=None, default_policy=None, max_backoff=300.0, hedge_min_samples=20,
+                 hedge_percentile=95, hedge_min_delay=0.05):
+        self.policies = policies or {}
+        self.default_policy = default_policy or {'concurrency': 6, 'rate': 5.0}
+        self.max_backoff = max_backoff
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self._hosts = {}
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def policy_for(self, host):
+        # 'chosun.com' 정책은 'www.chosun.com' 에도 적용
+        for domain, policy in self.policies.items():
+            if host == domain or host.endswith('.' + domain):
+                return {**self.default_policy, **policy}
+        return self.default_policy
+
+    def _state(self, url):
+        host = self.host_of(url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.policy_for(host))
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url, waiting=None):
+        """waiting: 슬롯을 얻기까지의 대기(동시성/백오프/토큰)를 감쌀 비동기 컨텍스트 매니저"""
+        state = self._state(url)
+        async with waiting or _no_wait():
+            await state.semaphore.acquire()
+            try:
+                delay = state.backoff_until - time.monotonic()
+                while delay > 0:
+                    await asyncio.sleep(delay)
+                    delay = state.backoff_until - time.monotonic()
+                await state.bucket.acquire()
+            except BaseException:
+                state.semaphore.release()
+                raise
+        state.in_flight += 1
+        try:
+            yield state
+        finally:
+            state.in_flight -= 1
+            state.semaphore.release()
+
+    @staticmethod
+    def _parse_retry_after(value):
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def report(self, url, status_code, retry_after=None):
+        """응답 상태를 반영한다. 제한(429/503) 응답이면 True"""
+        state = self._state(url)
+        policy = state.policy
+        if status_code in THROTTLE_STATUSES:
+            state.strikes += 1
+            delay = self._parse_retry_after(retry_after)
+            if delay is None:
+                delay = min(2 ** state.strikes, self.max_backoff)
+            state.backoff_until = max(state.backoff_until, time.monotonic() + min(delay, self.max_backoff))
+            # 속도를 절반으로 (정책 속도의 1/16 까지)
+            state.bucket.rate = max(state.bucket.rate / 2, policy['rate'] / 16)
+            logger.warning(
+                f"{self.host_of(url)} 요청 제한 ({status_code}): {delay:.1f}s 대기, "
+                f"속도 {state.bucket.rate:.2f}/s"
+            )
+            return True
+
+        state.strikes = 0
+        if state.bucket.rate < policy['rate']:
+            state.bucket.rate = min(policy['rate'], state.bucket.rate * 1.1)
+        return False
+
+    def observe_latency(self, url, seconds):
+        self._state(url).latencies.append(seconds)
+
+    @staticmethod
+    def _percentile(values, pct):
+        ordered = sorted(values)
+        return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+    def hedge_delay(self, url):
+        """이 시간 안에 응답이 없으면 같은 요청을 한 번 더 보낸다 (표본이 부족하면 None)"""
+        latencies = self._state(url).latencies
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return max(self._percentile(latencies, self.hedge_percentile), self.hedge_min_delay)
+
+    @staticmethod
+    def interleave(items, key=lambda item: item):
+        """호스트별로 묶은 뒤 라운드로빈으로 섞는다 (같은 호스트가 앞을 독차지하지 않도록)"""
+        groups = OrderedDict()
+        for item in items:
+            groups.setdefault(HostScheduler.host_of(key(item)), []).append(item)
+        ordered = []
+        queues = [iter(group) for group in groups.values()]
+        while queues:
+            remaining = []
+            for queue in queues:
+                item = next(queue, _END)
+                if item is not _END:
+                    ordered.append(item)
+                    remaining.append(queue)
+            queues = remaining
+        return ordered
+
+    def stats(self):
+        return {
+            host: {
+                'concurrency': state.policy['concurrency'],
+                'in_flight': state.in_flight,
+                'rate': round(state.bucket.rate, 3),
+                'backoff_remaining': round(max(state.backoff_until - time.monotonic(), 0.0), 1),
+                'p95_ms': round(self._percentile(state.latencies, 95) * 1000, 1) if state.latencies else None,
+            }
+            for host, state in self._hosts.items()
+        }
@@ -0,0 +1,160 @@
+"""같은 URL에 대한 동시 스크래핑을 하나로 합치는 single-flight"""
+import asyncio
+import functools
+import json
+import logging
+import time
+import uuid
+
+from cache import CachedFailure
+from deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# 토큰이 일치할 때만 락 해제 (만료 후 다른 워커가 잡은 락을 지우지 않도록)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 리더의 실패를 대기자에게도 같은 타입으로 넘길 예외 (그 밖의 실패는 RuntimeError)
+SHARED_ERRORS = {
+    'cached': (CachedFailure, lambda shared: CachedFailure(shared['error'])),
+    'deadline': (DeadlineExceeded, lambda shared: DeadlineExceeded(shared['stage'])),
+}
+
+
+def error_payload(error):
+    for kind, (error_type, _) in SHARED_ERRORS.items():
+        if isinstance(error, error_type):
+            return {'error': str(error), 'kind': kind, 'stage': getattr(error, 'stage', None)}
+    return {'error': str(error), 'kind': 'error'}
+
+
+def error_from_payload(shared):
+    _, build = SHARED_ERRORS.get(shared.get('kind'), (None, lambda shared: RuntimeError(shared['error'])))
+    return build(shared)
+
+
+class SingleFlight:
+    """프로세스 내: 진행 중인 키가 있으면 새로 실행하지 않고 그 결과를 기다린다"""
+
+    def __init__(self):
+        self._calls = {}
+        self._waiters = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, deadline=None):
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+
+        # 호출자 하나가 취소돼도 다른 대기자를 위해 작업은 계속하고,
+        # 마지막 대기자까지 떠나면 작업도 취소한다
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(task) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled():
+            task.exception()  # 대기자가 없어도 "never retrieved" 경고가 나지 않도록
+
+    def in_flight(self):
+        return len(self._calls)
+
+
+class RedisSingleFlight:
+    """여러 uvicorn 워커/컨테이너 사이: Redis 락을 잡은 리더만 실행하고 결과를 공유한다
+
+    대기자는 deadline 이 남은 동안만 리더를 기다리고, 그 뒤에는 직접 실행한다.
+    """
+
+    def __init__(self, redis_client, run_blocking, lock_ttl=120, result_ttl=60, poll_interval=0.2):
+        self.redis_client = redis_client
+        self.run_blocking = run_blocking
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.local = SingleFlight()
+
+    async def do(self, key, func, deadline=None):
+        # 같은 프로세스 안의 중복은 먼저 로컬에서 합친다
+        return await self.local.do(key, lambda: self._do_shared(key, func, deadline))
+
+    async def _do_shared(self, key, func, deadline=None):
+        lock_key = f"lock:{key}"
+        result_key = f"inflight:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.run_blocking(
+                functools.partial(self.redis_client.set, nx=True, px=int(self.lock_ttl * 1000)), lock_key, token
+            )
+        except Exception as e:
+            logger.error(f"락 획득 실패, 단독 실행: {e}")
+            return await func()
+        if acquired:
+            return await self._lead(func, lock_key, result_key, token)
+
+        timeout = self.lock_ttl if deadline is None else min(self.lock_ttl, deadline.remaining())
+        shared = await self._wait_for_leader(lock_key, result_key, timeout)
+        if shared is None:
+            # 리더가 결과를 남기지 못하고 사라졌거나 예산 안에 끝나지 않은 경우 직접 실행
+            logger.warning(f"공유 스크래핑 결과 없음, 직접 실행: {key}")
+            return await func()
+        if 'error' in shared:
+            raise error_from_payload(shared)
+        return tuple(shared['value']) if shared.get('tuple') else shared['value']
+
+    async def _lead(self, func, lock_key, result_key, token):
+        try:
+            await self.run_blocking(self.redis_client.delete, result_key)  # 이전 실행 결과 제거
+            result = await func()
+        except Exception as e:
+            await self._publish(result_key, error_payload(e))
+            raise
+        else:
+            await self._publish(result_key, {'value': result, 'tuple': isinstance(result, tuple)})
+            return result
+        finally:
+            try:
+                await self.run_blocking(self.redis_client.eval, RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                logger.error(f"락 해제 실패: {e}")
+
+    async def _publish(self, result_key, payload):
+        try:
+            await self.run_blocking(self.redis_client.setex, result_key, self.result_ttl, json.dumps(payload))
+        except Exception as e:
+            logger.error(f"공유 결과 저장 실패: {e}")
+
+    async def _wait_for_leader(self, lock_key, result_key, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            shared = await self.run_blocking(self.redis_client.get, result_key)
+            if shared:
+                return json.loads(shared)
+            if not await self.run_blocking(self.redis_client.exists, lock_key):
+                # 락 해제 직후 결과가 기록됐을 수 있으므로 한 번 더 확인
+                shared = await self.run_blocking(self.redis_client.get, result_key)
+                return json.loads(shared) if shared else None
+            await asyncio.sleep(self.poll_interval)
+        return None
@@ -0,0 +1,329 @@
+"""스크래핑 결과를 모아 회전하는 압축 JSONL / Parquet 파일로 내보내는 출력 싱크
+
+    python sinks.py export urls.txt [--out exports] [--format jsonl,parquet] [--concurrency 20]
+
+파일은 <prefix>-<시각>-<순번>.jsonl.gz / .parquet 이름으로 쓰고, 쓰는 중에는 .part 를
+붙여 두었다가 회전할 때 이름을 바꾼다 (다 쓴 파일만 읽히도록).
+"""
+import argparse
+import asyncio
+import gzip
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('url', 'domain', 'title', 'authors', 'publish_date', 'content', 'extractor', 'duplicate_of', 'scraped_at',
+          'timings')
+
+
+def to_record(url, result, spans=None):
+    """결과 dict → 내보내기 레코드 (timings 는 단계별 ms)"""
+    return {
+        'url': url,
+        'domain': urlparse(url).netloc.lower(),
+        'title': result.get('title'),
+        'authors': list(result.get('authors') or []),
+        'publish_date': result.get('publish_date'),
+        'content': result.get('content'),
+        'extractor': result.get('extractor'),
+        'duplicate_of': result.get('duplicate_of'),
+        'scraped_at': time.time(),
+        'timings': {stage: round(seconds * 1000, 3) for stage, seconds in (spans.durations if spans else {}).items()},
+    }
+
+
+class RotatingFile:
+    """레코드 수·바이트·경과 시간 중 하나라도 넘으면 새 파일로 넘어가는 기반 클래스"""
+
+    suffix = ''
+
+    def __init__(self, directory, prefix='articles', max_records=100_000, max_bytes=256 * 1024 * 1024,
+                 max_age=3600):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sequence = 0
+        self.path = None
+        self.records = 0
+        self.opened_at = 0.0
+        self.completed = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _next_path(self):
+        self.sequence += 1
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        return os.path.join(self.directory, f"{self.prefix}-{stamp}-{self.sequence:04d}{self.suffix}")
+
+    def write(self, records):
+        if not records:
+            return
+        if self.path is None:
+            self.path = self._next_path()
+            self.records = 0
+            self.opened_at = time.monotonic()
+            self._open(self.path + '.part')
+        self._write(records)
+        self.records += len(records)
+        if self.records >= self.max_records or self._size() >= self.max_bytes:
+            self.rotate()
+        else:
+            self.rotate_if_expired()
+
+    def rotate_if_expired(self):
+        if self.path is not None and time.monotonic() - self.opened_at >= self.max_age:
+            self.rotate()
+
+    def rotate(self):
+        if self.path is None:
+            return
+        self._close()
+        os.replace(self.path + '.part', self.path)
+        self.completed.append(self.path)
+        logger.info(f"내보내기 파일 완료: {self.path} ({self.records}건)")
+        self.path = None
+
+    def close(self):
+        self.rotate()
+
+
+class JSONLSink(RotatingFile):
+    suffix = '.jsonl.gz'
+
+    def __init__(self, directory, compresslevel=6, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.compresslevel = compresslevel
+        self._file = None
+        self._raw = None
+
+    def _open(self, path):
+        self._raw = open(path, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=self.compresslevel)
+
+    def _write(self, records):
+        self._file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8'))
+        self._file.flush()  # 동기화 지점까지 압축해 두어 비정상 종료 시에도 앞부분은 읽을 수 있도록
+
+    def _size(self):
+        return self._raw.tell()
+
+    def _close(self):
+        self._file.close()
+        self._raw.close()
+
+
+class ParquetSink(RotatingFile):
+    """배치 하나가 row group 하나 (pyarrow 필요)"""
+
+    suffix = '.parquet'
+
+    def __init__(self, directory, compression='zstd', **kwargs):
+        self.require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        super().__init__(directory, **kwargs)
+        self._pa, self._pq = pa, pq
+        self.compression = compression
+        self.schema = pa.schema([
+            ('url', pa.string()),
+            ('domain', pa.string()),
+            ('title', pa.string()),
+            ('authors', pa.list_(pa.string())),
+            ('publish_date', pa.string()),
+            ('content', pa.string()),
+            ('extractor', pa.string()),
+            ('duplicate_of', pa.string()),
+            ('scraped_at', pa.timestamp('ms', tz='UTC')),
+            ('timings', pa.map_(pa.string(), pa.float64())),
+        ])
+        self._writer = None
+        self._path = None
+
+    @staticmethod
+    def require_pyarrow():
+        if importlib.util.find_spec('pyarrow') is None:
+            raise RuntimeError("Parquet 내보내기에는 pyarrow 가 필요합니다 (pip install pyarrow)")
+
+    def _open(self, path):
+        self._path = path
+        self._writer = self._pq.ParquetWriter(path, self.schema, compression=self.compression)
+
+    def _write(self, records):
+        columns = {field: [record.get(field) for record in records] for field in FIELDS}
+        columns['scraped_at'] = [int(ts * 1000) if ts else None for ts in columns['scraped_at']]
+        columns['publish_date'] = [str(value) if value is not None else None for value in columns['publish_date']]
+        columns['timings'] = [list((value or {}).items()) for value in columns['timings']]
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _size(self):
+        return os.path.getsize(self._path)
+
+    def _close(self):
+        self._writer.close()
+
+
+SINK_TYPES = {'jsonl': JSONLSink, 'parquet': ParquetSink}
+
+
+def check_formats(formats):
+    """형식 이름과 필요한 패키지를 확인해 그대로 돌려준다 (설정 오류를 첫 내보내기 전에 알 수 있도록)"""
+    formats = [name.strip() for name in formats]
+    unknown = set(formats) - set(SINK_TYPES)
+    if unknown:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {', '.join(sorted(unknown))}")
+    if 'parquet' in formats:
+        ParquetSink.require_pyarrow()
+    return formats
+
+
+def make_sinks(directory, formats=('jsonl',), **kwargs):
+    return [SINK_TYPES[name](directory, **kwargs) for name in check_formats(formats)]
+
+
+class BufferedExporter:
+    """레코드를 메모리에 모았다가 flush_records 건 또는 flush_interval 초마다 스레드에서 파일에 쓴다
+
+    싱크에 쓰지 못한 레코드는 그 싱크 몫으로 남겨 두었다가 다음 flush 에서 다시 쓴다 (이미 쓴 싱크에는
+    중복으로 쓰지 않는다). 싱크당 max_unsent 건을 넘으면 오래된 것부터 버린다.
+    """
+
+    def __init__(self, sinks, flush_records=500, flush_interval=5.0, max_unsent=100_000):
+        self.sinks = sinks
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.max_unsent = max_unsent
+        self.written = 0      # 모든 싱크에 쓴 레코드 수
+        self._buffer = []
+        self._unsent = [[] for _ in sinks]
+        self._lock = None
+        self._timer = None
+
+    async def add(self, record):
+        self._buffer.append(record)
+        if self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_periodically())
+        if len(self._buffer) >= self.flush_records:
+            await self.flush()
+
+    async def _run_on_sinks(self, method, *args):
+        # 파일 쓰기/압축은 블로킹이므로 이벤트 루프 밖에서, 싱크마다 순서대로
+        self._lock = self._lock or asyncio.Lock()
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            for sink in self.sinks:
+                await loop.run_in_executor(None, getattr(sink, method), *args)
+
+    async def flush(self):
+        records, self._buffer = self._buffer, []
+        if not records and not any(self._unsent):
+            return
+        self._lock = self._lock or asyncio.Lock()
+        error = None
+        async with self._lock:
+            for unsent in self._unsent:
+                unsent.extend(records)
+                if len(unsent) > self.max_unsent:
+                    logger.error(f"내보내기 밀린 레코드 {len(unsent) - self.max_unsent}건 버림")
+                    del unsent[:len(unsent) - self.max_unsent]
+            outstanding = max(map(len, self._unsent))
+            loop = asyncio.get_running_loop()
+            for sink, unsent in zip(self.sinks, self._unsent):
+                if not unsent:
+                    continue
+                try:
+                    await loop.run_in_executor(None, sink.write, list(unsent))
+                except Exception as e:
+                    error = e
+                    continue
+                unsent.clear()
+            self.written += outstanding - max(map(len, self._unsent))
+        if error is not None:
+            raise error
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                await self._run_on_sinks('rotate_if_expired')
+            except Exception as e:
+                logger.error(f"내보내기 실패: {e}")
+
+    async def rotate(self):
+        """버퍼를 비우고 쓰던 파일을 모두 닫아 완성된 파일로 만든다"""
+        await self.flush()
+        await self._run_on_sinks('rotate')
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        await self._run_on_sinks('close')
+
+    def files(self):
+        return [path for sink in self.sinks for path in sink.completed]
+
+
+def read_urls(path):
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    with handle:
+        return [line.strip() for line in handle if line.strip() and not line.startswith('#')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="URL 목록을 스크래핑해 JSONL/Parquet 으로 내보내기")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("urls", help="URL 목록 파일 (한 줄에 하나, - 이면 표준 입력)")
+    parser.add_argument("--out", default=os.getenv("EXPORT_DIR", "exports"))
+    parser.add_argument("--format", default="jsonl", help="jsonl,parquet")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--skip-cache", action="store_true")
+    args = parser.parse_args()
+
+    from article_scraper import ArticleScraper
+    from metrics import Spans
+    from scheduler import HostScheduler
+
+    urls = read_urls(args.urls)
+
+    async def run():
+        scraper = ArticleScraper(headless=True)
+        exporter = BufferedExporter(make_sinks(args.out, args.format.split(',')))
+        slots = asyncio.Semaphore(args.concurrency)
+        failed = 0
+
+        async def one(url):
+            nonlocal failed
+            async with slots:
+                spans = Spans()
+                try:
+                    result, _ = await scraper.extract_with_cache_status(
+                        url, use_cache=not args.skip_cache, spans=spans)
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"스크래핑 실패 {url}: {e}")
+                    return
+                if result and result.get('content'):
+                    await exporter.add(to_record(url, result, spans))
+
+        try:
+            await asyncio.gather(*(one(url) for url in HostScheduler.interleave(urls)))
+        finally:
+            await exporter.close()
+            await scraper.fetcher.aclose()
+        logger.info(f"내보내기 완료: {exporter.written}건, 실패 {failed}건 → {', '.join(exporter.files())}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
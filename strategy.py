@@ -0,0 +1,118 @@
+"""도메인별로 어떤 추출 경로가 유효한 본문을 냈는지 학습하는 전략 테이블 (Redis 영속화)"""
+import threading
+
+from redis_backed import RedisBacked
+
+# 기본 순서: 이미 받은 HTML로 가능한 경로 → 브라우저 렌더링 → 재요청
+DEFAULT_ORDER = ('static', 'readability', 'js', 'newspaper')
+
+
+class StrategyTable(RedisBacked):
+    redis_label = '추출 전략'
+    local_fallback = '로컬 통계만 사용'
+
+    def __init__(self, redis_client=None, seeds=None, min_samples=3, min_win_rate=0.8,
+                 ttl=7 * 24 * 3600, refresh_interval=300, error_backoff=30):
+        super().__init__(redis_client, error_backoff, refresh_interval)
+        self.seeds = seeds or {}          # 도메인 -> 초기 우선 경로 (fast_extract_domains 등)
+        self.min_samples = min_samples
+        self.min_win_rate = min_win_rate
+        self.ttl = ttl
+        self._stats = {}                  # 도메인 -> {경로: {'wins', 'attempts', 'ms'}}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(domain):
+        return f"strategy:{domain}"
+
+    def _load(self, domain):
+        """다른 워커/컨테이너가 학습한 값을 Redis에서 주기적으로 가져온다"""
+        if not self._refresh_due(domain):
+            return
+        try:
+            raw = self.redis.hgetall(self._key(domain))
+        except Exception as e:
+            self._redis_failed('조회', e)
+            return
+        stats = {}
+        for field, value in raw.items():
+            path, _, metric = field.partition(':')
+            stats.setdefault(path, {'wins': 0, 'attempts': 0, 'ms': 0.0})[metric] = float(value)
+        if stats:
+            with self._lock:
+                self._stats[domain] = stats
+
+    def record(self, domain, path, success, elapsed_ms):
+        with self._lock:
+            entry = self._stats.setdefault(domain, {}).setdefault(path, {'wins': 0, 'attempts': 0, 'ms': 0.0})
+            entry['attempts'] += 1
+            entry['wins'] += int(success)
+            entry['ms'] += elapsed_ms
+        if not self._redis_available():
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(self._key(domain), f"{path}:attempts", 1)
+            pipe.hincrby(self._key(domain), f"{path}:wins", int(success))
+            pipe.hincrbyfloat(self._key(domain), f"{path}:ms", round(elapsed_ms, 2))
+            pipe.expire(self._key(domain), self.ttl)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed('저장', e)
+
+    def snapshot(self, domain):
+        """도메인 통계 사본 (추출 프로세스 풀 워커에 넘긴다)"""
+        self._load(domain)
+        with self._lock:
+            return {path: dict(entry) for path, entry in self._stats.get(domain, {}).items()}
+
+    def restore(self, domain, stats):
+        with self._lock:
+            self._stats[domain] = stats
+
+    def _seed(self, domain):
+        for site, path in self.seeds.items():
+            if domain == site or domain.endswith('.' + site):
+                return path
+        return None
+
+    def _pick(self, stats):
+        """충분한 표본에서 성공률이 높은 경로 중 평균 소요 시간이 가장 짧은 것"""
+        candidates = []
+        for path, entry in stats.items():
+            if entry['attempts'] >= self.min_samples and entry['wins'] / entry['attempts'] >= self.min_win_rate:
+                candidates.append((entry['ms'] / entry['attempts'], path))
+        return min(candidates)[1] if candidates else None
+
+    def winner(self, domain):
+        self._load(domain)
+        with self._lock:
+            stats = {path: dict(entry) for path, entry in self._stats.get(domain, {}).items()}
+        return self._pick(stats) or self._seed(domain)
+
+    def order(self, domain):
+        winner = self.winner(domain)
+        if winner in DEFAULT_ORDER:
+            return (winner,) + tuple(path for path in DEFAULT_ORDER if path != winner)
+        return DEFAULT_ORDER
+
+    def stats(self):
+        with self._lock:
+            snapshot = {
+                domain: {path: dict(entry) for path, entry in paths.items()}
+                for domain, paths in self._stats.items()
+            }
+        return {
+            domain: {
+                'winner': self._pick(paths) or self._seed(domain),
+                'paths': {
+                    path: {
+                        'win_rate': round(entry['wins'] / entry['attempts'], 3) if entry['attempts'] else 0.0,
+                        'attempts': int(entry['attempts']),
+                        'avg_ms': round(entry['ms'] / entry['attempts'], 1) if entry['attempts'] else 0.0,
+                    }
+                    for path, entry in paths.items()
+                },
+            }
+            for domain, paths in snapshot.items()
+        }
@@ -0,0 +1,75 @@
+"""API 테스트 - /scrape-multiple 배치/스트리밍 응답 (스크래핑은 대역으로 대체, 네트워크 불필요)
+
+    python -m pytest test_api.py   또는   python test_api.py
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def extract_with_cache_status(url, use_cache=None, spans=None, deadline=None):
+        # URL 끝의 숫자(ms)만큼 걸린다 - 끝나는 순서가 요청 순서와 다르도록
+        delay = url.rsplit("/", 1)[-1]
+        await asyncio.sleep(int(delay) / 1000 if delay.isdigit() else 0)
+        if "fail" in url:
+            raise RuntimeError("추출 실패")
+        return {"title": "제목", "content": f"{url} 본문"}, "bypass"
+
+    async def prefetch_cache(urls):
+        return 0
+
+    monkeypatch.setattr(main.scraper, "extract_with_cache_status", extract_with_cache_status)
+    monkeypatch.setattr(main.scraper, "prefetch_cache", prefetch_cache)
+    return TestClient(main.app)
+
+
+class BrokenExporter:
+    async def add(self, record):
+        raise OSError("디스크 가득 참")
+
+
+def test_export_failure_does_not_fail_the_batch(client, monkeypatch):
+    monkeypatch.setattr(main, "get_exporter", lambda: BrokenExporter())
+    urls = ["https://a.example.com/1", "https://b.example.com/fail", "https://c.example.com/2"]
+
+    response = client.post("/scrape-multiple?export=true", json={"urls": urls})
+    assert response.status_code == 200
+    assert [item["success"] for item in response.json()] == [True, False, True]
+
+
+def test_ndjson_stream_yields_each_result_as_it_completes(client):
+    urls = ["https://a.example.com/300", "https://b.example.com/fail", "https://c.example.com/100"]
+
+    with client.stream("POST", "/scrape-multiple?stream=ndjson", json={"urls": urls}) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.iter_lines() if line]
+
+    # 느린 a 를 기다리지 않고 끝난 순서대로, 요청 순서는 index 로
+    assert [record["index"] for record in records] == [1, 2, 0]
+    assert [record["url"] for record in records] == [urls[1], urls[2], urls[0]]
+    assert [record["success"] for record in records] == [False, True, True]
+    assert records[1]["data"]["content"] == f"{urls[2]} 본문"
+
+
+def test_sse_stream_ends_with_cache_summary(client):
+    urls = ["https://a.example.com/20", "https://b.example.com/10"]
+
+    response = client.post("/scrape-multiple?stream=sse", json={"urls": urls})
+    events = [chunk for chunk in response.text.split("\n\n") if chunk]
+    assert [event.split("\n")[0] for event in events] == ["event: result", "event: result", "event: done"]
+    assert json.loads(events[-1].split("data: ", 1)[1]) == {"hit": 0, "revalidated": 0, "miss": 0, "bypass": 2}
+
+
+def test_unknown_stream_format_is_rejected(client):
+    response = client.post("/scrape-multiple?stream=xml", json={"urls": ["https://a.example.com/1"]})
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,98 @@
+"""브라우저 풀 테스트 (Chrome 불필요, 가짜 드라이버)
+
+    python -m pytest test_browser_pool.py   또는   python test_browser_pool.py
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.cookies = {"session": "1"}
+        self.url = None
+        self.quit_called = False
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+
+    def close(self):
+        self.window_handles.pop()
+
+    def execute_script(self, script):
+        pass
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_lease_reuses_and_resets_driver():
+    pool = BrowserPool(FakeDriver, size=1)
+    with pool.lease() as first:
+        first.window_handles.append("popup")
+        first.get("https://news.example.com/a/1")
+    with pool.lease() as second:
+        pass
+
+    # 같은 드라이버를 다시 빌려주되 탭/쿠키/페이지는 정리된 상태
+    assert second is first
+    assert first.window_handles == ["main"] and first.cookies == {} and first.url == "about:blank"
+    assert pool.stats()["created"] == 1 and pool.stats()["leases"] == 2
+
+
+def test_driver_is_recycled_after_max_pages_and_replaced_on_crash():
+    pool = BrowserPool(FakeDriver, size=1, max_pages=2)
+    drivers = []
+    for _ in range(2):
+        with pool.lease() as driver:
+            drivers.append(driver)
+    with pool.lease() as driver:
+        drivers.append(driver)
+    assert drivers[0] is drivers[1] and drivers[2] is not drivers[0]
+    assert drivers[0].quit_called
+
+    with pytest.raises(WebDriverException):
+        with pool.lease() as crashed:
+            raise WebDriverException("chrome not reachable")
+    with pool.lease() as driver:
+        assert driver is not crashed and crashed.quit_called
+    stats = pool.stats()
+    assert stats["recycled"] == 1 and stats["crashes"] == 1 and stats["created"] == 1
+
+
+def test_concurrent_returns_after_shrink_keep_pool_at_size():
+    pool = BrowserPool(FakeDriver, size=3)
+    leases = [pool.lease() for _ in range(3)]
+    for lease in leases:
+        lease.__enter__()
+    pool.resize(2)
+
+    # 동시에 반납해도 넘치는 몫(1개)만 종료
+    threads = [threading.Thread(target=lease.__exit__, args=(None, None, None)) for lease in leases]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.stats()["created"] == 2 and pool.stats()["idle"] == 2
+
+
+def test_lease_times_out_when_pool_is_busy():
+    pool = BrowserPool(FakeDriver, size=1, lease_timeout=0.05)
+    with pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease():
+                pass
+    assert pool.stats()["lease_timeouts"] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
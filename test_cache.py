@@ -0,0 +1,117 @@
+"""기사 캐시 테스트 (Redis 불필요)
+
+    python -m pytest test_cache.py   또는   python test_cache.py
+"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+import redis
+
+from cache import ArticleCache, LocalLRU, compress, decompress, dumps_entry
+
+
+class AsyncDictRedis:
+    """ArticleCache 가 쓰는 명령만 가진 비동기 Redis 대역"""
+
+    def __init__(self, fail=False):
+        self.data = {}
+        self.calls = []
+        self.fail = fail
+
+    async def mget(self, keys):
+        self.calls.append(("mget", len(keys)))
+        if self.fail:
+            raise redis.ConnectionError("연결 거부")
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class _Pipeline:
+    def __init__(self, redis_):
+        self.redis = redis_
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value))
+
+    async def execute(self):
+        self.redis.calls.append(("pipeline", len(self.ops)))
+        for key, value in self.ops:
+            self.redis.data[key] = value
+
+
+def article_entry(text="한국어 기사 본문 " * 100):
+    return {"result": {"title": "제목", "content": text}, "fresh_until": time.time() + 60}
+
+
+def test_local_lru_evicts_by_count_bytes_and_ttl():
+    lru = LocalLRU(max_entries=2, max_bytes=100, ttl=60)
+    lru.put("a", 1, 10)
+    lru.put("b", 2, 10)
+    assert lru.get("a") == 1          # a 가 최근 사용으로 이동
+    lru.put("c", 3, 10)
+    assert lru.get("b") is None       # 가장 오래 안 쓴 b 제거
+    lru.put("d", 4, 95)
+    assert lru.stats()["entries"] == 1 and lru.get("d") == 4
+    lru.put("e", 5, 10, ttl=0)
+    assert lru.get("e") is None
+
+
+def test_codec_roundtrip_and_legacy_json():
+    entry = article_entry()
+    raw = dumps_entry(entry)
+    assert json.loads(decompress(compress(raw))) == entry
+    assert len(compress(raw)) < len(json.dumps(entry)) / 5
+    legacy = json.dumps({"title": "x"}).encode()
+    assert json.loads(decompress(legacy)) == {"title": "x"}
+
+
+def test_batch_reads_use_one_mget_and_writes_are_pipelined():
+    async def run():
+        backend = AsyncDictRedis()
+        cache = ArticleCache(backend, LocalLRU(max_entries=10))
+        await asyncio.gather(*(cache.put(f"k{i}", article_entry(), timedelta(hours=1)) for i in range(5)))
+        assert backend.calls == [("pipeline", 5)]
+
+        cold = ArticleCache(backend, LocalLRU(max_entries=10))
+        found = await cold.get_many([f"k{i}" for i in range(5)] + ["missing"])
+        assert len(found) == 5 and backend.calls[-1] == ("mget", 6)
+
+        # 두 번째 조회는 로컬 LRU 에서 끝난다
+        await cold.get("k3")
+        assert backend.calls[-1] == ("mget", 6)
+
+    asyncio.run(run())
+
+
+def test_redis_failure_backs_off():
+    async def run():
+        backend = AsyncDictRedis(fail=True)
+        cache = ArticleCache(backend, error_backoff=30)
+        assert await cache.get("a") is None
+        assert await cache.get("b") is None
+        assert backend.calls == [("mget", 1)]
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
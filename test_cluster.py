@@ -0,0 +1,166 @@
+"""클러스터 모드 테스트 (uvicorn 복제본 여러 개 + RESP 로 띄운 FakeRedis + 로컬 스텁 서버, 외부 네트워크 불필요)
+
+    python -m pytest test_cluster.py   또는   python test_cluster.py
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+from benchmarks.stub_server import StubServer
+from cluster import HashRing, cluster_key
+from fake_redis import RespServer
+
+PAGE = ("<html><head><meta charset='utf-8'><meta property='og:title' content='예산안 의결'>"
+        "<title>예산안 의결 - 뉴스</title></head><body><article><p>"
+        + "정부는 오늘 국무회의에서 내년도 예산안을 의결했다. " * 30 + "</p></article></body></html>").encode("utf-8")
+
+
+def test_ring_moves_only_departed_nodes_keys():
+    keys = [f"news{i}.example.com" for i in range(2000)]
+    before = HashRing(["a", "b", "c", "d"])
+    after = HashRing(["a", "b", "c"])
+    owners = {key: before.owner(key) for key in keys}
+
+    moved = [key for key in keys if after.owner(key) != owners[key]]
+    assert all(owners[key] == "d" for key in moved)      # 남은 노드끼리는 도메인을 주고받지 않음
+    assert 0.15 < len(moved) / len(keys) < 0.35          # 대략 1/4
+    assert cluster_key("https://WWW.Chosun.com/a") == cluster_key("https://chosun.com/b") == "chosun.com"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Replica:
+    def __init__(self, node_id, redis_port, **extra_env):
+        self.node_id = node_id
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        env = dict(
+            os.environ,
+            REDIS_HOST="127.0.0.1", REDIS_PORT=str(redis_port),
+            CLUSTER_MODE="1", CLUSTER_NODE_ID=node_id, CLUSTER_ADVERTISE=self.url,
+            CLUSTER_HEARTBEAT="0.2", CLUSTER_NODE_TTL="1.5", **extra_env,
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(self.port), "--log-level", "warning"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def get(self, path, **params):
+        return httpx.get(self.url + path, params=params, timeout=30)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(10)
+
+
+def wait_for_members(replicas, count, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if all(len(r.get("/health/cluster").json()["members"]) == count for r in replicas):
+                return
+        except httpx.HTTPError:
+            pass  # 아직 기동 중
+        time.sleep(0.2)
+    raise AssertionError(f"클러스터 멤버가 {count}개가 되지 않음")
+
+
+def hosts_by_replica(replicas):
+    return {r.node_id: set(r.get("/health/hosts").json()) for r in replicas}
+
+
+@contextmanager
+def running_cluster(**extra_env):
+    with RespServer() as redis_server:
+        stubs = [StubServer({f"/article/{i}": PAGE for i in range(20)}).start() for _ in range(6)]
+        replicas = [Replica(f"node-{i}", redis_server.port, **extra_env) for i in range(3)]
+        try:
+            wait_for_members(replicas, 3)
+            yield replicas, stubs
+        finally:
+            for replica in replicas:
+                if replica.process.poll() is None:
+                    replica.stop()
+            for stub in stubs:
+                stub.stop()
+
+
+@pytest.fixture
+def cluster():
+    with running_cluster() as running:
+        yield running
+
+
+@pytest.fixture
+def shared_inflight_cluster():
+    with running_cluster(SHARED_INFLIGHT="1") as running:
+        yield running
+
+
+def test_domains_are_scraped_only_by_their_owner(cluster):
+    replicas, stubs = cluster
+    ring = HashRing([r.node_id for r in replicas])
+
+    for i, replica in enumerate(replicas):
+        for stub in stubs:
+            response = replica.get("/scrape", url=f"{stub.base_url}/article/{i}")
+            assert response.status_code == 200
+            assert response.json()["title"] == "예산안 의결"
+
+    # 호스트별 스케줄러 상태(= 그 도메인에 요청을 보낸 노드)는 담당 노드에만 있다
+    hosts = hosts_by_replica(replicas)
+    for stub in stubs:
+        netloc = cluster_key(stub.base_url)
+        assert [node for node, seen in hosts.items() if netloc in seen] == [ring.owner(netloc)]
+    forwarded = sum(r.get("/health/cluster").json()["forwarded"] for r in replicas)
+    assert forwarded == sum(1 for r in replicas for stub in stubs if ring.owner(cluster_key(stub.base_url)) != r.node_id)
+
+    # 노드 하나가 빠지면 그 노드의 도메인만 남은 노드로 옮겨간다
+    gone, survivors = replicas[-1], replicas[:-1]
+    gone.stop()
+    wait_for_members(survivors, 2)
+    ring = HashRing([r.node_id for r in survivors])
+    before = hosts_by_replica(survivors)
+    for stub in stubs:
+        response = survivors[0].get("/scrape", url=f"{stub.base_url}/article/10")
+        assert response.status_code == 200
+
+    after = hosts_by_replica(survivors)
+    for stub in stubs:
+        netloc = cluster_key(stub.base_url)
+        owner = ring.owner(netloc)
+        assert netloc in after[owner]
+        for node in after:
+            if node != owner:
+                assert (netloc in after[node]) == (netloc in before[node])  # 새로 요청을 보낸 건 담당 노드뿐
+
+
+def test_forwarding_with_shared_inflight_does_not_wait_on_own_lock(shared_inflight_cluster):
+    replicas, stubs = shared_inflight_cluster
+    ring = HashRing([r.node_id for r in replicas])
+
+    # 맡긴 노드의 락이 담당 노드의 같은 URL 스크래핑을 막으면 예산(기본 30초)이 다 지나야 응답이 온다
+    for i, replica in enumerate(replicas):
+        stub = next(s for s in stubs if ring.owner(cluster_key(s.base_url)) != replica.node_id)
+        start = time.monotonic()
+        response = replica.get("/scrape", url=f"{stub.base_url}/article/{i}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "예산안 의결"
+        assert time.monotonic() - start < 5
+    forwarded = sum(r.get("/health/cluster").json()["forwarded"] for r in replicas)
+    assert forwarded == len(replicas)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,130 @@
+"""시간 예산 / 헤지 요청 / 지터 재시도 테스트 (네트워크/Redis 불필요)
+
+    python -m pytest test_deadline.py   또는   python test_deadline.py
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import article_scraper
+from article_scraper import ArticleScraper
+from deadline import Deadline, DeadlineExceeded
+from fetcher import FetchResult
+
+PAGE = ("<html><head><meta charset='utf-8'><meta property='og:title' content='예산안 의결'>"
+        "<title>예산안 의결 - 뉴스</title></head><body><article><p>"
+        + "정부는 오늘 국무회의에서 내년도 예산안을 의결했다. " * 30 + "</p></article></body></html>")
+
+
+class ScriptedFetcher:
+    """호출 순서대로 (지연 초, 예외 또는 None) 를 적용하는 페처"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def fetch(self, url, headers=None, connect_timeout=None, read_timeout=None):
+        delay, error = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return FetchResult(url=url, status_code=200, content=PAGE.encode("utf-8"), encoding="utf-8")
+
+    async def aclose(self):
+        pass
+
+
+def make_scraper(fetcher):
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    scraper.fetcher = fetcher
+    return scraper
+
+
+def test_slow_request_is_hedged_after_host_p95():
+    async def run():
+        fetcher = ScriptedFetcher((2.0, None), (0.0, None))
+        scraper = make_scraper(fetcher)
+        url = "https://news.example.com/a/1"
+        for _ in range(20):
+            scraper.scheduler.observe_latency(url, 0.02)
+        start = time.monotonic()
+        response = await scraper.fetch_politely(url, deadline=Deadline(10))
+        return fetcher.calls, time.monotonic() - start, response
+
+    calls, elapsed, response = asyncio.run(run())
+    assert calls == 2 and elapsed < 1.0
+    assert response.status_code == 200
+
+
+def test_connection_errors_are_retried_within_budget(monkeypatch):
+    monkeypatch.setattr(article_scraper, "jittered_backoff", lambda attempt: 0.01)
+
+    async def run(fetcher, budget):
+        scraper = make_scraper(fetcher)
+        return await scraper.fetch_politely("https://news.example.com/a/2", deadline=Deadline(budget))
+
+    response = asyncio.run(run(ScriptedFetcher((0.0, httpx.ConnectError("거부")), (0.0, None)), 10))
+    assert response.requests == 2
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run(ScriptedFetcher((5.0, None)), 0.5))
+    assert time.monotonic() - start < 1.0
+
+
+def test_queue_wait_for_host_slot_does_not_use_budget():
+    deadline = Deadline(1, start=False)
+    time.sleep(0.2)
+    assert deadline.remaining() == pytest.approx(1)
+    deadline.start()
+    assert deadline.remaining(0.5) <= 0.5
+
+
+def test_out_of_time_returns_partial_result(monkeypatch):
+    scraper = make_scraper(ScriptedFetcher((0.0, None)))
+    url = "https://news.example.com/a/3"
+    response = FetchResult(url=url, status_code=200, content=PAGE.encode("utf-8"), encoding="utf-8")
+
+    # 예산이 이미 끝났으면 파싱 없이 제목만
+    expired = Deadline(0)
+    result = scraper.extract_from_response(response, url, deadline=expired)
+    assert result["partial"] and result["deadline_stage"] == "extract"
+    assert result["title"] == "예산안 의결" and result["content"] == ""
+
+    # 한 단계가 끝나지 않으면 기다리지 않고 응답 앞부분의 제목만
+    monkeypatch.setattr(scraper, "extract_from_response", lambda *args: time.sleep(1))
+    scraper.extract_grace = 0.1
+
+    async def run():
+        return await scraper._extract_async(response, url, 3, article_scraper.Spans(), Deadline(0.1))
+
+    result = asyncio.run(run())
+    assert result == {**result, "partial": True, "deadline_stage": "extract", "title": "예산안 의결", "content": ""}
+
+
+def test_abandoned_extraction_keeps_its_own_spans(monkeypatch):
+    scraper = make_scraper(ScriptedFetcher((0.0, None)))
+    url = "https://news.example.com/a/4"
+    response = FetchResult(url=url, status_code=200, content=PAGE.encode("utf-8"), encoding="utf-8")
+
+    def slow_extract(response, url, retry, spans, deadline):
+        time.sleep(0.3)
+        spans.add("parse", 0.3)
+
+    monkeypatch.setattr(scraper, "extract_from_response", slow_extract)
+    scraper.extract_grace = 0.05
+    spans = article_scraper.Spans()
+
+    async def run():
+        return await scraper._extract_async(response, url, 3, spans, Deadline(0.05))
+
+    assert asyncio.run(run())["partial"]
+    time.sleep(0.4)  # 버려진 추출이 끝난 뒤에도 호출한 쪽의 spans 는 그대로
+    assert "parse" not in spans.durations
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
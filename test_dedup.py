@@ -0,0 +1,100 @@
+"""전재 기사 중복 탐지 테스트 (FakeRedis, 네트워크 불필요)
+
+    python -m pytest test_dedup.py   또는   python test_dedup.py
+"""
+import asyncio
+
+from article_scraper import ArticleScraper
+from dedup import Deduplicator, signature, similarity
+from fake_redis import FakeRedis
+from fetcher import FetchResult
+
+WIRE = ("정부는 오늘 국무회의에서 내년도 예산안을 의결했다. 총지출은 올해보다 3.2% 늘어난 규모로, "
+        "복지와 연구개발 분야에 중점을 뒀다. 기획재정부는 재정 건전성을 유지하면서도 민생 회복을 "
+        "지원하겠다고 밝혔다. 야당은 세수 부족 상황에서 지출 확대가 적절한지 따져보겠다는 입장이다. ") * 4
+COPY = "(서울=연합뉴스) 홍길동 기자 = " + WIRE + " <저작권자(c) 연합뉴스, 무단 전재-재배포 금지>"
+OTHER = ("프로야구 개막전에서 홈팀이 연장 접전 끝에 승리했다. 선발 투수는 7이닝 무실점으로 호투했고, "
+         "4번 타자는 결승 홈런을 포함해 3안타를 기록했다. 감독은 시즌 목표로 가을야구 진출을 꼽았다. ") * 4
+
+
+def test_signature_separates_wire_copies_from_other_articles():
+    original = signature(WIRE)
+    assert similarity(original, signature(COPY)) >= 0.8
+    assert similarity(original, signature(OTHER)) < 0.2
+
+
+def test_index_is_shared_between_workers_through_redis():
+    redis_client = FakeRedis()
+    first, second = Deduplicator(redis_client), Deduplicator(redis_client)
+
+    assert first.check("https://www.yna.co.kr/view/1", WIRE) is None
+    assert first.check("https://www.yna.co.kr/view/1", WIRE) is None   # 같은 URL 재수집은 중복 아님
+    assert second.check("https://news.example.com/a/1", COPY) == "https://www.yna.co.kr/view/1"
+    assert second.check("https://news.example.com/b/2", OTHER) is None
+
+    # 한 번 찾은 원문은 로컬 인덱스에 올라와 Redis 없이도 찾는다
+    second.redis = None
+    assert second.check("https://other.example.com/a/3", COPY) == "https://www.yna.co.kr/view/1"
+    assert second.stats() == {"indexed": 2, "checked": 3, "duplicates": 2}
+
+
+def page(url, text):
+    html = f"<html><head><meta charset='utf-8'><title>예산안</title></head><body><article><p>{text}</p></article></body></html>"
+    return FetchResult(url=url, status_code=200, content=html.encode("utf-8"), encoding="utf-8")
+
+
+def test_pooled_extractions_share_the_parent_index():
+    scraper = ArticleScraper(cache_enabled=False, extraction_processes=2, redis_client=None)
+    urls = ["https://www.yna.co.kr/view/1", "https://news.example.com/a/1", "https://news.example.com/b/2"]
+
+    async def run():
+        results = []
+        for url, text in zip(urls, [WIRE, COPY, OTHER]):
+            results.append(await scraper._extract_async(page(url, text), url, 3, None))
+        return results
+    try:
+        original, duplicate, other = asyncio.run(run())
+    finally:
+        scraper.extraction_pool.close()
+
+    # 워커마다 따로 색인하지 않고 부모의 인덱스(/health/cache)에서 찾는다
+    assert original["duplicate_of"] is None and other["duplicate_of"] is None
+    assert duplicate["duplicate_of"] == "https://www.yna.co.kr/view/1"
+    assert scraper.dedup.stats() == {"indexed": 2, "checked": 3, "duplicates": 1}
+
+
+def test_duplicate_is_cached_without_body_and_resolved_from_original():
+    scraper = ArticleScraper(cache_enabled=False, store_duplicate_content=False, redis_client=None)
+
+    def extract(url, text):
+        return scraper.extract_from_response(page(url, text), url)
+
+    original = extract("https://www.yna.co.kr/view/1", WIRE)
+    duplicate = extract("https://news.example.com/a/1", COPY)
+    assert original["duplicate_of"] is None
+    assert duplicate["duplicate_of"] == "https://www.yna.co.kr/view/1"
+
+    entries = {}
+
+    async def cache_get(key):
+        return entries.get(key)
+
+    scraper._cache_get = cache_get
+    original_key = scraper._get_cache_key("https://www.yna.co.kr/view/1")
+
+    # 원문이 캐시에 없거나 네거티브 항목이면 포인터만 남기지 않고 본문째 저장
+    assert asyncio.run(scraper._stored_result(duplicate)) is duplicate
+    entries[original_key] = {"result": None, "negative": "error"}
+    assert asyncio.run(scraper._stored_result(duplicate)) is duplicate
+
+    entries[original_key] = {"result": original}
+    stored = asyncio.run(scraper._stored_result(duplicate))
+    assert stored["content"] is None and asyncio.run(scraper._stored_result(original)) is original
+    assert asyncio.run(scraper._resolve_duplicate(stored))["content"] == original["content"]
+    entries.clear()
+    assert asyncio.run(scraper._resolve_duplicate(stored)) is None
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
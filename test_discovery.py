@@ -0,0 +1,123 @@
+"""기사 탐색기 테스트 (FakeRedis + 로컬 스텁 서버, 외부 네트워크 불필요)
+
+    python -m pytest test_discovery.py   또는   python test_discovery.py
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from article_scraper import ArticleScraper
+from benchmarks.stub_server import StubServer
+from discovery import Discovery, FeedState, RedisBloomFilter, parse_feed
+from fake_redis import FakeRedis
+from jobs import JobQueue, QUEUE_KEY
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>news</title>
+<item><title>a</title><link>https://news.example.com/a/1</link><pubDate>Fri, 10 Jan 2025 09:00:00 +0900</pubDate></item>
+<item><title>b</title><link>https://news.example.com/a/2</link><pubDate>Fri, 10 Jan 2025 08:00:00 +0900</pubDate></item>
+<item><title>c</title><link>https://news.example.com/a/3#comments</link><pubDate>Fri, 10 Jan 2025 07:00:00 +0900</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<entry><link rel="alternate" href="https://news.example.com/atom/1"/><updated>2025-01-10T09:00:00Z</updated></entry>
+</feed>"""
+
+NEWS_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+<url><loc>https://news.example.com/s/1</loc>
+<news:news><news:publication_date>2025-01-10T09:00:00+09:00</news:publication_date></news:news></url>
+</urlset>"""
+
+
+def test_parse_rss_atom_and_news_sitemap():
+    items, _ = parse_feed(RSS)
+    assert [url for url, _ in items] == [f"https://news.example.com/a/{i}" for i in (1, 2)] + [
+        "https://news.example.com/a/3#comments"]
+    assert items[0][1] - items[1][1] == 3600
+
+    assert parse_feed(ATOM)[0][0][0] == "https://news.example.com/atom/1"
+    assert parse_feed(NEWS_SITEMAP)[0][0][0] == "https://news.example.com/s/1"
+
+
+def test_bloom_filter_returns_only_unseen():
+    seen = RedisBloomFilter(FakeRedis(), capacity=1000)
+    assert seen.add_new(["a", "b", "a"]) == ["a", "b"]
+    assert seen.add_new(["a", "c"]) == ["c"]
+
+
+def test_poll_interval_adapts_to_publish_rate():
+    discovery = Discovery(SimpleNamespace(redis_client=FakeRedis()), None, feeds={},
+                          min_interval=60, max_interval=3600, target_per_poll=5, seen_capacity=1000)
+
+    state = FeedState("feed", "example.com")
+    # 항목이 1시간 간격이면 5건 쌓이는 데 5시간 → 최대 주기
+    assert discovery.next_interval(state, 3, 0, [0, 3600, 7200]) == 3600
+    busy = FeedState("feed", "example.com")
+    # 1분에 1건씩이면 5분 주기
+    assert discovery.next_interval(busy, 11, 0, [i * 60 for i in range(11)]) == 300
+    # 새 기사가 없으면 주기가 늘어난다
+    assert discovery.next_interval(busy, 0, 300, []) > 300
+
+
+def test_poll_enqueues_only_new_urls():
+    redis_client = FakeRedis()
+    scraper = ArticleScraper(cache_enabled=False, redis_client=redis_client)
+    queue = JobQueue(redis_client)
+
+    with StubServer({"/rss": RSS}) as stub:
+        discovery = Discovery(scraper, queue, feeds={"example.com": [stub.base_url + "/rss"]},
+                              seen_capacity=1000)
+
+        async def run():
+            first = await discovery.poll(stub.base_url + "/rss", "example.com")
+            second = await discovery.poll(stub.base_url + "/rss", "example.com")
+            await scraper.fetcher.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+    # 프래그먼트만 다른 URL 은 같은 기사로 본다
+    assert first == [f"https://news.example.com/a/{i}" for i in (1, 2, 3)]
+    assert second == []
+    assert redis_client.llen(QUEUE_KEY) == 3
+    state = discovery.states[stub.base_url + "/rss"]
+    assert state.next_poll > time.time()
+
+
+def test_failed_submit_does_not_mark_urls_seen():
+    redis_client = FakeRedis()
+    scraper = ArticleScraper(cache_enabled=False, redis_client=redis_client)
+    queue = JobQueue(redis_client)
+    submit = queue.submit
+
+    def broken_submit(urls):
+        raise ConnectionError("작업 큐 연결 실패")
+
+    # 피드가 ETag 를 주고 If-None-Match 에 304 로 답해도 실패한 URL 은 다시 받아야 한다
+    rss = (200, {"Content-Type": "application/rss+xml", "ETag": '"v1"'}, RSS)
+    with StubServer({"/rss": rss}) as stub:
+        discovery = Discovery(scraper, queue, feeds={"example.com": [stub.base_url + "/rss"]},
+                              seen_capacity=1000)
+
+        async def run():
+            queue.submit = broken_submit
+            first = await discovery.poll(stub.base_url + "/rss", "example.com")
+            queue.submit = submit
+            second = await discovery.poll(stub.base_url + "/rss", "example.com")
+            await scraper.fetcher.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+    # 제출에 실패한 URL 은 다음 확인 때 다시 새 기사로 들어간다
+    assert first == []
+    assert second == [f"https://news.example.com/a/{i}" for i in (1, 2, 3)]
+    assert redis_client.llen(QUEUE_KEY) == 3
+    assert discovery.states[stub.base_url + "/rss"].etag == '"v1"'
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+"""문자 인코딩 감지/학습 테스트 (네트워크/Redis 불필요)
+
+    python -m pytest test_encoding.py   또는   python test_encoding.py
+"""
+import codecs
+
+import pytest
+
+from article_scraper import ArticleScraper, normalize_encoding
+from fetcher import FetchResult
+
+TEXT = "정부는 오늘 국무회의에서 내년도 예산안을 의결했다. 총지출은 올해보다 늘었다. " * 20
+
+
+def response(content, url="https://news.example.com/a/1", encoding=None):
+    return FetchResult(url=url, status_code=200, content=content, encoding=encoding)
+
+
+def page(charset="", body=TEXT):
+    meta = f'<meta charset="{charset}">' if charset else ""
+    return f"<html><head>{meta}<title>예산안</title></head><body><p>{body}</p></body></html>"
+
+
+@pytest.fixture
+def scraper():
+    return ArticleScraper(cache_enabled=False, redis_client=None)
+
+
+def test_euc_kr_aliases_decode_as_cp949():
+    assert normalize_encoding("EUC-KR") == normalize_encoding("ks_c_5601-1987") == "cp949"
+    assert normalize_encoding("UTF8") == "utf-8" and normalize_encoding("x-unknown") is None
+
+
+def test_bom_wins_over_header(scraper):
+    content = codecs.BOM_UTF8 + page().encode("utf-8")
+    assert scraper.detect_encoding(response(content, encoding="euc-kr")) == "utf-8"
+    assert scraper.learned_encodings == {}
+
+
+def test_header_is_trusted_only_for_euc_kr(scraper):
+    assert scraper.detect_encoding(response(page().encode("cp949"), encoding="euc-kr")) == "cp949"
+    assert scraper.learned_encodings == {"news.example.com": "cp949"}
+
+    # 기본값으로 ISO-8859-1 을 보내는 서버: 헤더를 무시하고 본문으로 판단
+    other = "https://other.example.com/a/1"
+    assert scraper.detect_encoding(response(page().encode("utf-8"), other, encoding="iso-8859-1")) == "utf-8"
+
+
+def test_meta_charset_is_learned_for_pages_without_one(scraper):
+    first = response(page("euc-kr").encode("cp949"))
+    assert scraper.detect_encoding(first) == "cp949"
+
+    # 같은 도메인의 meta 없는 페이지는 (UTF-8 로도 읽히는 ASCII 뿐이어도) 학습값으로
+    assert scraper.detect_encoding(response(b"<html><body>AMP</body></html>")) == "cp949"
+
+
+def test_undeclared_korean_bytes_are_detected_and_learned(scraper):
+    content = page().encode("cp949")
+    assert scraper.detect_encoding(response(content)) == "cp949"
+    assert scraper.learned_encodings["news.example.com"] == "cp949"
+    assert scraper.safe_decode(content, "cp949") == page()
+
+
+def test_custom_encoding_applies_to_subdomains_until_learned(scraper):
+    url = "https://news.kmib.co.kr/article/1"
+    ascii_only = response(b"<html><body>ok</body></html>", url)
+    assert scraper.detect_encoding(ascii_only) == "cp949"
+
+    scraper.detect_encoding(response(page("utf-8").encode("utf-8"), url))
+    assert scraper.detect_encoding(ascii_only) == "utf-8"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,126 @@
+"""추출 경로 테스트 (네트워크/브라우저/Redis 불필요)
+
+    python -m pytest test_extraction.py   또는   python test_extraction.py
+"""
+import asyncio
+
+import newspaper.network
+
+from article_scraper import ArticleScraper, ParsedDocument
+from fetcher import FetchResult
+from metrics import Spans
+from render_classifier import RenderClassifier
+
+PARAGRAPH = "정부는 오늘 새로운 경제 정책을 발표했다. " * 8
+
+STATIC_PAGE = f"""<html><head><meta charset="utf-8"><title>경제 정책 발표</title></head>
+<body><article>
+<h1>경제 정책 발표</h1>
+<p>{PARAGRAPH}</p><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p>
+</article></body></html>"""
+
+THIN_PAGE = """<html><head><meta charset="utf-8"><script src="/static/js/app.js"></script></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="app"><p>짧은 본문</p></div>
+</body></html>"""
+
+# 거의 모든 국내 언론사 페이지에 있는 <noscript> 추적 코드 + javascript:void(0) 링크
+TRACKED_PAGE = STATIC_PAGE.replace("<body>", """<body><noscript><iframe src="https://www.googletagmanager.com/ns.html"></iframe></noscript>
+<a href="javascript:void(0)">공유</a>""")
+
+
+def make_scraper(monkeypatch):
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    scraper.render_classifier = RenderClassifier(explore_rate=0)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("newspaper3k 가 네트워크 요청을 보냄")
+
+    monkeypatch.setattr(newspaper.network, "get_html_2XX_only", no_network)
+    monkeypatch.setattr(newspaper.network, "get_html", no_network)
+    monkeypatch.setattr(scraper, "fetch", no_network)
+    return scraper
+
+
+def response_for(html, url, requests=1):
+    return FetchResult(url=url, status_code=200, content=html.encode("utf-8"),
+                       encoding="utf-8", requests=requests)
+
+
+def test_scraper_without_redis_keeps_every_component_local():
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    components = [scraper.cache, scraper.strategies, scraper.render_classifier, scraper.dedup]
+    assert scraper.redis_client is None and all(component.redis is None for component in components)
+
+
+def test_static_article_uses_single_request(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+    renders = []
+    monkeypatch.setattr(scraper, "get_js_rendered_content", lambda url, timeout=30: renders.append(url))
+
+    url = "https://news.example.com/a/1"
+    result = scraper.extract_from_response(response_for(STATIC_PAGE, url), url)
+
+    assert result["extractor"] == "static"
+    assert result["network_requests"] == 1
+    assert renders == []
+
+
+def test_fallbacks_reuse_fetched_html(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+    monkeypatch.setattr(scraper, "get_js_rendered_content", lambda url, timeout=30: None)
+
+    url = "https://spa.example.com/a/2"
+    result = scraper.extract_from_response(response_for(THIN_PAGE, url), url)
+
+    # 최초 페치 + 렌더링 시도 1회, newspaper3k 제목/본문 폴백은 요청 없음
+    assert result["network_requests"] == 2
+    assert "짧은 본문" in result["content"]
+
+
+def test_render_decision_ignores_noscript_boilerplate(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+    url = "https://news.example.com/a/4"
+    doc = ParsedDocument(TRACKED_PAGE)
+    assert not scraper.is_javascript_required(doc, url)
+    assert scraper.is_javascript_required(ParsedDocument(THIN_PAGE), url)
+
+    # 비교용 이전 규칙은 <noscript> 만 보고 렌더링을 요구한다
+    scraper.render_decision = "heuristic"
+    assert scraper.is_javascript_required(doc, url)
+
+
+def test_render_threshold_is_learned_per_domain():
+    classifier = RenderClassifier(threshold=0.5, min_samples=5, explore_rate=0)
+    shell = {"text_chars": 10, "content_chars": 0, "script_chars": 0, "scripts": 1, "shell": True}
+    assert classifier.needs_render("a.example.com", shell)
+    # 이 도메인은 렌더링해도 본문이 나오지 않았다 → 같은 모양의 페이지는 건너뛴다
+    for _ in range(5):
+        classifier.record("a.example.com", shell, helped=False)
+    assert not classifier.needs_render("a.example.com", shell)
+    assert classifier.needs_render("b.example.com", shell)
+
+
+def test_pooled_extraction_learns_in_parent():
+    scraper = ArticleScraper(cache_enabled=False, extraction_processes=1, redis_client=None)
+    url = "https://news.example.com/a/1"
+    try:
+        result = asyncio.run(scraper._extract_async(response_for(STATIC_PAGE, url), url, 3, Spans()))
+    finally:
+        scraper.extraction_pool.close()
+
+    # 워커에서 학습한 값이 부모의 표(/health/*)에 보여야 한다
+    assert result["extractor"] == "static"
+    assert scraper.strategies.stats()["news.example.com"]["paths"]["static"]["attempts"] == 1
+    assert scraper.learned_encodings["news.example.com"] == "utf-8"
+
+
+def test_throttle_retries_are_counted(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+    url = "https://news.example.com/a/3"
+    result = scraper.extract_from_response(response_for(STATIC_PAGE, url, requests=3), url)
+    assert result["network_requests"] == 3
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
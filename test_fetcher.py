@@ -0,0 +1,80 @@
+"""비동기 페처 테스트 - 본문 크기 제한, 연결/읽기 타임아웃 (로컬 서버, 외부 네트워크 불필요)
+
+    python -m pytest test_fetcher.py   또는   python test_fetcher.py
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.stub_server import StubServer
+from fetcher import AsyncFetcher, ResponseTooLarge
+
+
+def fetch(fetcher, url, **kwargs):
+    async def run():
+        try:
+            return await fetcher.fetch(url, **kwargs)
+        finally:
+            await fetcher.aclose()
+    return asyncio.run(run())
+
+
+def test_small_body_is_returned_with_charset():
+    with StubServer({"/a": "한글 본문".encode("euc-kr")}, content_type="text/html; charset=euc-kr") as stub:
+        response = fetch(AsyncFetcher(max_body_size=100), stub.base_url + "/a")
+    assert response.status_code == 200 and response.encoding == "euc-kr"
+    assert response.content.decode("euc-kr") == "한글 본문"
+
+
+def test_declared_length_over_limit_is_rejected():
+    with StubServer({"/big": b"x" * 200}) as stub:
+        with pytest.raises(ResponseTooLarge, match="Content-Length"):
+            fetch(AsyncFetcher(max_body_size=100), stub.base_url + "/big")
+
+
+def test_streamed_body_over_limit_is_rejected():
+    """Content-Length 없이 보내는 응답은 읽는 도중 한도를 넘으면 중단"""
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nConnection: close\r\n\r\n")
+        try:
+            for _ in range(100):
+                writer.write(b"x" * 1024)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        fetcher = AsyncFetcher(max_body_size=4096)
+        try:
+            with pytest.raises(ResponseTooLarge, match="초과"):
+                await fetcher.fetch(f"http://127.0.0.1:{port}/stream")
+        finally:
+            await fetcher.aclose()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_slow_response_hits_read_timeout():
+    with StubServer({"/slow": b"<html></html>"}, latency=0.5) as stub:
+        with pytest.raises(httpx.ReadTimeout):
+            fetch(AsyncFetcher(read_timeout=5.0), stub.base_url + "/slow", read_timeout=0.1)
+        # 호출별 값이 없으면 기본 읽기 타임아웃
+        assert fetch(AsyncFetcher(read_timeout=5.0), stub.base_url + "/slow").status_code == 200
+
+
+def test_per_call_timeouts_override_defaults():
+    fetcher = AsyncFetcher(connect_timeout=5.0, read_timeout=20.0)
+    assert fetcher._timeout() == httpx.Timeout(connect=5.0, read=20.0, write=20.0, pool=20.0)
+    assert fetcher._timeout(connect_timeout=1.0, read_timeout=3.0) == httpx.Timeout(
+        connect=1.0, read=3.0, write=3.0, pool=3.0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
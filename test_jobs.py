@@ -0,0 +1,140 @@
+"""작업 큐 테스트 (FakeRedis 사용, 네트워크 불필요)
+
+    python -m pytest test_jobs.py   또는   python test_jobs.py
+"""
+import asyncio
+import json
+
+from fake_redis import FakeRedis
+from jobs import JobQueue, JobWorker, QUEUE_KEY, processing_key
+
+
+def run_worker_until_done(queue, scrape, job_id, worker_id="w1", timeout=10):
+    worker = JobWorker(queue, scrape, worker_id=worker_id, concurrency=4,
+                       retry_base_delay=0.01, heartbeat_interval=0.05)
+
+    async def run():
+        runner = asyncio.ensure_future(worker.run())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while queue.status(job_id)["status"] != "done" and loop.time() < deadline:
+            await asyncio.sleep(0.02)
+        worker.stop()
+        await runner
+
+    asyncio.run(run())
+
+
+def test_job_completes_with_paginated_results():
+    queue = JobQueue(FakeRedis())
+    urls = [f"https://example.com/{i}" for i in range(25)]
+
+    async def scrape(url, use_cache):
+        return {"title": url, "content": "본문"}
+
+    job_id = queue.submit(urls)
+    assert queue.status(job_id)["status"] == "queued"
+    run_worker_until_done(queue, scrape, job_id)
+
+    status = queue.status(job_id)
+    assert status["status"] == "done"
+    assert status["done"] == 25 and status["failed"] == 0 and status["progress"] == 1.0
+
+    first, second = queue.results(job_id, 0, 20), queue.results(job_id, 20, 20)
+    assert len(first) == 20 and len(second) == 5
+    assert sorted(item["index"] for item in first + second) == list(range(25))
+
+
+def test_failures_are_retried_then_dead_lettered():
+    queue = JobQueue(FakeRedis())
+    calls = {}
+
+    async def scrape(url, use_cache):
+        calls[url] = calls.get(url, 0) + 1
+        if url.endswith("flaky") and calls[url] == 1:
+            raise RuntimeError("일시적 오류")
+        if url.endswith("broken"):
+            raise RuntimeError("항상 실패")
+        return {"content": "ok"}
+
+    job_id = queue.submit(["https://a.com/ok", "https://a.com/flaky", "https://a.com/broken"], max_attempts=3)
+    run_worker_until_done(queue, scrape, job_id)
+
+    status = queue.status(job_id)
+    assert status["done"] == 2 and status["failed"] == 1 and status["dead"] == 1
+    assert calls["https://a.com/flaky"] == 2
+    assert calls["https://a.com/broken"] == 3
+    dead = queue.dead_letters(job_id)
+    assert dead[0]["url"] == "https://a.com/broken" and dead[0]["error"] == "항상 실패"
+
+
+def test_tasks_of_crashed_worker_are_resumed():
+    redis_client = FakeRedis()
+    queue = JobQueue(redis_client)
+    job_id = queue.submit([f"https://b.com/{i}" for i in range(5)])
+
+    # 워커가 두 건을 가져간 뒤 ack 없이 죽은 상황 (heartbeat 도 오래됨)
+    queue.claim("dead-worker", 0)
+    queue.claim("dead-worker", 0)
+    redis_client.hset("jobs:workers", "dead-worker", 0)
+    assert redis_client.llen(processing_key("dead-worker")) == 2
+    assert redis_client.llen(QUEUE_KEY) == 3
+
+    async def scrape(url, use_cache):
+        return {"content": url}
+
+    run_worker_until_done(queue, scrape, job_id, worker_id="new-worker")
+
+    assert queue.status(job_id)["done"] == 5
+    assert redis_client.llen(processing_key("dead-worker")) == 0
+    urls = {item["url"] for item in queue.results(job_id, 0, 10)}
+    assert urls == {f"https://b.com/{i}" for i in range(5)}
+
+
+def test_worker_restart_with_same_id_requeues_in_flight_tasks():
+    redis_client = FakeRedis()
+    queue = JobQueue(redis_client)
+    job_id = queue.submit(["https://c.com/1"])
+    raw = queue.claim("w1", 0)
+    assert json.loads(raw)["url"] == "https://c.com/1"
+
+    async def scrape(url, use_cache):
+        return {"content": "ok"}
+
+    run_worker_until_done(queue, scrape, job_id, worker_id="w1")
+    assert queue.status(job_id)["done"] == 1
+
+
+def test_late_progress_update_does_not_undo_done():
+    class RacingRedis(FakeRedis):
+        """작업 해시를 읽은 직후 다른 워커가 마지막 태스크를 끝낸다"""
+        on_read = None
+
+        def hgetall(self, key):
+            job = super().hgetall(key)
+            hook, self.on_read = self.on_read, None
+            if hook and key.startswith("job:"):
+                hook()
+            return job
+
+    redis_client = RacingRedis()
+    queue = JobQueue(redis_client)
+    job_id = queue.submit(["https://example.com/1", "https://example.com/2"])
+    first, second = queue.claim("w1"), queue.claim("w2")
+
+    def finish_other():
+        queue.complete("w2", second, {"index": 1}, success=True)
+
+    redis_client.on_read = finish_other
+    queue.complete("w1", first, {"index": 0}, success=True)
+    if redis_client.on_read is not None:  # 상태를 따로 읽지 않고 갱신하면 끼어들 틈이 없다
+        redis_client.on_read = None
+        finish_other()
+    assert queue.status(job_id)["status"] == "done"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"ok  {name}")
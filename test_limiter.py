@@ -0,0 +1,129 @@
+"""적응형 동시 처리 한도 테스트 (네트워크/브라우저 불필요)
+
+    python -m pytest test_limiter.py   또는   python test_limiter.py
+"""
+import asyncio
+import time
+
+from article_scraper import ArticleScraper
+from browser_pool import BrowserPool
+from fetcher import FetchResult
+from limiter import AdaptiveLimit, AsyncLimiter, process_tree_rss
+from metrics import Spans
+from scheduler import HostScheduler
+
+
+def feed(limit, latency, count=None, **kwargs):
+    for _ in range(count or limit.window):
+        limit.record(latency, **kwargs)
+
+
+def test_limit_grows_when_saturated_and_backs_off_on_latency_and_errors():
+    limit = AdaptiveLimit("test", 10, window=10, max_limit=50)
+    feed(limit, 0.1)
+    assert limit.limit == 10                     # 한도가 남아 있으면 늘리지 않음
+    feed(limit, 0.1, saturated=True)
+    feed(limit, 0.1, saturated=True)
+    assert limit.limit == 16 and limit.last_reason == "saturated"  # 10 + sqrt(10) + sqrt(13.2)
+
+    feed(limit, 0.5, saturated=True)             # 기준 지연 x1.5 초과
+    assert limit.limit == 12 and limit.last_reason == "latency"
+
+    feed(limit, 0.1, count=7, saturated=True)
+    feed(limit, 0.1, count=3, error=True)
+    assert limit.limit == 9 and limit.last_reason == "errors"
+
+
+def test_memory_pressure_stops_growth_then_shrinks():
+    usage = [850]
+    limit = AdaptiveLimit("test", 10, window=5, memory=lambda: usage[0], memory_limit=1000)
+    feed(limit, 0.1, saturated=True)
+    assert limit.limit == 10 and limit.last_reason is None
+
+    usage[0] = 1000
+    feed(limit, 0.1, saturated=True)
+    assert limit.limit == 7 and limit.last_reason == "memory"
+
+
+def test_async_limiter_admits_waiters_as_limit_grows():
+    limiter = AsyncLimiter("test", 2, window=4, max_limit=4)
+    peak = 0
+
+    async def task():
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        limiter.release(0.01)
+
+    async def run():
+        await asyncio.gather(*(task() for _ in range(40)))
+
+    asyncio.run(run())
+    assert limiter.limit > 2
+    assert peak <= limiter.limit
+    assert limiter.in_flight == 0 and not limiter._waiters
+
+
+def test_browser_limit_resizes_pool():
+    quit_count = []
+
+    class Driver:
+        def quit(self):
+            quit_count.append(self)
+
+    pool = BrowserPool(Driver, size=3)
+    assert pool.warm() == 3
+    limit = AdaptiveLimit("browser", 3, window=2, on_change=pool.resize)
+
+    feed(limit, 1.0, error=True)
+    assert pool.size == 2 and len(quit_count) == 1
+    assert pool.stats()["created"] == 2
+
+
+def test_host_slot_wait_neither_holds_nor_slows_the_static_limit():
+    class SlowHostFetcher:
+        async def fetch(self, url, headers=None, connect_timeout=None, read_timeout=None):
+            await asyncio.sleep(0.3 if "slow." in url else 0.05)
+            return FetchResult(url=url, status_code=200, content=b"<html></html>", encoding="utf-8")
+
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    scraper.fetcher = SlowHostFetcher()
+    scraper.scheduler = HostScheduler({"slow.example.com": {"concurrency": 1, "rate": 100}})
+    scraper.static_limit = AsyncLimiter("static", 2, min_limit=2, max_limit=2)
+    latencies = []
+    scraper.static_limit.record = lambda latency, error=False, saturated=False: latencies.append(latency)
+
+    async def scrape_and_cache(url, retry, use_cache, cache_key, entry, spans, deadline=None, waiting=None):
+        await scraper.fetch_politely(url, retry, deadline=deadline, waiting=waiting)
+        return {"title": url}, "ok"
+
+    scraper._scrape_and_cache = scrape_and_cache
+
+    async def scrape(url, delay=0):
+        await asyncio.sleep(delay)
+        await scraper._scrape_limited(url, 3, False, url, None, Spans())
+        return time.monotonic()
+
+    async def run():
+        start = time.monotonic()
+        done = await asyncio.gather(scrape("https://slow.example.com/1"), scrape("https://slow.example.com/2"),
+                                    scrape("https://fast.example.com/1", delay=0.02))
+        return [end - start for end in done]
+
+    elapsed = asyncio.run(run())
+    # 호스트 슬롯을 기다리는 두 번째 느린 요청이 자리를 내줘 다른 호스트 요청은 바로 처리되고
+    assert elapsed[2] < 0.2
+    # 한도에는 요청을 보낸 뒤의 시간만 반영된다
+    assert len(latencies) == 3 and max(latencies) < 0.45
+    assert scraper.static_limit.in_flight == 0
+
+
+def test_process_tree_rss_counts_this_process():
+    rss = process_tree_rss()
+    assert rss is None or rss > 1024 * 1024
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,102 @@
+"""언론사별 추출 규칙 테스트 (네트워크/Redis 불필요)
+
+    python -m pytest test_rules.py   또는   python test_rules.py
+"""
+import json
+import os
+
+from article_scraper import ArticleScraper, ParsedDocument
+from fetcher import FetchResult
+from rules import RulesRegistry
+
+PARAGRAPH = "한국은행은 기준금리를 연 3.5%로 동결했다고 밝혔다. " * 8
+
+PUBLISHER_PAGE = f"""<html><head><meta charset="utf-8">
+<meta property="og:title" content="기준금리 동결 - 조선일보">
+<meta property="article:published_time" content="2026-10-18T09:00:00+09:00"></head>
+<body><h1 class="article-header__headline">기준금리 동결</h1>
+<span class="author">김기자</span><span class="author">이기자</span><span class="author">김기자</span>
+<section class="article-body"><p>{PARAGRAPH}</p><script>var ad = 1;</script><p>{PARAGRAPH}</p></section>
+</body></html>"""
+
+# 개편 등으로 본문 규칙이 빗나간 페이지
+REDESIGNED_PAGE = PUBLISHER_PAGE.replace('section class="article-body"', 'article class="story"')
+# 본문 규칙이 요약문만 든 요소를 고르는 페이지 (값은 나오지만 유효한 본문이 아님)
+TEASER_PAGE = PUBLISHER_PAGE.replace(
+    '<section class="article-body">',
+    '<section class="article-body"><p>요약</p></section><article class="story">',
+).replace('</section>\n</body>', '</article>\n</body>')
+
+
+def make_scraper():
+    scraper = ArticleScraper(cache_enabled=False, redis_client=None)
+    return scraper
+
+
+def extract(scraper, html, url):
+    response = FetchResult(url=url, status_code=200, content=html.encode("utf-8"), encoding="utf-8")
+    return scraper.extract_from_response(response, url)
+
+
+def test_publisher_rules_skip_generic_extraction(monkeypatch):
+    scraper = make_scraper()
+
+    def no_trafilatura(*args, **kwargs):
+        raise AssertionError("규칙이 맞는 언론사 페이지에서 trafilatura 를 실행함")
+
+    monkeypatch.setattr(scraper, "_extract_with_trafilatura", no_trafilatura)
+    result = extract(scraper, PUBLISHER_PAGE, "https://www.chosun.com/economy/2026/10/18/A1/")
+
+    assert result["extractor"] == "rules"
+    assert result["title"] == "기준금리 동결"
+    assert result["authors"] == ["김기자", "이기자"]
+    assert result["publish_date"] == "2026-10-18T09:00:00+09:00"
+    assert result["content"].count("기준금리") == 16
+    assert "var ad" not in result["content"]
+
+
+def test_rule_miss_falls_back_to_generic_extraction():
+    scraper = make_scraper()
+    result = extract(scraper, REDESIGNED_PAGE, "https://www.chosun.com/economy/2026/10/18/A2/")
+
+    assert result["extractor"] != "rules"
+    assert "기준금리" in result["content"]
+    assert result["title"] == "기준금리 동결"
+    body = scraper.rules.stats()["chosun.com"]["body"]
+    assert body == [{"rule": "section.article-body", "hits": 0, "misses": 1, "hit_rate": 0.0}]
+
+
+def test_rejected_body_rule_counts_as_miss():
+    scraper = make_scraper()
+    result = extract(scraper, TEASER_PAGE, "https://www.chosun.com/economy/2026/10/18/A3/")
+
+    assert result["extractor"] != "rules"
+    assert result["content"].count("기준금리") >= 16
+    body = scraper.rules.stats()["chosun.com"]["body"]
+    assert body == [{"rule": "section.article-body", "hits": 0, "misses": 1, "hit_rate": 0.0}]
+
+
+def test_rules_file_is_hot_reloaded(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"example.com": {"title": ["h1.headline"]}}), encoding="utf-8")
+    registry = RulesRegistry(str(path), check_interval=0)
+    doc = ParsedDocument("<html><body><h1 class='headline'>첫 제목</h1><h2 class='tit'>새 제목</h2></body></html>")
+
+    rules = registry.for_domain("news.example.com")
+    assert rules.first("title", doc.tree) == "첫 제목"
+    assert registry.for_domain("chosun.com") is None  # 파일을 지정하면 기본 규칙 대신 사용
+
+    path.write_text(json.dumps({"example.com": {"title": ["xpath://h2[@class='tit']"]}}), encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert registry.for_domain("example.com").first("title", doc.tree) == "새 제목"
+
+    # 컴파일할 수 없는 규칙이면 기존 규칙 유지
+    path.write_text(json.dumps({"example.com": {"title": ["h1[[broken"]}}), encoding="utf-8")
+    os.utime(path, (2, 2))
+    assert registry.for_domain("example.com").first("title", doc.tree) == "새 제목"
+    assert not registry.reload()
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
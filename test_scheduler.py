@@ -0,0 +1,114 @@
+"""호스트별 스케줄러 테스트 - 토큰 버킷, 429/503 백오프, 헤지 기준, 인터리브 (가짜 시계, 네트워크 불필요)
+
+    python -m pytest test_scheduler.py   또는   python test_scheduler.py
+"""
+import asyncio
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import scheduler
+from scheduler import HostScheduler
+
+URL = "https://www.example.com/a/1"
+
+
+class FakeClock:
+    """time.monotonic/time.time 과 asyncio.sleep 을 대신한다 (sleep 은 기다리지 않고 시계만 넘김)"""
+
+    epoch = 1_700_000_000.0
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleep = asyncio.sleep
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.epoch + self.now
+
+    async def sleep(self, seconds):
+        self.now += max(seconds, 0.0)
+        await self._sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, "time", clock)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def start_times(hosts, clock, count, url=URL):
+    async def one():
+        async with hosts.slot(url):
+            return clock.now
+
+    async def run():
+        return [await one() for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_token_bucket_allows_burst_then_paces_at_rate(clock):
+    hosts = HostScheduler(default_policy={"concurrency": 10, "rate": 2.0, "burst": 2})
+    assert start_times(hosts, clock, 5) == [0.0, 0.0, 0.5, 1.0, 1.5]
+
+
+def test_throttle_responses_back_off_and_halve_the_rate(clock):
+    hosts = HostScheduler(default_policy={"concurrency": 2, "rate": 4.0})
+
+    assert hosts.report(URL, 429, "3") is True
+    assert hosts.stats()["www.example.com"]["rate"] == 2.0
+    assert start_times(hosts, clock, 1) == [3.0]        # Retry-After 초
+
+    assert hosts.report(URL, 503) is True                # 헤더 없으면 2 ** 연속 횟수
+    assert start_times(hosts, clock, 1) == [3.0 + 4.0]
+
+    retry_at = datetime.fromtimestamp(clock.time() + 10, timezone.utc)
+    hosts.report(URL, 429, format_datetime(retry_at, usegmt=True))
+    assert start_times(hosts, clock, 1) == [pytest.approx(17.0)]
+    assert hosts.stats()["www.example.com"]["rate"] == 0.5
+
+    # 정상 응답이 오면 연속 횟수를 지우고 속도를 조금씩 되돌린다
+    assert hosts.report(URL, 200) is False
+    assert hosts.stats()["www.example.com"]["rate"] == 0.55
+    hosts.report(URL, 503)
+    assert start_times(hosts, clock, 1)[0] == pytest.approx(19.0)
+
+
+def test_backoff_is_capped_and_other_hosts_are_not_delayed(clock):
+    hosts = HostScheduler(max_backoff=60)
+    hosts.report(URL, 429, "3600")
+    assert start_times(hosts, clock, 1, "https://other.example.com/a") == [0.0]
+    assert start_times(hosts, clock, 1) == [60.0]
+
+
+def test_hedge_delay_uses_p95_after_enough_samples():
+    hosts = HostScheduler(hedge_min_samples=20, hedge_min_delay=0.05)
+    for i in range(19):
+        hosts.observe_latency(URL, (i + 1) / 100)
+    assert hosts.hedge_delay(URL) is None
+    hosts.observe_latency(URL, 0.20)
+    assert hosts.hedge_delay(URL) == 0.20                # 20개 중 95번째 백분위
+    assert hosts.hedge_delay("https://other.example.com/a") is None
+
+    fast = HostScheduler(hedge_min_samples=1, hedge_min_delay=0.05)
+    fast.observe_latency(URL, 0.001)
+    assert fast.hedge_delay(URL) == 0.05
+
+
+def test_interleave_round_robins_hosts_in_first_seen_order():
+    urls = ["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://b.com/1", "https://C.com/1",
+            "https://b.com/2"]
+    assert HostScheduler.interleave(urls) == [
+        "https://a.com/1", "https://b.com/1", "https://C.com/1", "https://a.com/2", "https://b.com/2",
+        "https://a.com/3",
+    ]
+    assert HostScheduler.interleave(range(3), key=lambda i: urls[i]) == [0, 1, 2]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,110 @@
+"""스크래핑 결과 캐싱 테스트 - 조건부 GET 재검증, 네거티브 TTL (로컬 스텁 서버, Redis 불필요)
+
+    python -m pytest test_scrape_cache.py   또는   python test_scrape_cache.py
+"""
+import asyncio
+import time
+
+import pytest
+
+from article_scraper import ArticleScraper
+from benchmarks.stub_server import StubServer
+from cache import CachedFailure
+from fetcher import BadStatus
+from render_classifier import RenderClassifier
+
+PARAGRAPH = "정부는 오늘 새로운 경제 정책을 발표했다. " * 8
+
+PAGE = f"""<html><head><meta charset="utf-8"><title>경제 정책 발표</title></head>
+<body><article>
+<h1>경제 정책 발표</h1>
+<p>{PARAGRAPH}</p><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p>
+</article></body></html>""".encode("utf-8")
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+def make_scraper():
+    scraper = ArticleScraper(redis_client=None)
+    scraper.render_classifier = RenderClassifier(explore_rate=0)
+    return scraper
+
+
+def expire(scraper, url):
+    """캐시 항목의 신선도만 만료시킨다 (재검증 대상이 되도록)"""
+    entry = scraper.cache.local.get(scraper._get_cache_key(url))
+    entry["fresh_until"] = time.time() - 1
+    return entry
+
+
+def test_expired_entry_is_revalidated_with_etag():
+    async def run(url):
+        scraper = make_scraper()
+        result, status = await scraper.extract_with_cache_status(url)
+        assert status == "miss" and result["content"]
+        assert expire(scraper, url)["etag"] == '"v1"'
+        return scraper, result, await scraper.extract_with_cache_status(url)
+
+    with StubServer({"/a/1": (200, dict(HTML, ETag='"v1"'), PAGE)}) as stub:
+        url = f"{stub.base_url}/a/1"
+        scraper, result, (revalidated, status) = asyncio.run(run(url))
+
+    # 304 를 받아 추출 없이 기존 결과를 돌려주고 신선도를 다시 cache_ttl 만큼 늘린다
+    assert status == "revalidated" and revalidated == result
+    refreshed = scraper.cache.local.get(scraper._get_cache_key(url))
+    assert refreshed["etag"] == '"v1"' and refreshed["fresh_until"] > time.time() + 3600
+    assert stub.requests == 2
+
+
+def test_unchanged_body_without_validators_upgrades_stale_entry():
+    async def run(url):
+        scraper = make_scraper()
+        result, _ = await scraper.extract_with_cache_status(url)
+        stale = expire(scraper, url)
+        assert stale["etag"] is None and stale["content_hash"]
+        return scraper, result, await scraper.extract_with_cache_status(url)
+
+    with StubServer({"/a/1": PAGE}) as stub:
+        url = f"{stub.base_url}/a/1"
+        scraper, result, (revalidated, status) = asyncio.run(run(url))
+
+    # 검증자가 없어도 본문 해시가 같으면 추출을 건너뛴다
+    assert status == "revalidated" and revalidated == result
+    assert scraper.cache.local.get(scraper._get_cache_key(url))["fresh_until"] > time.time()
+
+
+@pytest.mark.parametrize("path", ["/busy", "/missing"])
+def test_error_status_is_negative_cached_with_short_ttl(path):
+    async def run(url):
+        scraper = make_scraper()
+        with pytest.raises(BadStatus):
+            await scraper.extract_with_cache_status(url, retry=1)
+        requests = stub.requests
+        with pytest.raises(CachedFailure):
+            await scraper.extract_with_cache_status(url, retry=1)
+        assert stub.requests == requests
+        return scraper
+
+    busy = b"<html><body><p>" + PARAGRAPH.encode("utf-8") * 4 + b"</p></body></html>"
+    with StubServer({"/busy": (503, HTML, busy)}) as stub:
+        url = f"{stub.base_url}{path}"
+        scraper = asyncio.run(run(url))
+
+    # 요청 제한 페이지나 404 를 기사로 추출해 24시간 캐싱하지 않는다
+    entry = scraper.cache.local.get(scraper._get_cache_key(url))
+    assert entry["negative"] == "error" and entry["result"] is None
+    assert entry["fresh_until"] <= time.time() + scraper.negative_cache_ttl.total_seconds()
+
+
+def test_legacy_entry_without_freshness_is_served():
+    async def run(url):
+        scraper = make_scraper()
+        await scraper.cache.put(scraper._get_cache_key(url), legacy, scraper.cache_ttl)
+        return await scraper.extract_with_cache_status(url)
+
+    legacy = {"title": "경제 정책 발표", "content": PARAGRAPH}
+    assert asyncio.run(run("https://news.example.com/a/1")) == (legacy, "hit")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,153 @@
+"""single-flight 테스트 - 프로세스 내 / Redis 공유 (FakeRedis, 네트워크 불필요)
+
+    python -m pytest test_singleflight.py   또는   python test_singleflight.py
+"""
+import asyncio
+import time
+
+import pytest
+
+from cache import CachedFailure
+from deadline import Deadline, DeadlineExceeded
+from fake_redis import FakeRedis
+from singleflight import RedisSingleFlight, SingleFlight
+
+
+async def run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def scrape():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"title": "제목"}, "miss"
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("k", scrape) for _ in range(5)))
+        again = await flight.do("k", scrape)     # 끝난 키는 다시 실행
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert len(calls) == 2 and all(result is results[0] for result in results) and again == results[0]
+    assert (flight.leaders, flight.coalesced, flight.in_flight()) == (2, 4, 0)
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise CachedFailure("404")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+    assert [str(error) for error in asyncio.run(run())] == ["404"] * 3
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    finished = []
+
+    async def scrape():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "결과"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("k", scrape))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", scrape))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(run())
+    assert isinstance(leader, asyncio.CancelledError) and follower == "결과" and finished == [1]
+
+
+def test_work_is_cancelled_when_every_waiter_leaves():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def scrape():
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        waiters = [asyncio.ensure_future(flight.do("k", scrape)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight.in_flight()
+
+    assert asyncio.run(run()) == 0 and cancelled == [1]
+
+
+def pair():
+    """같은 Redis 를 쓰는 두 워커"""
+    redis_client = FakeRedis()
+    return (RedisSingleFlight(redis_client, run_blocking, poll_interval=0.01),
+            RedisSingleFlight(redis_client, run_blocking, poll_interval=0.01))
+
+
+@pytest.mark.parametrize("error, check", [
+    (CachedFailure("404"), lambda e: isinstance(e, CachedFailure) and str(e) == "404"),
+    (DeadlineExceeded("fetch"), lambda e: isinstance(e, DeadlineExceeded) and e.stage == "fetch"),
+    (ValueError("파싱 실패"), lambda e: isinstance(e, RuntimeError) and str(e) == "파싱 실패"),
+])
+def test_follower_gets_leaders_error_type(error, check):
+    leader, follower = pair()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise error
+
+    async def run():
+        lead = asyncio.ensure_future(leader.do("k", fail))
+        await asyncio.sleep(0.02)  # 리더가 락을 먼저 잡도록
+        return await asyncio.gather(lead, follower.do("k", fail), return_exceptions=True)
+
+    leader_error, follower_error = asyncio.run(run())
+    assert leader_error is error
+    assert check(follower_error)
+
+
+def test_follower_waits_only_within_its_deadline():
+    leader, follower = pair()
+    calls = []
+
+    async def slow():
+        calls.append("leader")
+        await asyncio.sleep(1.0)
+        return "leader"
+
+    async def own():
+        calls.append("follower")
+        return "follower"
+
+    async def run():
+        lead = asyncio.ensure_future(leader.do("k", slow))
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        result = await follower.do("k", own, Deadline(0.2))
+        waited = time.monotonic() - start
+        await lead
+        return result, waited
+
+    result, waited = asyncio.run(run())
+    assert result == "follower" and calls == ["leader", "follower"]
+    assert waited < 0.5
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
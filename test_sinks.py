@@ -0,0 +1,110 @@
+"""출력 싱크 테스트 (네트워크/Redis 불필요)
+
+    python -m pytest test_sinks.py   또는   python test_sinks.py
+"""
+import asyncio
+import gzip
+import json
+import os
+
+import pytest
+
+from metrics import Spans
+from sinks import BufferedExporter, JSONLSink, ParquetSink, check_formats, make_sinks, to_record
+
+
+def sample_records(count):
+    spans = Spans()
+    spans.add("fetch", 0.012)
+    result = {"title": "제목", "authors": ["기자"], "publish_date": None, "content": "본문 " * 50,
+              "extractor": "static"}
+    return [to_record(f"https://www.example.com/a/{i}", result, spans) for i in range(count)]
+
+
+def read_jsonl(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_jsonl_rotates_by_record_count(tmp_path):
+    sink = JSONLSink(str(tmp_path), max_records=4)
+    for batch in (sample_records(3), sample_records(3), sample_records(1)):
+        sink.write(batch)
+    sink.close()
+
+    assert len(sink.completed) == 2
+    assert [len(read_jsonl(path)) for path in sink.completed] == [6, 1]
+    record = read_jsonl(sink.completed[0])[0]
+    assert record["domain"] == "www.example.com" and record["timings"] == {"fetch": 12.0}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_parquet_roundtrip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetSink(str(tmp_path))
+    sink.write(sample_records(2))
+    sink.write(sample_records(3))
+    sink.close()
+
+    table = pq.read_table(sink.completed[0])
+    assert table.num_rows == 5
+    assert pq.ParquetFile(sink.completed[0]).num_row_groups == 2
+    assert table.column("authors").to_pylist()[0] == ["기자"]
+
+
+def test_buffered_exporter_flushes_on_size_and_close(tmp_path):
+    async def run():
+        exporter = BufferedExporter(make_sinks(str(tmp_path), ["jsonl"]), flush_records=3, flush_interval=60)
+        for record in sample_records(4):
+            await exporter.add(record)
+        assert exporter.written == 3          # 3건째에서 한 번 기록, 1건은 버퍼에
+        await exporter.close()
+        return exporter
+
+    exporter = asyncio.run(run())
+    assert exporter.written == 4
+    assert len(read_jsonl(exporter.files()[0])) == 4
+
+
+class FlakySink:
+    """처음 fail 번의 write 가 실패하는 싱크"""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.records = []
+
+    def write(self, records):
+        if self.fail:
+            self.fail -= 1
+            raise OSError("디스크 가득 참")
+        self.records.extend(records)
+
+
+def test_failed_write_is_retried_only_on_the_failing_sink():
+    async def run():
+        healthy, flaky = FlakySink(0), FlakySink(1)
+        exporter = BufferedExporter([healthy, flaky], flush_records=100, flush_interval=60)
+        records = sample_records(3)
+        for record in records[:2]:
+            await exporter.add(record)
+        with pytest.raises(OSError):
+            await exporter.flush()
+        assert exporter.written == 0
+        await exporter.add(records[2])
+        await exporter.flush()
+        return exporter, healthy, flaky, records
+
+    exporter, healthy, flaky, records = asyncio.run(run())
+    # 실패한 싱크에는 밀린 레코드를 순서대로 다시 쓰고, 이미 쓴 싱크에는 중복으로 쓰지 않는다
+    assert healthy.records == records and flaky.records == records
+    assert exporter.written == 3
+
+
+def test_check_formats_rejects_unknown_format():
+    assert check_formats(["jsonl", " jsonl"]) == ["jsonl", "jsonl"]
+    with pytest.raises(ValueError, match="csv"):
+        check_formats(["jsonl", "csv"])
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))